@@ -0,0 +1,603 @@
+#!/usr/bin/env python
+"""Offline throughput benchmark for the code analysis tools.
+
+Generates a synthetic repository of configurable size and language mix,
+then times CodeParserTool (as constructed by default, which lists the
+files, and with a token budget, which analyzes and packs them),
+StaticAnalysisTool, SecurityAnalyzerTool, PerformanceAnalyzerTool and
+ComplexityAnalyzerTool over it, reporting
+files/s, MB/s and peak RSS per tool. Each tool runs in a fresh process
+with the analysis cache disabled, so timings are cold and peak RSS is the
+tool's own. Results are appended to a JSON-lines history and compared with
+the latest earlier run of the same corpus on the same machine setup.
+
+    benchmark --files 500 --languages python=6,javascript=3,go=1 --repeat 3
+
+Exits with status 1 when a tool got slower or hungrier than the baseline
+by more than --threshold, or when its output changed.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from code_reviewer_agent.tools.analysis_cache import DEFAULT_CACHE_DIR
+from code_reviewer_agent.tools.code_analysis_tools import SUPPORTED_EXTENSIONS
+from code_reviewer_agent.tools.context_packer import DEFAULT_TOKEN_BUDGET
+
+DEFAULT_LANGUAGES = {'python': 0.5, 'javascript': 0.3, 'go': 0.1, 'java': 0.1}
+DEFAULT_RESULTS_FILE = DEFAULT_CACHE_DIR / 'benchmarks.jsonl'
+# Relative slowdown (or RSS growth) over the baseline that counts as a regression
+DEFAULT_THRESHOLD = 0.10
+
+TOOLS = ('parser', 'parser_packed', 'static', 'security', 'performance', 'complexity')
+TOOL_NAMES = {
+    'parser': 'CodeParserTool',
+    'parser_packed': 'CodeParserTool (packed)',
+    'static': 'StaticAnalysisTool',
+    'security': 'SecurityAnalyzerTool',
+    'performance': 'PerformanceAnalyzerTool',
+    'complexity': 'ComplexityAnalyzerTool',
+}
+
+EXTENSION_FOR = {language: extension for extension, language in SUPPORTED_EXTENSIONS.items()}
+
+# Building blocks for synthetic sources. Besides plain code, each language
+# mixes in constructs the analyzers report on (eval, hardcoded secrets,
+# string concatenation in loops, nested loops, TODOs, long lines), so the
+# benchmark exercises their finding paths and not just the scanning.
+PYTHON_BLOCKS = [
+    '''def compute_{n}(values, factor={n}):
+    """Scale and filter values."""
+    result = []
+    for value in values:
+        if value % 2 == 0:
+            result.append(value * factor)
+        elif value > factor:
+            result.append(value - factor)
+        else:
+            continue
+    return result
+''',
+    '''def render_{n}(rows):
+    output = ""
+    for row in rows:
+        for cell in row:
+            output += str(cell) + ","
+    return output
+''',
+    '''def load_{n}(expression):
+    try:
+        return eval(expression)
+    except:
+        return None
+''',
+    '''class Repository{n}:
+    password = "hunter2-{n}-secret"
+
+    def __init__(self, db):
+        self.db = db
+
+    def find(self, name):
+        return self.db.execute("SELECT * FROM users WHERE name = '%s'" % name)
+
+    def count(self, items):
+        total = 0
+        for item in items:
+            if item is not None and item.active:
+                total += 1
+        return total
+''',
+    '''# TODO: replace this lookup with a dict before the data grows ({n})
+def lookup_{n}(needle, haystack):
+    matches = [item for item in haystack if item == needle or str(item).lower() == str(needle).lower() or item in (None, 0)]
+    return len(matches)
+''',
+]
+
+JAVASCRIPT_BLOCKS = [
+    '''function compute{n}(values, factor = {n}) {{
+  const result = [];
+  for (const value of values) {{
+    if (value % 2 === 0) {{
+      result.push(value * factor);
+    }} else if (value > factor) {{
+      result.push(value - factor);
+    }}
+  }}
+  return result;
+}}
+''',
+    '''function highlight{n}(ids) {{
+  for (let i = 0; i < ids.length; i++) {{
+    const node = document.getElementById(ids[i]);
+    if (node == null) {{
+      console.log("missing node", ids[i]);
+      continue;
+    }}
+    node.className += " active";
+  }}
+}}
+''',
+    '''async function findUser{n}(db, name) {{
+  // TODO: use a parameterized query
+  const api_key = "sk-test-{n}-0123456789abcdefghij";
+  return db.query("SELECT * FROM users WHERE name = '" + name + "'");
+}}
+''',
+    '''const handlers{n} = {{
+  load: (text) => eval(text),
+  size: (items) => items.filter((item) => item != undefined && item.visible && item.width > 0 && item.height > 0).length,
+}};
+''',
+]
+
+GO_BLOCKS = [
+    '''func compute{n}(values []int, factor int) []int {{
+	result := []int{{}}
+	for _, value := range values {{
+		if value%2 == 0 {{
+			result = append(result, value*factor)
+		}} else if value > factor {{
+			result = append(result, value-factor)
+		}}
+	}}
+	return result
+}}
+''',
+    '''// TODO: cache the prepared statement ({n})
+func findUser{n}(db *sql.DB, name string) (*sql.Rows, error) {{
+	password := "hunter2-{n}-secret"
+	_ = password
+	return db.Query("SELECT * FROM users WHERE name = '" + name + "' FROM users")
+}}
+''',
+    '''func pairs{n}(items []string) int {{
+	count := 0
+	for i := range items {{
+		for j := range items {{
+			if i != j && items[i] == items[j] {{
+				count++
+			}}
+		}}
+	}}
+	return count
+}}
+''',
+]
+
+JAVA_BLOCKS = [
+    '''    public List<Integer> compute{n}(List<Integer> values, int factor) {{
+        List<Integer> result = new ArrayList<>();
+        for (int value : values) {{
+            if (value % 2 == 0) {{
+                result.add(value * factor);
+            }} else if (value > factor) {{
+                result.add(value - factor);
+            }}
+        }}
+        return result;
+    }}
+''',
+    '''    // TODO: move credentials to configuration ({n})
+    private String password = "hunter2-{n}-secret";
+
+    public ResultSet find{n}(Statement statement, String name) throws SQLException {{
+        return statement.executeQuery("SELECT * FROM users WHERE name = '" + name + "' FROM users");
+    }}
+''',
+    '''    public String join{n}(List<String> items) {{
+        String output = "";
+        for (String item : items) {{
+            for (char c : item.toCharArray()) {{
+                output += c;
+            }}
+        }}
+        return output;
+    }}
+''',
+]
+
+# For the remaining languages: C-style functions with the comment marker filled in
+GENERIC_BLOCKS = [
+    '''{comment} Block {n}
+int compute_{n}(int *values, int count, int factor) {{
+    int total = 0;
+    for (int i = 0; i < count; i++) {{
+        if (values[i] % 2 == 0) {{
+            total += values[i] * factor;
+        }} else if (values[i] > factor) {{
+            total -= factor;
+        }}
+    }}
+    return total;
+}}
+''',
+    '''{comment} TODO: bounds checks ({n})
+int pairs_{n}(int *items, int count) {{
+    int matches = 0;
+    for (int i = 0; i < count; i++) {{
+        for (int j = 0; j < count; j++) {{
+            if (i != j && items[i] == items[j]) {{
+                matches++;
+            }}
+        }}
+    }}
+    return matches;
+}}
+''',
+    '''{comment} Runs a shell command ({n})
+void run_{n}(const char *command) {{
+    char *password = "hunter2-{n}-secret";
+    system(command);
+}}
+''',
+]
+
+LANGUAGE_SOURCES = {
+    'python': ('import os\nimport sys\n\n\n', PYTHON_BLOCKS, '\n\n', ''),
+    'javascript': ("'use strict';\n\n", JAVASCRIPT_BLOCKS, '\n', ''),
+    'typescript': ('export {};\n\n', JAVASCRIPT_BLOCKS, '\n', ''),
+    'go': ('package synthetic\n\nimport "database/sql"\n\n', GO_BLOCKS, '\n', ''),
+    'java': ('import java.sql.*;\nimport java.util.*;\n\npublic class Synthetic {\n\n', JAVA_BLOCKS, '\n', '}\n'),
+}
+COMMENT_MARKERS = {'ruby': '#', 'php': '//'}
+
+
+@dataclass
+class BenchmarkConfig:
+    """Shape of the synthetic corpus and how often each tool is timed."""
+    files: int = 200
+    languages: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_LANGUAGES))
+    min_lines: int = 40
+    max_lines: int = 400
+    seed: int = 0
+    repeat: int = 3
+
+    def corpus_key(self) -> Dict[str, Any]:
+        """The settings that determine the generated corpus, for baseline matching."""
+        key = asdict(self)
+        del key['repeat']
+        return key
+
+
+def _source_parts(language: str):
+    if language in LANGUAGE_SOURCES:
+        return LANGUAGE_SOURCES[language]
+    comment = COMMENT_MARKERS.get(language, '//')
+    blocks = [block.replace('{comment}', comment) for block in GENERIC_BLOCKS]
+    return f'{comment} Synthetic {language} source\n\n', blocks, '\n', ''
+
+
+def generate_source(language: str, lines: int, rng: random.Random, start: int = 0) -> str:
+    """Source in language of roughly the given number of lines."""
+    header, blocks, separator, footer = _source_parts(language)
+    parts = [header]
+    count = header.count('\n') + footer.count('\n')
+    n = start
+    while count < lines:
+        block = rng.choice(blocks).format(n=n)
+        parts.append(block + separator)
+        count += block.count('\n') + separator.count('\n')
+        n += 1
+    parts.append(footer)
+    return ''.join(parts)
+
+
+def generate_repo(root, config: BenchmarkConfig) -> Dict[str, Any]:
+    """Write the synthetic corpus under root and return its statistics.
+
+    The same config always produces the same files, so runs are comparable.
+    """
+    unknown = set(config.languages) - set(EXTENSION_FOR)
+    if unknown:
+        raise ValueError(f"Unsupported languages: {', '.join(sorted(unknown))}")
+    rng = random.Random(config.seed)
+    languages = sorted(config.languages)
+    weights = [config.languages[language] for language in languages]
+
+    root = Path(root)
+    total_bytes, by_language = 0, {}
+    for i in range(config.files):
+        language = rng.choices(languages, weights)[0]
+        source = generate_source(language, rng.randint(config.min_lines, config.max_lines), rng, start=i * 1000)
+        path = root / f'pkg_{i // 50:03d}' / f'module_{i:05d}{EXTENSION_FOR[language]}'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = source.encode('utf-8')
+        path.write_bytes(data)
+        total_bytes += len(data)
+        by_language[language] = by_language.get(language, 0) + 1
+    return {'files': config.files, 'bytes': total_bytes, 'by_language': by_language}
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _reset_process_caches() -> None:
+    """Forget in-process memoization so every repeat starts cold."""
+    from code_reviewer_agent.tools.ast_cache import _parse
+    from code_reviewer_agent.tools.line_index import get_line_index
+    from code_reviewer_agent.tools.linter_service import get_linter_service
+
+    _parse.cache_clear()
+    get_line_index.cache_clear()
+    get_linter_service().clear()
+
+
+def _time_tool(tool: str, root: str, file_paths: List[str], repeat: int) -> Dict[str, Any]:
+    """Time one tool over the corpus; runs in its own process."""
+    # Cold runs only: a cache hit would time SQLite, not the analyzer
+    os.environ['CODE_REVIEWER_CACHE'] = '0'
+    from code_reviewer_agent.tools import code_analysis_tools as tools
+    from code_reviewer_agent.tools.findings import complexity_findings
+
+    if tool in ('parser', 'parser_packed'):
+        if tool == 'parser':
+            instance = tools.CodeParserTool()
+        else:
+            # The corpus isn't a git checkout, so there is no churn to rank by
+            instance = tools.CodeParserTool(token_budget=DEFAULT_TOKEN_BUDGET, use_churn=False)
+
+        def run_once() -> List[str]:
+            # Paths differ between temp dirs and scan order isn't guaranteed
+            return sorted(instance._run(root).replace(root, '').splitlines())
+    else:
+        instance = {
+            'static': tools.StaticAnalysisTool,
+            'security': tools.SecurityAnalyzerTool,
+            'performance': tools.PerformanceAnalyzerTool,
+            'complexity': tools.ComplexityAnalyzerTool,
+        }[tool]()
+        # Reading is the parser's job; the analyzers are handed the content
+        sources = []
+        for file_path in file_paths:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            language = SUPPORTED_EXTENSIONS.get(Path(file_path).suffix.lower(), 'unknown')
+            sources.append((file_path, language, content))
+
+        def run_once() -> List[Any]:
+            outputs = []
+            for file_path, language, content in sources:
+                if tool == 'complexity':
+                    result = instance.analyze(file_path, content)
+                else:
+                    result = instance.analyze(file_path, language, content)
+                findings = complexity_findings(result.metrics) if tool == 'complexity' else result.findings
+                outputs.append([[finding.to_dict() for finding in findings], result.metrics])
+            return outputs
+
+    timings, digest = [], None
+    for _ in range(repeat):
+        _reset_process_caches()
+        started = time.perf_counter()
+        outputs = run_once()
+        timings.append(time.perf_counter() - started)
+        digest = hashlib.sha256(json.dumps(outputs, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+    findings = None if tool in ('parser', 'parser_packed') else sum(len(output[0]) for output in outputs)
+    return {
+        'seconds': min(timings),
+        'median_seconds': statistics.median(timings),
+        'peak_rss_mb': _peak_rss_mb(),
+        'findings': findings,
+        'digest': digest,
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    from code_reviewer_agent.tools.linter_service import get_linter_service
+
+    service = get_linter_service()
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        # Analyzers fall back to cheaper heuristics without these
+        'pylint': bool(service._load_pylint()),
+        'radon': service.radon_available,
+    }
+
+
+def run_benchmark(config: BenchmarkConfig, tools=TOOLS, repo_dir=None, label: str = '') -> Dict[str, Any]:
+    """Generate the corpus, time each tool over it and return the result record."""
+    with tempfile.TemporaryDirectory(prefix='code_reviewer_bench_') as temp_dir:
+        root = Path(repo_dir or temp_dir)
+        corpus = generate_repo(root, config)
+        file_paths = sorted(str(path) for path in root.rglob('*') if path.suffix in SUPPORTED_EXTENSIONS)
+        megabytes = corpus['bytes'] / (1024 * 1024)
+
+        results = {}
+        # A fresh spawned process per tool: no shared warm caches and a clean peak RSS
+        context = multiprocessing.get_context('spawn')
+        for tool in tools:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                timing = pool.submit(_time_tool, tool, str(root), file_paths, config.repeat).result()
+            seconds = timing['seconds'] or 1e-9
+            results[tool] = {
+                **timing,
+                'files_per_s': round(len(file_paths) / seconds, 1),
+                'mb_per_s': round(megabytes / seconds, 3),
+            }
+            print(f"  {TOOL_NAMES[tool]:<24} {results[tool]['files_per_s']:>10.1f} files/s", flush=True)
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'label': label,
+        'config': asdict(config),
+        'corpus': corpus,
+        'environment': _environment(),
+        'tools': results,
+    }
+
+
+def load_history(path=DEFAULT_RESULTS_FILE) -> List[Dict[str, Any]]:
+    path = Path(path)
+    if not path.exists():
+        return []
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # A run killed mid-write
+    return records
+
+
+def save_result(result: Dict[str, Any], path=DEFAULT_RESULTS_FILE) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(result) + '\n')
+
+
+def find_baseline(history: List[Dict[str, Any]], result: Dict[str, Any],
+                  label: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The latest earlier run over the same corpus with the same linters available."""
+    config = BenchmarkConfig(**result['config']).corpus_key()
+    environment = result['environment']
+    for record in reversed(history):
+        if label is not None and record.get('label') != label:
+            continue
+        try:
+            same_corpus = BenchmarkConfig(**record['config']).corpus_key() == config
+        except (KeyError, TypeError):
+            continue
+        same_linters = all(record.get('environment', {}).get(key) == environment[key] for key in ('pylint', 'radon'))
+        if same_corpus and same_linters:
+            return record
+    return None
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Regressions of result against baseline, as human-readable lines."""
+    regressions = []
+    for tool, current in result['tools'].items():
+        previous = baseline['tools'].get(tool)
+        if not previous:
+            continue
+        name = TOOL_NAMES[tool]
+        if current['files_per_s'] < previous['files_per_s'] * (1 - threshold):
+            regressions.append(
+                f"{name}: {current['files_per_s']:.1f} files/s, down from {previous['files_per_s']:.1f}"
+            )
+        if current['peak_rss_mb'] and previous.get('peak_rss_mb') and \
+                current['peak_rss_mb'] > previous['peak_rss_mb'] * (1 + threshold):
+            regressions.append(
+                f"{name}: peak RSS {current['peak_rss_mb']:.1f} MB, up from {previous['peak_rss_mb']:.1f} MB"
+            )
+        if previous.get('digest') and current['digest'] != previous['digest']:
+            regressions.append(f"{name}: output differs from the baseline run")
+    return regressions
+
+
+def format_report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    corpus = result['corpus']
+    languages = ', '.join(f'{language} {count}' for language, count in sorted(corpus['by_language'].items()))
+    lines = [
+        f"Corpus: {corpus['files']} files, {corpus['bytes'] / (1024 * 1024):.2f} MB ({languages})",
+        f"{'tool':<24} {'files/s':>10} {'MB/s':>8} {'peak RSS MB':>12} {'findings':>9} {'vs baseline':>12}",
+    ]
+    for tool, row in result['tools'].items():
+        change = '-'
+        previous = baseline['tools'].get(tool) if baseline else None
+        if previous and previous.get('files_per_s'):
+            change = f"{row['files_per_s'] / previous['files_per_s'] - 1:+.1%}"
+        rss = f"{row['peak_rss_mb']:.1f}" if row['peak_rss_mb'] is not None else '-'
+        findings = row['findings'] if row['findings'] is not None else '-'
+        lines.append(
+            f"{TOOL_NAMES[tool]:<24} {row['files_per_s']:>10.1f} {row['mb_per_s']:>8.3f} {rss:>12} {findings:>9} {change:>12}"
+        )
+    return '\n'.join(lines)
+
+
+def parse_languages(value: str) -> Dict[str, float]:
+    """Parse a mix such as 'python=3,javascript=1' (a bare name weighs 1)."""
+    languages = {}
+    for item in value.split(','):
+        name, _, weight = item.strip().partition('=')
+        if name:
+            languages[name.strip().lower()] = float(weight) if weight else 1.0
+    return languages
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the code analysis tools over a synthetic repository.")
+    parser.add_argument('--files', type=int, default=BenchmarkConfig.files, help="number of files to generate")
+    parser.add_argument('--languages', type=parse_languages,
+                        default=','.join(f'{name}={weight}' for name, weight in DEFAULT_LANGUAGES.items()),
+                        help="language mix, e.g. python=3,javascript=1 (default: %(default)s)")
+    parser.add_argument('--min-lines', type=int, default=BenchmarkConfig.min_lines)
+    parser.add_argument('--max-lines', type=int, default=BenchmarkConfig.max_lines)
+    parser.add_argument('--seed', type=int, default=BenchmarkConfig.seed)
+    parser.add_argument('--repeat', type=int, default=BenchmarkConfig.repeat,
+                        help="timed runs per tool; the fastest is reported")
+    parser.add_argument('--tools', default=','.join(TOOLS), help="comma-separated subset of: " + ', '.join(TOOLS))
+    parser.add_argument('--repo-dir', help="generate the corpus here and keep it, instead of a temp dir")
+    parser.add_argument('--results', default=os.getenv('CODE_REVIEWER_BENCHMARK_FILE', DEFAULT_RESULTS_FILE),
+                        help="JSON-lines results history (default: %(default)s)")
+    parser.add_argument('--label', default='', help="name stored with this run, e.g. a branch")
+    parser.add_argument('--baseline', help="compare against the latest run with this label")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="relative change that counts as a regression (default: %(default)s)")
+    parser.add_argument('--no-save', action='store_true', help="don't append this run to the history")
+    args = parser.parse_args(argv)
+
+    tools = [tool.strip() for tool in args.tools.split(',') if tool.strip()]
+    unknown = set(tools) - set(TOOLS)
+    if unknown:
+        parser.error(f"unknown tools: {', '.join(sorted(unknown))}")
+    config = BenchmarkConfig(
+        files=args.files, languages=args.languages, min_lines=args.min_lines,
+        max_lines=max(args.min_lines, args.max_lines), seed=args.seed, repeat=max(1, args.repeat)
+    )
+    unsupported = set(config.languages) - set(EXTENSION_FOR)
+    if unsupported:
+        parser.error(f"unsupported languages: {', '.join(sorted(unsupported))}")
+
+    print(f"⏱️ Benchmarking {', '.join(TOOL_NAMES[tool] for tool in tools)} ({config.repeat} runs each)")
+    result = run_benchmark(config, tools, repo_dir=args.repo_dir, label=args.label)
+    baseline = find_baseline(load_history(args.results), result, args.baseline)
+
+    print()
+    print(format_report(result, baseline))
+    if not args.no_save:
+        save_result(result, args.results)
+        print(f"\n💾 Saved to {args.results}")
+
+    if baseline is None:
+        if args.baseline is not None:
+            print(f"\n⚠️ No run labelled '{args.baseline}' over this corpus to compare against.")
+        return 0
+    regressions = compare(result, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ Regressions against the run of {baseline['timestamp']}:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print(f"\n✅ No regressions against the run of {baseline['timestamp']}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
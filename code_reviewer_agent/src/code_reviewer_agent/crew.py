@@ -1,5 +1,11 @@
-from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from crewai import Agent, Crew, CrewOutput, Process, Task
+from crewai.project import CrewBase, agent, before_kickoff, crew, task
+from .llm_cache import CachedLLM
+from .pre_analysis import TASK_SOURCES, pre_analyze
+from .telemetry import get_tracer
 from .tools.code_analysis_tools import (
     CodeParserTool, StaticAnalysisTool, SecurityAnalyzerTool, 
     PerformanceAnalyzerTool
@@ -9,10 +15,30 @@ from .tools.code_analysis_tools import (
 class CodeReviewerAgentCrew:
     """Simplified Code Reviewer Agent crew"""
 
+    @before_kickoff
+    def add_findings_digests(self, inputs: Optional[Dict]) -> Dict:
+        """Hand every task a digest of the deterministic findings.
+
+        The analyzers run in bulk before the agents start, so agents work
+        from a compact, ranked summary instead of calling tools file by
+        file through the LLM loop. Digests already supplied by the caller
+        are kept, as is a review scope; without one (e.g. ``crewai run``)
+        the whole path is reviewed.
+        """
+        inputs = dict(inputs or {})
+        inputs.setdefault('scope', "Full review of every supported file under the path.")
+        missing = [placeholder for placeholder in TASK_SOURCES if placeholder not in inputs]
+        if missing:
+            digests = pre_analyze(inputs['path']) if inputs.get('path') else {}
+            for placeholder in missing:
+                inputs[placeholder] = digests.get(placeholder, "No deterministic findings.")
+        return inputs
+
     @agent
     def code_reviewer(self) -> Agent:
         return Agent(
             config=self.agents_config['code_reviewer'],
+            llm=CachedLLM.from_config(self.agents_config['code_reviewer']['llm']),
             tools=[CodeParserTool(), StaticAnalysisTool()],
             verbose=True
         )
@@ -21,6 +47,7 @@ class CodeReviewerAgentCrew:
     def security_specialist(self) -> Agent:
         return Agent(
             config=self.agents_config['security_specialist'],
+            llm=CachedLLM.from_config(self.agents_config['security_specialist']['llm']),
             tools=[SecurityAnalyzerTool()],
             verbose=True
         )
@@ -29,6 +56,7 @@ class CodeReviewerAgentCrew:
     def performance_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['performance_analyst'],
+            llm=CachedLLM.from_config(self.agents_config['performance_analyst']['llm']),
             tools=[PerformanceAnalyzerTool()],
             verbose=True
         )
@@ -57,9 +85,36 @@ class CodeReviewerAgentCrew:
     @crew
     def crew(self) -> Crew:
         """Creates the simplified Code Reviewer crew"""
+        get_tracer()  # Spans for every kickoff, task, agent, LLM and tool call
         return Crew(
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
             verbose=True,
-        )
\ No newline at end of file
+        )
+
+    def kickoff_concurrent(
+        self,
+        inputs: Dict,
+        max_concurrency: Optional[int] = None
+    ) -> List[CrewOutput]:
+        """Run the review tasks side by side instead of one after another.
+
+        The error, security and performance tasks don't read each other's
+        output, so each runs as its own single-task crew on its own thread
+        (at most max_concurrency at a time). Wall-clock time drops to
+        roughly the slowest task. The LLM calls of all tasks share
+        CachedLLM's slots, so CODE_REVIEWER_LLM_CONCURRENCY still bounds
+        the requests in flight. Outputs are returned in task order; the
+        first failing task's exception is re-raised once all have finished.
+        """
+        inputs = self.add_findings_digests(inputs)
+        # crew() builds the agents and tasks and assigns each task its agent
+        crews = [
+            Crew(agents=[task.agent], tasks=[task], process=Process.sequential, verbose=True)
+            for task in self.crew().tasks
+        ]
+        workers = min(max_concurrency or len(crews), len(crews))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='review-task') as pool:
+            futures = [pool.submit(task_crew.kickoff, inputs=inputs) for task_crew in crews]
+            return [future.result() for future in futures]
@@ -0,0 +1,177 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from code_reviewer_agent.tools.analysis_engine import analyze_files, collect_files
+from code_reviewer_agent.tools.code_analysis_tools import SUPPORTED_EXTENSIONS
+from code_reviewer_agent.tools.file_scanner import FileScanner
+
+STATE_FILE = 'output/review_state.json'
+FINDINGS_FILE = 'output/findings.json'
+
+
+def load_state(state_file: str = STATE_FILE) -> Dict:
+    """Load the record of the last review, if any."""
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state: Dict, state_file: str = STATE_FILE) -> None:
+    os.makedirs(os.path.dirname(state_file) or '.', exist_ok=True)
+    with open(state_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+
+def load_findings(findings_file: str = FINDINGS_FILE) -> Dict[str, Dict]:
+    try:
+        with open(findings_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_findings(findings: Dict[str, Dict], findings_file: str = FINDINGS_FILE) -> None:
+    os.makedirs(os.path.dirname(findings_file) or '.', exist_ok=True)
+    with open(findings_file, 'w', encoding='utf-8') as f:
+        json.dump(findings, f, indent=2, sort_keys=True)
+
+
+def resolve_commit(target_path: str, ref: str = 'HEAD') -> Optional[str]:
+    """Return the commit sha of ref in the repository containing target_path."""
+    try:
+        import git
+        repo = git.Repo(target_path, search_parent_directories=True)
+        return repo.commit(ref).hexsha
+    except Exception:
+        return None  # Not a git checkout, or gitpython unavailable
+
+
+def changed_files(
+    target_path: str,
+    base_ref: str,
+    head_ref: Optional[str] = None
+) -> Tuple[List[str], List[str]]:
+    """Return (changed, deleted) supported files under target_path between two refs.
+
+    When head_ref is omitted the working tree is compared against base_ref,
+    so uncommitted and untracked files are included as well. Files a full
+    scan would skip (ignored directories, .gitignore) are left out.
+    """
+    import git
+
+    repo = git.Repo(target_path, search_parent_directories=True)
+    root = Path(repo.working_tree_dir).resolve()
+    target = Path(target_path).resolve()
+
+    base = repo.commit(base_ref)
+    if head_ref:
+        diffs = base.diff(repo.commit(head_ref))
+        untracked = []
+    else:
+        diffs = base.diff(None)
+        untracked = repo.untracked_files
+
+    changed, deleted = set(), set()
+    for diff in diffs:
+        if diff.deleted_file or diff.renamed_file:
+            deleted.add(diff.a_path)
+        if not diff.deleted_file:
+            changed.add(diff.b_path)
+    changed.update(untracked)
+
+    scanner = FileScanner(SUPPORTED_EXTENSIONS.keys())
+
+    def in_scope(rel_path: str) -> bool:
+        abs_path = root / rel_path
+        if abs_path == target:
+            return Path(rel_path).suffix.lower() in SUPPORTED_EXTENSIONS
+        return scanner.includes(target, abs_path)
+
+    return (
+        sorted(str(root / p) for p in changed if in_scope(p)),
+        sorted(str(root / p) for p in deleted - changed if in_scope(p)),
+    )
+
+
+def refresh_findings(
+    target_path: str,
+    base_ref: Optional[str] = None,
+    head_ref: Optional[str] = None,
+    full: bool = False
+) -> Dict:
+    """Bring the stored findings up to date with target_path.
+
+    Unless full is set, only files changed since base_ref (or since the
+    last recorded run) are re-analyzed; findings for every other file are
+    carried over, so the merged findings set always covers the whole
+    target. Without stored findings for the target (a first run, another
+    target) there is nothing to carry over and the whole target is
+    analyzed. Returns a summary of the review scope, with 'changed' set to
+    None for a full review and the merged results under 'findings'.
+    Nothing is stored until record_review, so a failed review leaves the
+    previous target's findings intact.
+    """
+    # Findings are keyed by absolute path in both full and incremental mode
+    target_path = str(Path(target_path).resolve())
+    state = load_state()
+    previous = load_findings() if state.get('target') == target_path else {}
+    if full or not previous:
+        # A diff alone can't build a complete findings set
+        base_ref = None
+    else:
+        base_ref = base_ref or state.get('commit')
+
+    changed = deleted = None
+    if base_ref:
+        try:
+            changed, deleted = changed_files(target_path, base_ref, head_ref)
+        except Exception as e:
+            print(f"⚠️ Incremental diff unavailable ({e}), falling back to full review")
+
+    if changed is None:
+        findings = analyze_files(collect_files(target_path))
+    else:
+        findings = {path: result for path, result in previous.items() if path not in deleted}
+        findings.update(analyze_files(changed))
+
+    return {
+        'target': target_path,
+        'commit': resolve_commit(target_path, head_ref or 'HEAD'),
+        'base_ref': base_ref,
+        'changed': changed,
+        'deleted': deleted or [],
+        'total_files': len(findings),
+        'findings': findings,
+    }
+
+
+def record_review(scope: Dict) -> None:
+    """Store a completed review's findings, and remember it so the next run can diff against it."""
+    save_findings(scope['findings'])
+    save_state({
+        'target': scope['target'],
+        'commit': scope['commit'],
+        'base_ref': scope['base_ref'],
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+    })
+
+
+def describe_scope(scope: Dict) -> str:
+    """Render the review scope for the task prompts."""
+    if scope['changed'] is None:
+        return f"Full review of all {scope['total_files']} supported files."
+
+    lines = [
+        f"Incremental review: only these {len(scope['changed'])} changed files need analysis.",
+        f"Findings for the other files are unchanged and kept in {FINDINGS_FILE}.",
+    ]
+    lines.extend(f"- {path}" for path in scope['changed'])
+    if scope['deleted']:
+        lines.append("Deleted files (drop any earlier findings for them):")
+        lines.extend(f"- {path}" for path in scope['deleted'])
+    return '\n'.join(lines)
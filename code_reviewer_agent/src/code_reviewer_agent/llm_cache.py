@@ -0,0 +1,135 @@
+import inspect
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from crewai import LLM
+
+from code_reviewer_agent.telemetry import get_tracer
+from code_reviewer_agent.tools.analysis_cache import MISS, AnalysisCache, DEFAULT_CACHE_DIR
+
+DEFAULT_LLM_CACHE_TTL = 7 * 24 * 3600
+DEFAULT_LLM_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Upper bound on LLM requests in flight at once, shared by the review tasks
+DEFAULT_LLM_CONCURRENCY = 3
+
+_cache: Optional[AnalysisCache] = None
+_cache_pid: Optional[int] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[AnalysisCache]:
+    """Return the process-wide LLM response cache, or None when disabled.
+
+    Lives next to the analysis cache (CODE_REVIEWER_CACHE_DIR) and is
+    configured through CODE_REVIEWER_LLM_CACHE (set to 0 to disable),
+    CODE_REVIEWER_LLM_CACHE_TTL (seconds) and CODE_REVIEWER_LLM_CACHE_MAX_MB.
+    """
+    global _cache, _cache_pid
+
+    if os.getenv('CODE_REVIEWER_LLM_CACHE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+
+    with _cache_lock:
+        # SQLite connections must not be shared across forked processes
+        if _cache is None or _cache_pid != os.getpid():
+            cache_dir = Path(os.getenv('CODE_REVIEWER_CACHE_DIR', DEFAULT_CACHE_DIR))
+            ttl = float(os.getenv('CODE_REVIEWER_LLM_CACHE_TTL', DEFAULT_LLM_CACHE_TTL))
+            max_mb = os.getenv('CODE_REVIEWER_LLM_CACHE_MAX_MB')
+            max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_LLM_CACHE_MAX_BYTES
+            try:
+                _cache = AnalysisCache(cache_dir / 'llm.sqlite', max_bytes=max_bytes, ttl=ttl)
+            except (OSError, sqlite3.Error):
+                return None  # Read-only home or similar, run uncached
+            _cache_pid = os.getpid()
+        return _cache
+
+
+def llm_concurrency_limit() -> int:
+    """Configured through CODE_REVIEWER_LLM_CONCURRENCY (defaults to 3)."""
+    try:
+        return max(1, int(os.getenv('CODE_REVIEWER_LLM_CONCURRENCY', DEFAULT_LLM_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_LLM_CONCURRENCY
+
+
+_slots: Optional[threading.BoundedSemaphore] = None
+_slots_lock = threading.Lock()
+
+
+def llm_slots() -> threading.BoundedSemaphore:
+    """Return the process-wide semaphore every uncached LLM request holds while in flight."""
+    global _slots
+    with _slots_lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(llm_concurrency_limit())
+        return _slots
+
+
+class CachedLLM(LLM):
+    """crewAI LLM backed by the llm.sqlite store next to the analysis cache.
+
+    Completions are keyed by the model, its sampling settings and the exact
+    request (messages and tool schemas), so repeated reviews of unchanged
+    code skip the model. Requests that miss the cache wait for one of the
+    llm_slots(), so concurrent tasks never have more than
+    CODE_REVIEWER_LLM_CONCURRENCY calls in flight.
+    """
+
+    @classmethod
+    def from_config(cls, llm: Any) -> 'CachedLLM':
+        """Build the cached equivalent of an agent's ``llm`` setting.
+
+        That is a model name from agents.yaml, or the LLM an ``@llm``
+        method returned for it, whose settings (temperature, max_tokens,
+        base_url, api_key, ...) are all carried over.
+        """
+        if isinstance(llm, str):
+            return cls(model=llm)
+        names = [
+            name for name, parameter in inspect.signature(LLM.__init__).parameters.items()
+            if name != 'self' and parameter.kind is not inspect.Parameter.VAR_KEYWORD
+        ]
+        settings = {name: getattr(llm, name) for name in names if hasattr(llm, name)}
+        return cls(**settings, **(getattr(llm, 'additional_params', None) or {}))
+
+    def _cache_key(self, cache: AnalysisCache, messages: Any, tools: Any) -> str:
+        settings = (
+            self.model,
+            self.temperature,
+            getattr(self, 'top_p', None),
+            getattr(self, 'max_tokens', None),
+            getattr(self, 'stop', None),
+        )
+        request = json.dumps({'messages': messages, 'tools': tools}, sort_keys=True, default=str)
+        return cache.make_key('llm', *settings, content=request)
+
+    def call(self, messages, tools=None, *args, **kwargs):
+        cache = get_llm_cache()
+        if cache is None:
+            with llm_slots():
+                return super().call(messages, tools, *args, **kwargs)
+
+        key = self._cache_key(cache, messages, tools)
+        try:
+            cached = cache.get(key)
+        except (sqlite3.Error, ValueError):
+            cached = MISS
+        if cached is not MISS:
+            tracer = get_tracer()
+            if tracer is not None:
+                tracer.mark('cache_hits')
+            return cached
+
+        with llm_slots():
+            response = super().call(messages, tools, *args, **kwargs)
+        # Only plain text is cacheable; tool-call objects are left alone
+        if isinstance(response, str) and response:
+            try:
+                cache.put(key, response)
+            except sqlite3.Error:
+                pass  # A full or locked cache must never fail the call
+        return response
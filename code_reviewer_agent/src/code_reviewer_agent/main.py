@@ -1,51 +1,96 @@
 #!/usr/bin/env python
 import os
+import sys
 from pathlib import Path
 from code_reviewer_agent.crew import CodeReviewerAgentCrew
+from code_reviewer_agent.incremental import (
+    refresh_findings, record_review, describe_scope, FINDINGS_FILE
+)
+from code_reviewer_agent.pre_analysis import build_task_digests
+from code_reviewer_agent.telemetry import format_summary, get_tracer
+
+DEFAULT_TARGET_PATH = "/Users/gk/Documents/GitHub/recognition"
 
 def run():
     """
     Run the simplified code reviewer agent.
     """
-    target_path = "/Users/gk/Documents/GitHub/recognition"
-    
+    review(DEFAULT_TARGET_PATH, full=True)
+
+def run_incremental():
+    """
+    Review only the files changed since the last recorded run, or between
+    two refs: run_incremental [base_ref] [head_ref]
+    """
+    base_ref = sys.argv[1] if len(sys.argv) > 1 else None
+    head_ref = sys.argv[2] if len(sys.argv) > 2 else None
+    review(DEFAULT_TARGET_PATH, base_ref=base_ref, head_ref=head_ref)
+
+def review(target_path, base_ref=None, head_ref=None, full=False, concurrent=True):
+    """
+    Refresh the deterministic findings for target_path, then kick off the crew
+    over the files in scope. The three review tasks are independent, so by
+    default they run concurrently (with their LLM calls bounded by
+    CODE_REVIEWER_LLM_CONCURRENCY); pass concurrent=False to run them one
+    after another.
+    """
     if not Path(target_path).exists():
         print(f"Error: Path '{target_path}' does not exist.")
         return
-    
+
     os.makedirs('output', exist_ok=True)
-    
+
+    scope = refresh_findings(target_path, base_ref=base_ref, head_ref=head_ref, full=full)
+    if scope['changed'] == [] and not scope['deleted']:
+        print(f"✅ No changes since the last review of {target_path}; previous reports are up to date.")
+        return
+
     inputs = {
-        'path': target_path
+        'path': target_path,
+        'scope': describe_scope(scope),
+        **build_task_digests(scope['findings'], root=scope['target'], changed=scope['changed'])
     }
-    
-    print(f"🔍 Starting simplified code review for: {target_path}")
+
+    mode = "full" if scope['changed'] is None else f"incremental ({len(scope['changed'])} changed files)"
+    print(f"🔍 Starting simplified code review for: {target_path} [{mode}]")
     print("📋 Generating 3 focused reports:")
     print("  1. Error & Suggestions Report")
-    print("  2. Security Report") 
+    print("  2. Security Report")
     print("  3. Performance Report")
     print("=" * 50)
-    
+
+    tracer = get_tracer()
+    seen = {root.span_id for root in tracer.recent} if tracer else set()
     try:
         crew_instance = CodeReviewerAgentCrew()
-        result = crew_instance.crew().kickoff(inputs=inputs)
-        
+        if concurrent:
+            crew_instance.kickoff_concurrent(inputs=inputs)
+        else:
+            crew_instance.crew().kickoff(inputs=inputs)
+        record_review(scope)
+
         print("\n" + "=" * 50)
         print("✅ Code review completed successfully!")
         print("\n📊 Reports generated:")
         print("- output/error_suggestions_report.md")
         print("- output/security_report.md")
         print("- output/performance_report.md")
-        
+        print(f"- {FINDINGS_FILE} ({scope['total_files']} files)")
+
         # Quick summary
         print(f"\n📋 Summary:")
         print("✅ Error analysis completed")
         print("✅ Security scan completed")
         print("✅ Performance analysis completed")
-        
+
+        traces = [root for root in tracer.recent if root.span_id not in seen] if tracer else []
+        if traces:
+            print(f"\n⏱️ Timing and token usage:")
+            print(format_summary(traces))
+
     except Exception as e:
         print(f"❌ Error during code review: {str(e)}")
         print("💡 Try running again in a few minutes if rate limited.")
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run()
@@ -0,0 +1,135 @@
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from code_reviewer_agent.incremental import load_findings, load_state
+from code_reviewer_agent.tools.analysis_engine import analyze_files, collect_files
+from code_reviewer_agent.tools.context_packer import estimate_tokens
+from code_reviewer_agent.tools.findings import SEVERITY_ORDER, Finding, complexity_findings
+
+DEFAULT_DIGEST_TOKENS = 2000
+# How many locations to list for one deduplicated finding
+MAX_LOCATIONS = 5
+# Radon complexity above which a function is reported to the error task
+COMPLEXITY_THRESHOLD = 10
+
+# Task input placeholder -> analyzer results that feed it
+TASK_SOURCES = {
+    'error_findings': ('static', 'complexity'),
+    'security_findings': ('security',),
+    'performance_findings': ('performance',),
+}
+
+
+def digest_token_budget() -> int:
+    """Per-task budget, configured through CODE_REVIEWER_DIGEST_TOKENS."""
+    try:
+        return max(100, int(os.getenv('CODE_REVIEWER_DIGEST_TOKENS', DEFAULT_DIGEST_TOKENS)))
+    except ValueError:
+        return DEFAULT_DIGEST_TOKENS
+
+
+def _task_findings(result: Dict, sources: Tuple[str, ...]) -> List[Finding]:
+    findings = []
+    for source in sources:
+        if source not in result:
+            continue
+        if source == 'complexity':
+            findings.extend(complexity_findings(result[source].get('metrics', {}), COMPLEXITY_THRESHOLD))
+        else:
+            findings.extend(Finding(**finding) for finding in result[source].get('findings', []))
+    return findings
+
+
+def build_digest(
+    results: Dict[str, Dict],
+    sources: Tuple[str, ...],
+    root: str = '',
+    token_budget: int = DEFAULT_DIGEST_TOKENS
+) -> str:
+    """Condense analyzer results into a ranked, deduplicated digest.
+
+    Findings sharing a type, severity and message are merged into one
+    entry listing where they occur. Entries are ranked by severity, then
+    by how often they occur, and added until the token budget is spent.
+    """
+    groups: Dict[Tuple[str, str, str], Dict] = {}
+    for file_path in sorted(results):
+        display_path = os.path.relpath(file_path, root) if root else file_path
+        for finding in _task_findings(results[file_path], sources):
+            key = (finding.type, finding.severity, finding.message)
+            group = groups.setdefault(key, {'suggestion': finding.suggestion, 'locations': []})
+            group['locations'].append(f"{display_path}:{finding.line}")
+
+    if not groups:
+        return "No deterministic findings."
+
+    severity_rank = {severity: rank for rank, severity in enumerate(SEVERITY_ORDER)}
+    ranked = sorted(
+        groups.items(),
+        key=lambda item: (severity_rank.get(item[0][1], len(SEVERITY_ORDER)), -len(item[1]['locations']), item[0][0])
+    )
+
+    total = sum(len(group['locations']) for group in groups.values())
+    header = f"{total} findings in {len(groups)} distinct issues (most severe first):"
+    lines = [header]
+    used = estimate_tokens(header)
+    omitted = 0
+    for (issue_type, severity, message), group in ranked:
+        locations = group['locations']
+        shown = ', '.join(locations[:MAX_LOCATIONS])
+        if len(locations) > MAX_LOCATIONS:
+            shown += f" (+{len(locations) - MAX_LOCATIONS} more)"
+        entry = f"- [{severity}] {issue_type}: {message} ({len(locations)}x) at {shown}"
+        if group['suggestion']:
+            entry += f"\n  Fix: {group['suggestion']}"
+
+        cost = estimate_tokens(entry)
+        if used + cost > token_budget:
+            omitted += 1
+            continue
+        lines.append(entry)
+        used += cost
+
+    if omitted:
+        lines.append(f"- ... {omitted} lower-ranked issues omitted to fit the token budget")
+    return '\n'.join(lines)
+
+
+def build_task_digests(
+    results: Dict[str, Dict],
+    root: str = '',
+    changed: Optional[Iterable[str]] = None,
+    token_budget: Optional[int] = None
+) -> Dict[str, str]:
+    """Return a findings digest for every review task, keyed by task input.
+
+    With ``changed`` set (an incremental review) only those files are
+    included.
+    """
+    if root and os.path.isfile(root):
+        root = os.path.dirname(root)
+    if changed is not None:
+        changed = set(changed)
+        results = {path: result for path, result in results.items() if path in changed}
+    budget = token_budget or digest_token_budget()
+    return {
+        placeholder: build_digest(results, sources, root=root, token_budget=budget)
+        for placeholder, sources in TASK_SOURCES.items()
+    }
+
+
+def pre_analyze(target_path: str) -> Dict[str, str]:
+    """Build task digests for target_path.
+
+    Reuses the stored findings when they belong to this target, otherwise
+    runs every deterministic analyzer over it in bulk (mostly cache hits
+    for files seen before).
+    """
+    # Same absolute keys as the findings refresh_findings stores
+    target_path = str(Path(target_path).resolve())
+    if load_state().get('target') == target_path:
+        results = load_findings()
+    else:
+        results = analyze_files(collect_files(target_path))
+    return build_task_digests(results, root=target_path)
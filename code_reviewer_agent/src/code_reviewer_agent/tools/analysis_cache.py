@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'code_reviewer_agent'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Sentinel returned by AnalysisCache.get on a miss, since findings may be falsy
+MISS = object()
+
+
+class Uncached:
+    """Wraps a compute() result that cached_analysis hands back without storing.
+
+    For degraded results, e.g. findings produced while pylint crashed or
+    timed out, which must not be served again once the tool works.
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class AnalysisCache:
+    """Persistent SQLite store of analyzer findings.
+
+    Entries are JSON documents keyed by a digest of the file content, the
+    tool name and the tool/rule-set versions. When the stored payload grows
+    past ``max_bytes`` the least recently used entries are evicted. With a
+    ``ttl`` (seconds), older entries read as misses and are purged on the
+    next eviction pass.
+    """
+
+    # How many writes to batch between size checks
+    EVICT_CHECK_INTERVAL = 64
+
+    def __init__(self, path, max_bytes: int = DEFAULT_MAX_BYTES, ttl: Optional[float] = None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' created REAL NOT NULL,'
+            ' accessed REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts: str, content: str) -> str:
+        """Build a cache key from identifying parts and the file content."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(content.encode('utf-8', errors='surrogatepass'))
+        return digest.hexdigest()
+
+    def _expiry(self) -> float:
+        """Creation time before which entries count as expired."""
+        return time.time() - self.ttl if self.ttl else float('-inf')
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for key, or MISS."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value FROM entries WHERE key = ? AND created > ?', (key, self._expiry())
+            ).fetchone()
+            if row is None:
+                return MISS
+            self._conn.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM entries WHERE key = ? AND created > ?', (key, self._expiry())
+            ).fetchone()
+        return row is not None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serialisable value under key."""
+        payload = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)',
+                (key, payload, len(payload), now, now)
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % self.EVICT_CHECK_INTERVAL == 0:
+                self._evict_locked()
+
+    def evict(self) -> None:
+        """Drop expired entries, then least recently used ones until under the size limit."""
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        if self.ttl:
+            self._conn.execute('DELETE FROM entries WHERE created <= ?', (self._expiry(),))
+            self._conn.commit()
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Trim to 90% so we don't evict again on the very next write
+        target = int(self.max_bytes * 0.9)
+        freed = 0
+        stale = []
+        for key, size in self._conn.execute('SELECT key, size FROM entries ORDER BY accessed'):
+            if total - freed <= target:
+                break
+            stale.append((key,))
+            freed += size
+        self._conn.executemany('DELETE FROM entries WHERE key = ?', stale)
+        self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._conn.execute('DELETE FROM entries')
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[AnalysisCache] = None
+_cache_pid: Optional[int] = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """Return the process-wide analysis cache, or None when disabled.
+
+    Configured through CODE_REVIEWER_CACHE (set to 0 to disable),
+    CODE_REVIEWER_CACHE_DIR and CODE_REVIEWER_CACHE_MAX_MB.
+    """
+    global _cache, _cache_pid
+
+    if os.getenv('CODE_REVIEWER_CACHE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+
+    with _cache_lock:
+        # SQLite connections must not be shared across forked processes
+        if _cache is None or _cache_pid != os.getpid():
+            cache_dir = Path(os.getenv('CODE_REVIEWER_CACHE_DIR', DEFAULT_CACHE_DIR))
+            max_mb = os.getenv('CODE_REVIEWER_CACHE_MAX_MB')
+            max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+            try:
+                _cache = AnalysisCache(cache_dir / 'analysis.sqlite', max_bytes=max_bytes)
+            except (OSError, sqlite3.Error):
+                return None  # Read-only home or similar, run uncached
+            _cache_pid = os.getpid()
+        return _cache
+
+
+def is_cached(key_parts: tuple, content: str) -> bool:
+    """Whether a result for this content is already in the analysis cache."""
+    cache = get_analysis_cache()
+    if cache is None:
+        return False
+    try:
+        return cache.contains(cache.make_key(*key_parts, content=content))
+    except sqlite3.Error:
+        return False
+
+
+def cached_analysis(key_parts: tuple, content: str, compute: Callable[[], Any]) -> Any:
+    """Return compute() for this content, going through the analysis cache.
+
+    compute() may return an Uncached result, which is unwrapped but not stored.
+    """
+    cache = get_analysis_cache()
+    if cache is None:
+        value = compute()
+        return value.value if isinstance(value, Uncached) else value
+
+    key = cache.make_key(*key_parts, content=content)
+    try:
+        value = cache.get(key)
+    except (sqlite3.Error, ValueError):
+        value = MISS
+    if value is not MISS:
+        return value
+
+    value = compute()
+    if isinstance(value, Uncached):
+        return value.value
+    try:
+        cache.put(key, value)
+    except sqlite3.Error:
+        pass  # A full or locked cache must never fail the analysis
+    return value
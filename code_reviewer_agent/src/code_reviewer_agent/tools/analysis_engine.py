@@ -0,0 +1,217 @@
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .code_analysis_tools import (
+    SUPPORTED_EXTENSIONS, StaticAnalysisTool, SecurityAnalyzerTool,
+    PerformanceAnalyzerTool, ComplexityAnalyzerTool
+)
+from .file_reader import SkippedFile, check_readable
+from .file_scanner import FileScanner
+from .linter_service import get_linter_service
+
+_tools: Optional[Dict] = None
+
+
+class AnalysisTimeout(BaseException):
+    """Raised inside a worker when a single file exceeds its time budget.
+
+    A BaseException, so the `except Exception` handlers in the analyzers,
+    the linter service and pylint itself can't swallow it and carry on
+    past the budget.
+    """
+
+
+def _get_tools() -> Dict:
+    """Build the analyzer tools once per process."""
+    global _tools
+    if _tools is None:
+        _tools = {
+            'static': StaticAnalysisTool(),
+            'security': SecurityAnalyzerTool(),
+            'performance': PerformanceAnalyzerTool(),
+            'complexity': ComplexityAnalyzerTool(),
+        }
+    return _tools
+
+
+def collect_files(path: str) -> list:
+    """Return every supported code file under path (or path itself)."""
+    path_obj = Path(path)
+    if path_obj.is_file():
+        return [str(path_obj)] if path_obj.suffix.lower() in SUPPORTED_EXTENSIONS else []
+    files_by_suffix = FileScanner(SUPPORTED_EXTENSIONS.keys()).scan(path_obj)
+    return sorted(p for paths in files_by_suffix.values() for p in paths)
+
+
+def language_for(file_path: str) -> str:
+    return SUPPORTED_EXTENSIONS.get(Path(file_path).suffix.lower(), 'unknown')
+
+
+def read_source(file_path: str) -> str:
+    """Read a source file, refusing binaries and files over the size cap."""
+    check_readable(file_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def analyze_file(file_path: str, content: Optional[str] = None) -> Dict:
+    """Run every deterministic analyzer over one file."""
+    language = language_for(file_path)
+    if content is None:
+        try:
+            content = read_source(file_path)
+        except SkippedFile as e:
+            return {'language': language, 'skipped': str(e)}
+        except (OSError, UnicodeDecodeError) as e:
+            return {'language': language, 'error': f"Could not read file: {str(e)}"}
+
+    tools = _get_tools()
+    return {
+        'language': language,
+        'static': tools['static'].analyze(file_path, language, content).to_dict(),
+        'security': tools['security'].analyze(file_path, language, content).to_dict(),
+        'performance': tools['performance'].analyze(file_path, language, content).to_dict(),
+        'complexity': tools['complexity'].analyze(file_path, content).to_dict(),
+    }
+
+
+def _on_timeout(signum, frame):
+    raise AnalysisTimeout()
+
+
+def _prefetch_pylint(file_paths: List[str]) -> None:
+    """Lint every Python file of a chunk that misses the cache in one pylint run."""
+    static_tool = _get_tools()['static']
+    pending = []
+    for file_path in file_paths:
+        if language_for(file_path) != 'python':
+            continue
+        try:
+            content = read_source(file_path)
+        except (OSError, UnicodeDecodeError, SkippedFile):
+            continue
+        if static_tool.needs_analysis(file_path, 'python', content):
+            pending.append(file_path)
+    if len(pending) > 1:
+        get_linter_service().lint(pending)
+
+
+def _analyze_chunk(file_paths: List[str], file_timeout: Optional[float]) -> List[Dict]:
+    """Worker entry point: analyze a chunk of files, each under its own timeout."""
+    # SIGALRM only exists on Unix and can only be handled on the main thread;
+    # elsewhere files run without a budget
+    use_alarm = (
+        bool(file_timeout)
+        and hasattr(signal, 'setitimer')
+        and threading.current_thread() is threading.main_thread()
+    )
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _on_timeout)
+
+    results = []
+    try:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, file_timeout * len(file_paths))
+        try:
+            try:
+                _prefetch_pylint(file_paths)
+            finally:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+        except (AnalysisTimeout, Exception):
+            pass  # Each file is linted on its own below instead, under its own budget
+
+        for file_path in file_paths:
+            # The timer is disarmed before the result is kept, so an alarm
+            # can't fire after a file has been recorded and record it twice
+            try:
+                try:
+                    if use_alarm:
+                        signal.setitimer(signal.ITIMER_REAL, file_timeout)
+                    result = analyze_file(file_path)
+                finally:
+                    if use_alarm:
+                        signal.setitimer(signal.ITIMER_REAL, 0)
+            except AnalysisTimeout:
+                result = {
+                    'language': language_for(file_path),
+                    'error': f"Analysis timed out after {file_timeout}s"
+                }
+            except Exception as e:
+                result = {
+                    'language': language_for(file_path),
+                    'error': f"Analysis failed: {str(e)}"
+                }
+            results.append(result)
+    finally:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, previous)
+    return results
+
+
+class BatchAnalysisEngine:
+    """Fan files out across a process pool and merge the findings.
+
+    Files are sorted, split into chunks and analyzed in worker processes,
+    each file under its own timeout. Results are always merged back in path
+    order, so the output does not depend on worker scheduling.
+    """
+
+    # Below this many files the pool start-up costs more than it saves
+    MIN_PARALLEL_FILES = 8
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        file_timeout: Optional[float] = 120.0
+    ):
+        if max_workers is None:
+            max_workers = int(os.getenv('CODE_REVIEWER_WORKERS', '0')) or os.cpu_count() or 1
+        self.max_workers = max(1, max_workers)
+        self.chunk_size = chunk_size
+        self.file_timeout = file_timeout
+
+    def _chunks(self, file_paths: List[str]) -> List[List[str]]:
+        chunk_size = self.chunk_size
+        if not chunk_size:
+            # Several chunks per worker keeps the pool busy when file sizes vary
+            chunk_size = max(1, min(64, len(file_paths) // (self.max_workers * 4)))
+        return [file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size)]
+
+    def analyze(self, file_paths: Iterable[str]) -> Dict[str, Dict]:
+        """Analyze files, returning findings keyed by path in sorted order."""
+        file_paths = sorted(set(file_paths))
+        if self.max_workers == 1 or len(file_paths) < self.MIN_PARALLEL_FILES:
+            results = _analyze_chunk(file_paths, self.file_timeout)
+            return dict(zip(file_paths, results))
+
+        chunks = self._chunks(file_paths)
+        merged: Dict[str, Dict] = {}
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+            futures = [pool.submit(_analyze_chunk, chunk, self.file_timeout) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                try:
+                    results = future.result()
+                except BrokenProcessPool as e:
+                    results = [
+                        {'language': language_for(file_path), 'error': f"Analysis worker crashed: {str(e)}"}
+                        for file_path in chunk
+                    ]
+                except (AnalysisTimeout, Exception) as e:
+                    # Only this chunk's files are lost, not the whole batch
+                    error = f"Analysis failed: {str(e) or type(e).__name__}"
+                    results = [{'language': language_for(file_path), 'error': error} for file_path in chunk]
+                merged.update(zip(chunk, results))
+
+        return {file_path: merged[file_path] for file_path in file_paths}
+
+
+def analyze_files(file_paths: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, Dict]:
+    """Analyze a batch of files, returning findings keyed by path."""
+    return BatchAnalysisEngine(max_workers=max_workers).analyze(file_paths)
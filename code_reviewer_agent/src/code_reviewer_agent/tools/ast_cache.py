@@ -0,0 +1,24 @@
+import ast
+from functools import lru_cache
+from typing import Union
+
+
+@lru_cache(maxsize=8)
+def _parse(content: str) -> Union[ast.Module, SyntaxError, ValueError]:
+    try:
+        return ast.parse(content)
+    except (SyntaxError, ValueError) as e:
+        return e
+
+
+def parse_python(content: str) -> ast.Module:
+    """Parse Python source once and share the tree between analyzers.
+
+    Raises SyntaxError (or ValueError for source containing null bytes)
+    like ast.parse; failures are memoized too so broken files aren't
+    re-parsed by every analyzer. Callers must treat the tree as read-only.
+    """
+    result = _parse(content)
+    if isinstance(result, Exception):
+        raise result
+    return result
@@ -3,73 +3,129 @@ import ast
 import re
 import subprocess
 import json
-from typing import List, Dict, Any, Optional
+import hashlib
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
+from .analysis_cache import Uncached, cached_analysis, is_cached
+from .file_reader import DEFAULT_MAX_FILE_BYTES, SkippedFile, summarize_file
+from .context_packer import DEFAULT_TOKEN_BUDGET, ContextPacker, file_churn, file_contexts
+from .file_scanner import FileScanner
+from .findings import AnalysisResult, Finding, render_result
+from .ast_cache import parse_python
+from .line_index import get_line_index
+from .linter_service import get_linter_service
 
 class CodeParserInput(BaseModel):
     """Input for code parser tool."""
     path: str = Field(..., description="Path to file or directory to analyze")
 
+SUPPORTED_EXTENSIONS = {
+    '.py': 'python',
+    '.js': 'javascript', 
+    '.ts': 'typescript',
+    '.java': 'java',
+    '.cpp': 'cpp',
+    '.c': 'c',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.php': 'php',
+    '.rb': 'ruby',
+    '.cs': 'csharp'
+}
+
 class CodeParserTool(BaseTool):
     name: str = "Code Parser Tool"
     description: str = "Parses files or directories to identify code files for analysis"
     args_schema: type[BaseModel] = CodeParserInput
+    ignore_patterns: List[str] = Field(
+        default_factory=list,
+        description="Extra gitignore-style patterns to skip while scanning"
+    )
+    use_gitignore: bool = True
+    max_file_bytes: int = Field(
+        default=DEFAULT_MAX_FILE_BYTES,
+        description="Files larger than this are skipped instead of read"
+    )
+    sample_head_chars: int = 4000
+    sample_tail_chars: int = 1000
+    # Packing runs every analyzer over the tree, so it is opt-in: the
+    # crew's agents already get pre-analysis digests, and the plain
+    # inventory stays a single cheap pass over the files
+    token_budget: int = Field(
+        default=0,
+        description=f"Approximate token budget for a packed context (e.g. {DEFAULT_TOKEN_BUDGET}); 0 lists every file without code"
+    )
+    use_churn: bool = Field(default=True, description="Rank frequently changed files higher (needs git)")
 
     def _run(self, path: str) -> str:
         """Parse the given path and return code files information."""
-        supported_extensions = {
-            '.py': 'python',
-            '.js': 'javascript', 
-            '.ts': 'typescript',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.c': 'c',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.php': 'php',
-            '.rb': 'ruby',
-            '.cs': 'csharp'
-        }
-        
         files_info = []
         path_obj = Path(path)
         
         if path_obj.is_file():
             files_to_analyze = [path_obj]
         elif path_obj.is_dir():
-            files_to_analyze = []
-            for ext in supported_extensions.keys():
-                files_to_analyze.extend(path_obj.rglob(f"*{ext}"))
+            # Walk the tree once and bucket files by suffix
+            scanner = FileScanner(
+                SUPPORTED_EXTENSIONS.keys(),
+                ignore_patterns=self.ignore_patterns,
+                use_gitignore=self.use_gitignore
+            )
+            files_by_suffix = scanner.scan(path_obj)
+            files_to_analyze = [
+                Path(file_path)
+                for ext in SUPPORTED_EXTENSIONS.keys()
+                for file_path in files_by_suffix[ext]
+            ]
         else:
             return f"Error: Path '{path}' does not exist."
         
         for file_path in files_to_analyze:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                # Streamed in chunks; content is a bounded head/tail sample
+                summary = summarize_file(
+                    str(file_path),
+                    max_bytes=self.max_file_bytes,
+                    head_chars=self.sample_head_chars,
+                    tail_chars=self.sample_tail_chars
+                )
                 
                 extension = file_path.suffix.lower()
-                language = supported_extensions.get(extension, 'unknown')
-                
-                lines_of_code = len([line for line in content.split('\n') if line.strip()])
+                language = SUPPORTED_EXTENSIONS.get(extension, 'unknown')
                 
                 files_info.append({
                     'path': str(file_path),
                     'language': language,
-                    'size_bytes': file_path.stat().st_size,
-                    'lines_of_code': lines_of_code,
-                    'content': content[:5000] + "..." if len(content) > 5000 else content  # Truncate for large files
+                    **summary
                 })
                 
+            except SkippedFile as e:
+                files_info.append({
+                    'path': str(file_path),
+                    'skipped': str(e)
+                })
             except Exception as e:
                 files_info.append({
                     'path': str(file_path),
                     'error': f"Could not read file: {str(e)}"
                 })
         
-        return self._format_files_info(files_info)
+        if not self.token_budget or not files_info:
+            return self._format_files_info(files_info)
+        return self._pack_context(path, files_info)
+    
+    def _pack_context(self, path: str, files_info: List[Dict]) -> str:
+        """Rank files by risk and churn and pack snippets around their findings."""
+        # Imported here: the engine builds the analyzer tools from this module
+        from .analysis_engine import analyze_files
+        
+        readable = [info['path'] for info in files_info if 'lines_of_code' in info]
+        results = analyze_files(readable)
+        churn = file_churn(path) if self.use_churn else {}
+        packer = ContextPacker(token_budget=self.token_budget, root=path)
+        return packer.pack(files_info, file_contexts(files_info, results, churn))
     
     def _format_files_info(self, files_info: List[Dict]) -> str:
         if not files_info:
@@ -78,10 +134,14 @@ class CodeParserTool(BaseTool):
         report = "# Code Files Inventory\n\n"
         report += f"**Total files found:** {len(files_info)}\n\n"
         
+        skipped = [f for f in files_info if 'skipped' in f]
+        if skipped:
+            report += f"**Skipped (binary or over size cap):** {len(skipped)}\n\n"
+        
         # Group by language
         by_language = {}
         for file_info in files_info:
-            if 'error' not in file_info:
+            if 'error' not in file_info and 'skipped' not in file_info:
                 lang = file_info['language']
                 if lang not in by_language:
                     by_language[lang] = []
@@ -107,17 +167,56 @@ class StaticAnalysisInput(BaseModel):
     language: str = Field(..., description="Programming language of the file")
     content: str = Field(..., description="File content to analyze")
 
+# Line-level rules; none of them may match across a newline
+JS_CONSOLE_LOG = re.compile(r'console\.log')
+JS_LOOSE_EQUALITY = re.compile(r'[^=!\n]==[^=\n]')
+LONG_LINE = re.compile(r'^[^\n]{121,}', re.MULTILINE)
+TODO_COMMENT = re.compile(r'TODO|FIXME|HACK', re.IGNORECASE)
+
 class StaticAnalysisTool(BaseTool):
     name: str = "Static Analysis Tool"
     description: str = "Performs static code analysis using various tools and techniques"
     args_schema: type[BaseModel] = StaticAnalysisInput
+    tool_version: str = "2.0"
+    ruleset_version: str = "1"
+    output_format: str = Field(default="markdown", description="'markdown' or 'json'")
 
     def _run(self, file_path: str, language: str, content: str) -> str:
         """Perform static analysis on the given file."""
+        return render_result(self.analyze(file_path, language, content), self.output_format)
+    
+    def analyze(self, file_path: str, language: str, content: str) -> AnalysisResult:
+        """Return structured findings, reusing cached results for unchanged content."""
+        findings = cached_analysis(
+            self._cache_key(file_path, language), content,
+            lambda: self._compute(file_path, language, content)
+        )
+        return AnalysisResult('static', file_path, [Finding(**f) for f in findings])
+    
+    def _compute(self, file_path: str, language: str, content: str):
+        findings, complete = self._analyze(file_path, language, content)
+        findings = [f.to_dict() for f in findings]
+        # Without pylint's findings the result is only good until pylint works again
+        return findings if complete else Uncached(findings)
+    
+    def needs_analysis(self, file_path: str, language: str, content: str) -> bool:
+        """Whether analyze() would have to run the analysis rather than hit the cache."""
+        return not is_cached(self._cache_key(file_path, language), content)
+    
+    def _cache_key(self, file_path: str, language: str) -> tuple:
+        # pylint reads the file from disk, so the path is part of the key, and
+        # installing pylint changes the findings
+        pylint_available = get_linter_service().pylint_available
+        return (self.name, self.tool_version, self.ruleset_version, language, file_path, pylint_available)
+    
+    def _analyze(self, file_path: str, language: str, content: str) -> Tuple[List[Finding], bool]:
+        """Findings for the file, and whether every linter that should run did."""
         issues = []
+        complete = True
         
         if language == 'python':
-            issues.extend(self._analyze_python(file_path, content))
+            python_issues, complete = self._analyze_python(file_path, content)
+            issues.extend(python_issues)
         elif language == 'javascript':
             issues.extend(self._analyze_javascript(file_path, content))
         # Add more languages as needed
@@ -125,123 +224,144 @@ class StaticAnalysisTool(BaseTool):
         # Generic analysis for all languages
         issues.extend(self._generic_analysis(file_path, content))
         
-        return self._format_static_analysis_report(file_path, issues)
+        return issues, complete
     
-    def _analyze_python(self, file_path: str, content: str) -> List[Dict]:
-        """Analyze Python code."""
+    def _analyze_python(self, file_path: str, content: str) -> Tuple[List[Finding], bool]:
+        """Analyze Python code; the flag is False when pylint failed."""
         issues = []
         
         try:
             # AST-based analysis
-            tree = ast.parse(content)
+            tree = parse_python(content)
             
             for node in ast.walk(tree):
                 # Check for bare except clauses
                 if isinstance(node, ast.ExceptHandler) and node.type is None:
-                    issues.append({
-                        'line': node.lineno,
-                        'type': 'Code Quality',
-                        'severity': 'Medium',
-                        'message': 'Bare except clause catches all exceptions',
-                        'suggestion': 'Catch specific exception types instead of using bare except'
-                    })
+                    issues.append(Finding(
+                        line=node.lineno,
+                        type='Code Quality',
+                        severity='Medium',
+                        message='Bare except clause catches all exceptions',
+                        suggestion='Catch specific exception types instead of using bare except'
+                    ))
                 
                 # Check for eval/exec usage
                 if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
                     if node.func.id in ['eval', 'exec']:
-                        issues.append({
-                            'line': node.lineno,
-                            'type': 'Security',
-                            'severity': 'High',
-                            'message': f'Use of {node.func.id}() is dangerous',
-                            'suggestion': 'Avoid eval/exec or use safer alternatives'
-                        })
+                        issues.append(Finding(
+                            line=node.lineno,
+                            type='Security',
+                            severity='High',
+                            message=f'Use of {node.func.id}() is dangerous',
+                            suggestion='Avoid eval/exec or use safer alternatives'
+                        ))
         
         except SyntaxError as e:
-            issues.append({
-                'line': e.lineno or 0,
-                'type': 'Syntax Error',
-                'severity': 'Critical',
-                'message': f'Syntax error: {e.msg}',
-                'suggestion': 'Fix the syntax error'
-            })
-        
-        # Try to run pylint if available
+            issues.append(Finding(
+                line=e.lineno or 0,
+                type='Syntax Error',
+                severity='Critical',
+                message=f'Syntax error: {e.msg}',
+                suggestion='Fix the syntax error'
+            ))
+        
+        # Lint in-process through the shared service (batches prefetched by
+        # the analysis engine are already there); fall back to the pylint CLI
+        # when pylint can't be imported in this interpreter
+        service = get_linter_service()
+        pylint_results = service.lint([file_path])
+        if pylint_results is not None:
+            pylint_issues = pylint_results.get(file_path, [])
+        elif service.pylint_available:
+            return issues, False  # pylint crashed
+        else:
+            try:
+                pylint_issues = self._run_pylint_cli(file_path)
+            except (subprocess.TimeoutExpired, json.JSONDecodeError):
+                return issues, False
+        
+        for issue in pylint_issues:
+            issues.append(Finding(
+                line=issue.get('line', 0),
+                type=issue.get('type', 'Unknown'),
+                severity=self._map_pylint_severity(issue.get('type', '')),
+                message=issue.get('message', ''),
+                suggestion=f"Pylint {issue.get('symbol', '')}: {issue.get('message', '')}"
+            ))
+        
+        return issues, True
+    
+    def _run_pylint_cli(self, file_path: str) -> List[Dict]:
+        """Run pylint as a subprocess, if it is installed.
+
+        Raises subprocess.TimeoutExpired or json.JSONDecodeError when pylint
+        is installed but fails.
+        """
         try:
             result = subprocess.run(
                 ['pylint', '--output-format=json', file_path],
                 capture_output=True, text=True, timeout=30
             )
-            if result.stdout:
-                pylint_issues = json.loads(result.stdout)
-                for issue in pylint_issues:
-                    issues.append({
-                        'line': issue.get('line', 0),
-                        'type': issue.get('type', 'Unknown'),
-                        'severity': self._map_pylint_severity(issue.get('type', '')),
-                        'message': issue.get('message', ''),
-                        'suggestion': f"Pylint {issue.get('symbol', '')}: {issue.get('message', '')}"
-                    })
-        except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError):
-            pass  # Pylint not available or failed
-        
-        return issues
+        except FileNotFoundError:
+            return []  # Pylint not available
+        # The JSON reporter always prints a list, so no output means pylint died
+        return json.loads(result.stdout)
     
-    def _analyze_javascript(self, file_path: str, content: str) -> List[Dict]:
+    def _analyze_javascript(self, file_path: str, content: str) -> List[Finding]:
         """Analyze JavaScript code."""
         issues = []
+        index = get_line_index(content)
         
         # Basic pattern matching for common issues
-        lines = content.split('\n')
-        for i, line in enumerate(lines, 1):
-            # Check for console.log (should be removed in production)
-            if 'console.log' in line:
-                issues.append({
-                    'line': i,
-                    'type': 'Code Quality',
-                    'severity': 'Low',
-                    'message': 'console.log statement found',
-                    'suggestion': 'Remove console.log statements in production code'
-                })
-            
-            # Check for == instead of ===
-            if re.search(r'[^=!]==[^=]', line):
-                issues.append({
-                    'line': i,
-                    'type': 'Code Quality',
-                    'severity': 'Medium',
-                    'message': 'Use of == instead of ===',
-                    'suggestion': 'Use strict equality (===) instead of loose equality (==)'
-                })
-        
+        # Check for console.log (should be removed in production)
+        for i in index.matching_lines(JS_CONSOLE_LOG):
+            issues.append(Finding(
+                line=i,
+                type='Code Quality',
+                severity='Low',
+                message='console.log statement found',
+                suggestion='Remove console.log statements in production code'
+            ))
+        
+        # Check for == instead of ===
+        for i in index.matching_lines(JS_LOOSE_EQUALITY):
+            issues.append(Finding(
+                line=i,
+                type='Code Quality',
+                severity='Medium',
+                message='Use of == instead of ===',
+                suggestion='Use strict equality (===) instead of loose equality (==)'
+            ))
+        
+        issues.sort(key=lambda issue: issue.line)
         return issues
     
-    def _generic_analysis(self, file_path: str, content: str) -> List[Dict]:
+    def _generic_analysis(self, file_path: str, content: str) -> List[Finding]:
         """Generic analysis applicable to all languages."""
         issues = []
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # Check line length
-            if len(line) > 120:
-                issues.append({
-                    'line': i,
-                    'type': 'Style',
-                    'severity': 'Low',
-                    'message': f'Line too long ({len(line)} characters)',
-                    'suggestion': 'Break long lines for better readability'
-                })
-            
-            # Check for TODO/FIXME comments
-            if re.search(r'(TODO|FIXME|HACK)', line, re.IGNORECASE):
-                issues.append({
-                    'line': i,
-                    'type': 'Code Quality',
-                    'severity': 'Low',
-                    'message': 'Unresolved TODO/FIXME comment',
-                    'suggestion': 'Address the TODO/FIXME or remove if no longer needed'
-                })
-        
+        index = get_line_index(content)
+        
+        # Check line length
+        for match in LONG_LINE.finditer(content):
+            issues.append(Finding(
+                line=index.line_of(match.start()),
+                type='Style',
+                severity='Low',
+                message=f'Line too long ({len(match.group())} characters)',
+                suggestion='Break long lines for better readability'
+            ))
+        
+        # Check for TODO/FIXME comments
+        for i in index.matching_lines(TODO_COMMENT):
+            issues.append(Finding(
+                line=i,
+                type='Code Quality',
+                severity='Low',
+                message='Unresolved TODO/FIXME comment',
+                suggestion='Address the TODO/FIXME or remove if no longer needed'
+            ))
+        
+        issues.sort(key=lambda issue: issue.line)
         return issues
     
     def _map_pylint_severity(self, pylint_type: str) -> str:
@@ -255,87 +375,104 @@ class StaticAnalysisTool(BaseTool):
         }
         return mapping.get(pylint_type.lower(), 'Medium')
     
-    def _format_static_analysis_report(self, file_path: str, issues: List[Dict]) -> str:
-        """Format the static analysis report."""
-        if not issues:
-            return f"## Static Analysis: {file_path}\n\nNo issues found! ✅"
-        
-        report = f"## Static Analysis: {file_path}\n\n"
-        report += f"**Total issues found:** {len(issues)}\n\n"
-        
-        # Group by severity
-        by_severity = {}
-        for issue in issues:
-            severity = issue['severity']
-            if severity not in by_severity:
-                by_severity[severity] = []
-            by_severity[severity].append(issue)
-        
-        for severity in ['Critical', 'High', 'Medium', 'Low']:
-            if severity in by_severity:
-                report += f"### {severity} Issues ({len(by_severity[severity])})\n\n"
-                for issue in by_severity[severity]:
-                    report += f"**Line {issue['line']}** - {issue['type']}\n"
-                    report += f"- **Issue:** {issue['message']}\n"
-                    report += f"- **Suggestion:** {issue['suggestion']}\n\n"
-        
-        return report
-
 class SecurityAnalyzerInput(BaseModel):
     """Input for security analyzer tool."""
     file_path: str = Field(..., description="Path to the file to analyze")
     language: str = Field(..., description="Programming language")
     content: str = Field(..., description="File content")
 
+# Common security patterns across languages
+SECURITY_PATTERNS = {
+    'Hardcoded Secrets': [
+        r'password\s*=\s*["\'][^"\']{8,}["\']',
+        r'api_key\s*=\s*["\'][^"\']{20,}["\']',
+        r'secret\s*=\s*["\'][^"\']{10,}["\']',
+        r'token\s*=\s*["\'][^"\']{20,}["\']'
+    ],
+    'SQL Injection': [
+        r'execute\s*\(\s*["\'].*%.*["\']',
+        r'query\s*\(\s*["\'].*\+.*["\']',
+        r'SELECT.*\+.*FROM',
+        r'INSERT.*\+.*VALUES'
+    ],
+    'Command Injection': [
+        r'os\.system\s*\(',
+        r'subprocess\.(call|run|Popen).*shell\s*=\s*True',
+        r'exec\s*\(',
+        r'eval\s*\('
+    ],
+    'Path Traversal': [
+        r'open\s*\(\s*.*\.\./.*\)',
+        r'file\s*\(\s*.*\.\./.*\)',
+        r'include\s*\(\s*.*\.\./.*\)'
+    ]
+}
+
+# Bumped automatically whenever a pattern changes, invalidating cached scans
+SECURITY_RULESET_VERSION = hashlib.sha256(
+    json.dumps(SECURITY_PATTERNS, sort_keys=True).encode('utf-8')
+).hexdigest()[:12]
+
+# Compiled once per process: the individual rules, in report order, and a
+# single alternation of all of them used to find candidate lines in one pass
+SECURITY_RULES = [
+    (vuln_type, re.compile(pattern, re.IGNORECASE))
+    for vuln_type, patterns in SECURITY_PATTERNS.items()
+    for pattern in patterns
+]
+SECURITY_PREFILTER = re.compile(
+    '|'.join(f'(?:{pattern})' for patterns in SECURITY_PATTERNS.values() for pattern in patterns),
+    re.IGNORECASE
+)
+
 class SecurityAnalyzerTool(BaseTool):
     name: str = "Security Analyzer Tool"
     description: str = "Analyzes code for security vulnerabilities and unsafe patterns"
     args_schema: type[BaseModel] = SecurityAnalyzerInput
+    tool_version: str = "2.0"
+    ruleset_version: str = SECURITY_RULESET_VERSION
+    output_format: str = Field(default="markdown", description="'markdown' or 'json'")
 
     def _run(self, file_path: str, language: str, content: str) -> str:
         """Perform security analysis."""
+        return render_result(self.analyze(file_path, language, content), self.output_format)
+    
+    def analyze(self, file_path: str, language: str, content: str) -> AnalysisResult:
+        """Return structured findings, reusing cached results for unchanged content."""
+        key = (self.name, self.tool_version, self.ruleset_version, language)
+        findings = cached_analysis(
+            key, content, lambda: [f.to_dict() for f in self._analyze(language, content)]
+        )
+        return AnalysisResult('security', file_path, [Finding(**f) for f in findings])
+    
+    def _analyze(self, language: str, content: str) -> List[Finding]:
         vulnerabilities = []
         
-        # Common security patterns across languages
-        security_patterns = {
-            'Hardcoded Secrets': [
-                r'password\s*=\s*["\'][^"\']{8,}["\']',
-                r'api_key\s*=\s*["\'][^"\']{20,}["\']',
-                r'secret\s*=\s*["\'][^"\']{10,}["\']',
-                r'token\s*=\s*["\'][^"\']{20,}["\']'
-            ],
-            'SQL Injection': [
-                r'execute\s*\(\s*["\'].*%.*["\']',
-                r'query\s*\(\s*["\'].*\+.*["\']',
-                r'SELECT.*\+.*FROM',
-                r'INSERT.*\+.*VALUES'
-            ],
-            'Command Injection': [
-                r'os\.system\s*\(',
-                r'subprocess\.(call|run|Popen).*shell\s*=\s*True',
-                r'exec\s*\(',
-                r'eval\s*\('
-            ],
-            'Path Traversal': [
-                r'open\s*\(\s*.*\.\./.*\)',
-                r'file\s*\(\s*.*\.\./.*\)',
-                r'include\s*\(\s*.*\.\./.*\)'
-            ]
-        }
-        
-        lines = content.split('\n')
-        for i, line in enumerate(lines, 1):
-            for vuln_type, patterns in security_patterns.items():
-                for pattern in patterns:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        vulnerabilities.append({
-                            'line': i,
-                            'type': vuln_type,
-                            'severity': self._get_vulnerability_severity(vuln_type),
-                            'code': line.strip(),
-                            'description': self._get_vulnerability_description(vuln_type),
-                            'recommendation': self._get_security_recommendation(vuln_type)
-                        })
+        # Scan the whole buffer with the combined pattern; only lines where
+        # something matched are checked rule by rule. Resuming at the next
+        # line (not the match end) keeps results identical to a per-line scan
+        # even when a match spans a newline.
+        index = get_line_index(content)
+        pos = 0
+        while True:
+            match = SECURITY_PREFILTER.search(content, pos)
+            if match is None:
+                break
+            lineno = index.line_of(match.start())
+            line_start, line_end = index.span(lineno)
+            
+            line = content[line_start:line_end]
+            for vuln_type, rule in SECURITY_RULES:
+                if rule.search(line):
+                    vulnerabilities.append(Finding(
+                        line=lineno,
+                        type=vuln_type,
+                        severity=self._get_vulnerability_severity(vuln_type),
+                        code=line.strip(),
+                        message=self._get_vulnerability_description(vuln_type),
+                        suggestion=self._get_security_recommendation(vuln_type)
+                    ))
+            pos = line_end + 1
         
         # Language-specific security checks
         if language == 'python':
@@ -343,39 +480,39 @@ class SecurityAnalyzerTool(BaseTool):
         elif language == 'javascript':
             vulnerabilities.extend(self._javascript_security_checks(content))
         
-        return self._format_security_report(file_path, vulnerabilities)
+        return vulnerabilities
     
-    def _python_security_checks(self, content: str) -> List[Dict]:
+    def _python_security_checks(self, content: str) -> List[Finding]:
         """Python-specific security checks."""
         issues = []
         
         # Check for pickle usage (can be dangerous)
         if 'pickle.load' in content or 'pickle.loads' in content:
-            issues.append({
-                'line': 0,
-                'type': 'Deserialization',
-                'severity': 'High',
-                'code': 'pickle.load/loads usage detected',
-                'description': 'Pickle deserialization can execute arbitrary code',
-                'recommendation': 'Use safer serialization formats like JSON'
-            })
+            issues.append(Finding(
+                line=0,
+                type='Deserialization',
+                severity='High',
+                code='pickle.load/loads usage detected',
+                message='Pickle deserialization can execute arbitrary code',
+                suggestion='Use safer serialization formats like JSON'
+            ))
         
         return issues
     
-    def _javascript_security_checks(self, content: str) -> List[Dict]:
+    def _javascript_security_checks(self, content: str) -> List[Finding]:
         """JavaScript-specific security checks."""
         issues = []
         
         # Check for innerHTML usage (XSS risk)
         if 'innerHTML' in content:
-            issues.append({
-                'line': 0,
-                'type': 'XSS',
-                'severity': 'Medium',
-                'code': 'innerHTML usage detected',
-                'description': 'innerHTML can lead to XSS vulnerabilities',
-                'recommendation': 'Use textContent or properly sanitize input'
-            })
+            issues.append(Finding(
+                line=0,
+                type='XSS',
+                severity='Medium',
+                code='innerHTML usage detected',
+                message='innerHTML can lead to XSS vulnerabilities',
+                suggestion='Use textContent or properly sanitize input'
+            ))
         
         return issues
     
@@ -415,49 +552,140 @@ class SecurityAnalyzerTool(BaseTool):
         }
         return recommendations.get(vuln_type, 'Review code for security implications')
     
-    def _format_security_report(self, file_path: str, vulnerabilities: List[Dict]) -> str:
-        """Format security analysis report."""
-        if not vulnerabilities:
-            return f"## Security Analysis: {file_path}\n\nNo security issues detected! ✅"
-        
-        report = f"## Security Analysis: {file_path}\n\n"
-        report += f"**Total vulnerabilities found:** {len(vulnerabilities)}\n\n"
-        
-        # Group by severity
-        by_severity = {}
-        for vuln in vulnerabilities:
-            severity = vuln['severity']
-            if severity not in by_severity:
-                by_severity[severity] = []
-            by_severity[severity].append(vuln)
-        
-        for severity in ['Critical', 'High', 'Medium', 'Low']:
-            if severity in by_severity:
-                report += f"### {severity} Vulnerabilities ({len(by_severity[severity])})\n\n"
-                for vuln in by_severity[severity]:
-                    report += f"**{vuln['type']}** (Line {vuln['line']})\n"
-                    report += f"- **Description:** {vuln['description']}\n"
-                    report += f"- **Code:** `{vuln['code']}`\n"
-                    report += f"- **Recommendation:** {vuln['recommendation']}\n\n"
-        
-        return report
-
 class PerformanceAnalyzerInput(BaseModel):
     """Input for performance analyzer tool."""
     file_path: str = Field(..., description="Path to the file to analyze")
     language: str = Field(..., description="Programming language")
     content: str = Field(..., description="File content")
 
+# Line-level rules; none of them may match across a newline
+AUGMENTED_ADD = re.compile(r'\+=')
+FOR_KEYWORD = re.compile(r'for ')
+JS_GET_ELEMENT_BY_ID = re.compile(r'document\.getElementById')
+LOOP_KEYWORD = re.compile(r'\bfor\b|\bwhile\b')
+
+def _is_string_expr(node: ast.AST) -> bool:
+    """Whether an expression evidently builds a string."""
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, str)
+    if isinstance(node, ast.JoinedStr):
+        return True
+    if isinstance(node, ast.Call):
+        func = node.func
+        if isinstance(func, ast.Name):
+            return func.id in ('str', 'repr', 'format', 'chr')
+        if isinstance(func, ast.Attribute):
+            return func.attr in ('format', 'join', 'strip', 'lower', 'upper', 'replace')
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mod)):
+        return _is_string_expr(node.left) or _is_string_expr(node.right)
+    return False
+
+def _is_append_call(stmt: ast.stmt) -> bool:
+    return (
+        isinstance(stmt, ast.Expr)
+        and isinstance(stmt.value, ast.Call)
+        and isinstance(stmt.value.func, ast.Attribute)
+        and stmt.value.func.attr == 'append'
+    )
+
+PYTHON_FINDINGS = {
+    'string_concat': {
+        'type': 'String Concatenation',
+        'severity': 'Medium',
+        'message': 'Inefficient string concatenation in loop',
+        'suggestion': 'Use join() or f-strings for better performance'
+    },
+    'append_loop': {
+        'type': 'List Operations',
+        'severity': 'Low',
+        'message': 'Could use list comprehension',
+        'suggestion': 'Consider using list comprehension for better performance'
+    },
+    'nested_loop': {
+        'type': 'Algorithmic Complexity',
+        'severity': 'High',
+        'message': 'Deeply nested loops detected',
+        'suggestion': 'Consider optimizing algorithm to reduce complexity'
+    }
+}
+PYTHON_FINDING_ORDER = {kind: i for i, kind in enumerate(PYTHON_FINDINGS)}
+
+class PythonPerformanceVisitor(ast.NodeVisitor):
+    """Collect loop-related performance findings from a parsed module.
+
+    Findings are (line, kind) pairs where kind is one of 'string_concat',
+    'append_loop' or 'nested_loop'.
+    """
+
+    def __init__(self):
+        self.loop_depth = 0
+        self.findings = []
+
+    def _visit_loop(self, node):
+        self.loop_depth += 1
+        if self.loop_depth > 2:
+            self.findings.append((node.lineno, 'nested_loop'))
+        if isinstance(node, (ast.For, ast.AsyncFor)) and not node.orelse and self._is_append_loop(node.body):
+            self.findings.append((node.lineno, 'append_loop'))
+        self.generic_visit(node)
+        self.loop_depth -= 1
+
+    visit_For = visit_AsyncFor = visit_While = _visit_loop
+
+    def _is_append_loop(self, body: List[ast.stmt]) -> bool:
+        """A loop whose only statement is an (optionally filtered) append."""
+        if len(body) != 1:
+            return False
+        stmt = body[0]
+        if isinstance(stmt, ast.If) and not stmt.orelse and len(stmt.body) == 1:
+            stmt = stmt.body[0]
+        return _is_append_call(stmt)
+
+    def visit_AugAssign(self, node):
+        if self.loop_depth and isinstance(node.op, ast.Add) and _is_string_expr(node.value):
+            self.findings.append((node.lineno, 'string_concat'))
+        self.generic_visit(node)
+
+    def _visit_scope(self, node):
+        # Loops in an enclosing function don't make a nested def's loops nested
+        depth, self.loop_depth = self.loop_depth, 0
+        self.generic_visit(node)
+        self.loop_depth = depth
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_Lambda = visit_ClassDef = _visit_scope
+
 class PerformanceAnalyzerTool(BaseTool):
     name: str = "Performance Analyzer Tool"
     description: str = "Analyzes code for performance issues and optimization opportunities"
     args_schema: type[BaseModel] = PerformanceAnalyzerInput
+    tool_version: str = "2.0"
+    ruleset_version: str = "2"
+    output_format: str = Field(default="markdown", description="'markdown' or 'json'")
 
     def _run(self, file_path: str, language: str, content: str) -> str:
         """Perform performance analysis."""
+        return render_result(self.analyze(file_path, language, content), self.output_format)
+    
+    def analyze(self, file_path: str, language: str, content: str) -> AnalysisResult:
+        """Return structured findings, reusing cached results for unchanged content."""
+        key = (self.name, self.tool_version, self.ruleset_version, language)
+        findings = cached_analysis(
+            key, content, lambda: [f.to_dict() for f in self._analyze(language, content)]
+        )
+        return AnalysisResult('performance', file_path, [Finding(**f) for f in findings])
+    
+    def _analyze(self, language: str, content: str) -> List[Finding]:
         performance_issues = []
         
         if language == 'python':
+            try:
+                tree = parse_python(content)
+            except (SyntaxError, ValueError):
+                tree = None
+            if tree is not None:
+                # The AST visitor also measures real loop nesting, so the
+                # generic line heuristics aren't needed for parsable Python
+                return self._analyze_python_tree(tree, content)
             performance_issues.extend(self._analyze_python_performance(content))
         elif language == 'javascript':
             performance_issues.extend(self._analyze_javascript_performance(content))
@@ -465,174 +693,194 @@ class PerformanceAnalyzerTool(BaseTool):
         # Generic performance analysis
         performance_issues.extend(self._generic_performance_analysis(content))
         
-        return self._format_performance_report(file_path, performance_issues)
+        return performance_issues
     
-    def _analyze_python_performance(self, content: str) -> List[Dict]:
-        """Analyze Python code for performance issues."""
-        issues = []
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # Check for inefficient string concatenation
-            if '+=' in line and 'str' in line.lower():
-                issues.append({
-                    'line': i,
-                    'type': 'String Concatenation',
-                    'severity': 'Medium',
-                    'issue': 'Inefficient string concatenation in loop',
-                    'suggestion': 'Use join() or f-strings for better performance',
-                    'code': line.strip()
-                })
-            
-            # Check for list comprehension opportunities
-            if 'for ' in line and 'append(' in line:
-                issues.append({
-                    'line': i,
-                    'type': 'List Operations',
-                    'severity': 'Low',
-                    'issue': 'Could use list comprehension',
-                    'suggestion': 'Consider using list comprehension for better performance',
-                    'code': line.strip()
-                })
+    def _analyze_python_tree(self, tree: ast.Module, content: str) -> List[Finding]:
+        """Analyze a parsed Python module for performance issues."""
+        visitor = PythonPerformanceVisitor()
+        visitor.visit(tree)
+        index = get_line_index(content)
         
+        issues = []
+        for line, kind in sorted(visitor.findings, key=lambda f: (f[0], PYTHON_FINDING_ORDER[f[1]])):
+            issues.append(Finding(
+                line=line,
+                code=index.line(line).strip() if line <= len(index) else '',
+                **PYTHON_FINDINGS[kind]
+            ))
+        return issues
+    
+    def _analyze_python_performance(self, content: str) -> List[Finding]:
+        """Line-based fallback for Python code that doesn't parse."""
+        issues = []
+        index = get_line_index(content)
+        
+        # Check for inefficient string concatenation
+        for i in index.matching_lines(AUGMENTED_ADD):
+            line = index.line(i)
+            if 'str' in line.lower():
+                issues.append(Finding(
+                    line=i,
+                    type='String Concatenation',
+                    severity='Medium',
+                    message='Inefficient string concatenation in loop',
+                    suggestion='Use join() or f-strings for better performance',
+                    code=line.strip()
+                ))
+        
+        # Check for list comprehension opportunities
+        for i in index.matching_lines(FOR_KEYWORD):
+            line = index.line(i)
+            if 'append(' in line:
+                issues.append(Finding(
+                    line=i,
+                    type='List Operations',
+                    severity='Low',
+                    message='Could use list comprehension',
+                    suggestion='Consider using list comprehension for better performance',
+                    code=line.strip()
+                ))
+        
+        issues.sort(key=lambda issue: issue.line)
         return issues
     
-    def _analyze_javascript_performance(self, content: str) -> List[Dict]:
+    def _analyze_javascript_performance(self, content: str) -> List[Finding]:
         """Analyze JavaScript code for performance issues."""
         issues = []
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # Check for inefficient DOM queries
-            if 'document.getElementById' in line and 'for' in line:
-                issues.append({
-                    'line': i,
-                    'type': 'DOM Operations',
-                    'severity': 'Medium',
-                    'issue': 'DOM query inside loop',
-                    'suggestion': 'Cache DOM elements outside loops',
-                    'code': line.strip()
-                })
+        index = get_line_index(content)
+        
+        # Check for inefficient DOM queries
+        for i in index.matching_lines(JS_GET_ELEMENT_BY_ID):
+            line = index.line(i)
+            if 'for' in line:
+                issues.append(Finding(
+                    line=i,
+                    type='DOM Operations',
+                    severity='Medium',
+                    message='DOM query inside loop',
+                    suggestion='Cache DOM elements outside loops',
+                    code=line.strip()
+                ))
         
         return issues
     
-    def _generic_performance_analysis(self, content: str) -> List[Dict]:
+    def _generic_performance_analysis(self, content: str) -> List[Finding]:
         """Generic performance analysis."""
         issues = []
-        lines = content.split('\n')
+        index = get_line_index(content)
         
-        # Check for nested loops (potential O(n²) complexity)
+        # Check for nested loops (potential O(n²) complexity): the nesting
+        # depth grows with each consecutive loop line and resets otherwise
         nested_loop_depth = 0
-        for i, line in enumerate(lines, 1):
-            if re.search(r'\bfor\b|\bwhile\b', line):
-                nested_loop_depth += 1
-                if nested_loop_depth > 2:
-                    issues.append({
-                        'line': i,
-                        'type': 'Algorithmic Complexity',
-                        'severity': 'High',
-                        'issue': 'Deeply nested loops detected',
-                        'suggestion': 'Consider optimizing algorithm to reduce complexity',
-                        'code': line.strip()
-                    })
-            elif line.strip() == '' or not line.strip().startswith(' '):
-                nested_loop_depth = 0
+        previous = 0
+        for i in index.matching_lines(LOOP_KEYWORD):
+            nested_loop_depth = nested_loop_depth + 1 if i == previous + 1 else 1
+            previous = i
+            if nested_loop_depth > 2:
+                issues.append(Finding(
+                    line=i,
+                    type='Algorithmic Complexity',
+                    severity='High',
+                    message='Deeply nested loops detected',
+                    suggestion='Consider optimizing algorithm to reduce complexity',
+                    code=index.line(i).strip()
+                ))
         
         return issues
     
-    def _format_performance_report(self, file_path: str, issues: List[Dict]) -> str:
-        """Format performance analysis report."""
-        if not issues:
-            return f"## Performance Analysis: {file_path}\n\nNo performance issues detected! ✅"
-        
-        report = f"## Performance Analysis: {file_path}\n\n"
-        report += f"**Total performance issues found:** {len(issues)}\n\n"
-        
-        # Group by type
-        by_type = {}
-        for issue in issues:
-            issue_type = issue['type']
-            if issue_type not in by_type:
-                by_type[issue_type] = []
-            by_type[issue_type].append(issue)
-        
-        for issue_type, type_issues in by_type.items():
-            report += f"### {issue_type} ({len(type_issues)} issues)\n\n"
-            for issue in type_issues:
-                report += f"**Line {issue['line']}** - {issue['severity']} Priority\n"
-                report += f"- **Issue:** {issue['issue']}\n"
-                report += f"- **Code:** `{issue['code']}`\n"
-                report += f"- **Suggestion:** {issue['suggestion']}\n\n"
-        
-        return report
-
 class ComplexityAnalyzerInput(BaseModel):
     """Input for complexity analyzer tool."""
     file_path: str = Field(..., description="Path to the file to analyze")
     content: str = Field(..., description="File content")
 
+DECISION_KEYWORDS = ['if', 'elif', 'else', 'for', 'while', 'try', 'except', 'case', 'switch']
+DECISION_KEYWORD_PATTERNS = [
+    (
+        re.compile(re.escape(f' {keyword} ')),
+        re.compile(rf'^[^\S\n]*{keyword}', re.MULTILINE)
+    )
+    for keyword in DECISION_KEYWORDS
+]
+
 class ComplexityAnalyzerTool(BaseTool):
     name: str = "Complexity Analyzer Tool"
     description: str = "Analyzes code complexity metrics"
     args_schema: type[BaseModel] = ComplexityAnalyzerInput
+    tool_version: str = "1.0"
+    ruleset_version: str = "1"
+    output_format: str = Field(default="markdown", description="'markdown' or 'json'")
 
     def _run(self, file_path: str, content: str) -> str:
         """Analyze code complexity."""
-        try:
-            # Try to use radon for Python files
-            if file_path.endswith('.py'):
-                result = subprocess.run(
-                    ['radon', 'cc', file_path, '-j'],
-                    capture_output=True, text=True, timeout=30
-                )
-                if result.stdout:
-                    complexity_data = json.loads(result.stdout)
-                    return self._format_complexity_report(file_path, complexity_data)
-        except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError):
-            pass
+        return render_result(self.analyze(file_path, content), self.output_format)
+    
+    def analyze(self, file_path: str, content: str) -> AnalysisResult:
+        """Return structured complexity metrics, reusing cached results for unchanged content."""
+        is_python = file_path.endswith('.py')
+        # Whether radon is importable decides between real and estimated metrics
+        radon_available = get_linter_service().radon_available
+        key = (self.name, self.tool_version, self.ruleset_version, is_python, radon_available)
+        metrics = cached_analysis(key, content, lambda: self._analyze(file_path, content))
+        return AnalysisResult('complexity', file_path, metrics=metrics)
+    
+    def _analyze(self, file_path: str, content: str) -> Dict:
+        # Try to use radon for Python files, in-process when it is importable
+        if file_path.endswith('.py'):
+            service = get_linter_service()
+            if service.radon_available:
+                try:
+                    functions = service.complexity(parse_python(content))
+                except (SyntaxError, ValueError):
+                    functions = None
+            else:
+                try:
+                    functions = self._run_radon_cli(file_path)
+                except (subprocess.TimeoutExpired, json.JSONDecodeError):
+                    # Estimate this time, but try radon again on the next run
+                    return Uncached({'source': 'estimate', 'score': self._estimate_complexity(content)})
+            if functions is not None:
+                return {'source': 'radon', 'functions': functions}
         
         # Fallback to basic complexity analysis
-        return self._basic_complexity_analysis(file_path, content)
+        return {'source': 'estimate', 'score': self._estimate_complexity(content)}
     
-    def _basic_complexity_analysis(self, file_path: str, content: str) -> str:
-        """Basic complexity analysis when tools aren't available."""
-        lines = content.split('\n')
+    def _run_radon_cli(self, file_path: str) -> Optional[List[Dict]]:
+        """Run radon as a subprocess, or return None if it isn't installed.
+
+        Raises subprocess.TimeoutExpired or json.JSONDecodeError when radon
+        is installed but fails.
+        """
+        try:
+            result = subprocess.run(
+                ['radon', 'cc', file_path, '-j'],
+                capture_output=True, text=True, timeout=30
+            )
+        except FileNotFoundError:
+            return None
+        complexity_data = json.loads(result.stdout)
+        functions = complexity_data.get(file_path) or []
+        return [
+            {
+                'name': func['name'],
+                'lineno': func['lineno'],
+                'complexity': func['complexity'],
+                'rank': func['rank']
+            }
+            for func in functions if isinstance(func, dict)
+        ]
+    
+    def _estimate_complexity(self, content: str) -> int:
+        """Basic complexity estimate when tools aren't available."""
+        index = get_line_index(content)
         
-        # Count decision points
-        decision_keywords = ['if', 'elif', 'else', 'for', 'while', 'try', 'except', 'case', 'switch']
+        # Count decision points: each line contributes once per keyword that
+        # appears surrounded by spaces or starts the (stripped) line
         complexity_score = 1  # Base complexity
         
-        for line in lines:
-            for keyword in decision_keywords:
-                if f' {keyword} ' in line or line.strip().startswith(keyword):
-                    complexity_score += 1
-        
-        report = f"## Complexity Analysis: {file_path}\n\n"
-        report += f"**Estimated Cyclomatic Complexity:** {complexity_score}\n\n"
-        
-        if complexity_score > 10:
-            report += "⚠️ **High Complexity Warning**\n"
-            report += "This file has high complexity. Consider refactoring into smaller functions.\n\n"
-        elif complexity_score > 5:
-            report += "⚡ **Moderate Complexity**\n"
-            report += "This file has moderate complexity. Monitor for further growth.\n\n"
-        else:
-            report += "✅ **Low Complexity**\n"
-            report += "This file has acceptable complexity.\n\n"
-        
-        return report
-    
-    def _format_complexity_report(self, file_path: str, complexity_data: Dict) -> str:
-        """Format complexity report from radon output."""
-        report = f"## Complexity Analysis: {file_path}\n\n"
-        
-        if file_path in complexity_data:
-            functions = complexity_data[file_path]
-            if functions:
-                report += "### Function Complexity\n\n"
-                for func in functions:
-                    report += f"**{func['name']}** (Line {func['lineno']})\n"
-                    report += f"- Complexity: {func['complexity']}\n"
-                    report += f"- Grade: {func['rank']}\n\n"
+        for inline, leading in DECISION_KEYWORD_PATTERNS:
+            lines = set(index.matching_lines(inline))
+            lines.update(index.matching_lines(leading))
+            complexity_score += len(lines)
         
-        return report
\ No newline at end of file
+        return complexity_score
+    
\ No newline at end of file
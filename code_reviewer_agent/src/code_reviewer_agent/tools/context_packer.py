@@ -0,0 +1,264 @@
+import math
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .file_reader import check_readable
+from .findings import SEVERITY_ORDER, Finding, complexity_findings
+from .line_index import LineIndex
+
+DEFAULT_TOKEN_BUDGET = 6000
+SEVERITY_WEIGHTS = {'Critical': 8, 'High': 4, 'Medium': 2, 'Low': 1}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def file_churn(path: str, max_commits: int = 200) -> Dict[str, int]:
+    """Count how many of the last max_commits commits touched each file.
+
+    Keys are resolved absolute paths. Returns an empty mapping when path is
+    not inside a git repository.
+    """
+    try:
+        import git
+        repo = git.Repo(path, search_parent_directories=True)
+        log = repo.git.log(
+            f'--max-count={max_commits}', '--name-only', '--format=', '--', str(Path(path).resolve())
+        )
+    except Exception:
+        return {}
+    root = Path(repo.working_tree_dir).resolve()
+    return Counter(str(root / name) for name in log.splitlines() if name)
+
+
+def _read_text(file_path: str) -> str:
+    check_readable(file_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@dataclass(slots=True)
+class FileContext:
+    """A file's findings and risk signals, as used for ranking."""
+    path: str
+    language: str
+    lines_of_code: int
+    findings: List[Finding] = field(default_factory=list)
+    churn: int = 0
+
+    @property
+    def risk(self) -> float:
+        """Severity-weighted finding count, scaled up for frequently changed files."""
+        severity = sum(SEVERITY_WEIGHTS.get(finding.severity, 1) for finding in self.findings)
+        return severity * (1 + math.log1p(self.churn))
+
+
+def file_contexts(
+    files_info: List[Dict],
+    results: Dict[str, Dict],
+    churn: Optional[Dict[str, int]] = None
+) -> List[FileContext]:
+    """Combine CodeParserTool file summaries with analyzer results."""
+    churn = churn or {}
+    contexts = []
+    for info in files_info:
+        if 'lines_of_code' not in info:
+            continue
+        result = results.get(info['path'], {})
+        findings = [
+            Finding(**finding)
+            for kind in ('static', 'security', 'performance')
+            for finding in result.get(kind, {}).get('findings', [])
+        ]
+        findings.extend(complexity_findings(result.get('complexity', {}).get('metrics', {})))
+        contexts.append(FileContext(
+            path=info['path'],
+            language=info['language'],
+            lines_of_code=info['lines_of_code'],
+            findings=findings,
+            churn=churn.get(os.path.realpath(info['path']), 0),
+        ))
+    return contexts
+
+
+class ContextPacker:
+    """Fit the most review-relevant code into a token budget.
+
+    Files are ranked by risk (severity-weighted findings, boosted by git
+    churn). For each file, in rank order, the packer emits the lines around
+    its findings rather than the head of the file, merging nearby windows.
+    Lines that recur in the snippets of several files (license headers,
+    import blocks and similar boilerplate) are collapsed, and a snippet
+    identical to one already emitted is replaced by a reference to it.
+    Files that don't fit get a one-line mention while budget remains.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        context_lines: int = 2,
+        max_snippets_per_file: int = 5,
+        boilerplate_min_files: int = 3,
+        root: str = '',
+        read: Callable[[str], str] = _read_text
+    ):
+        self.token_budget = token_budget
+        self.context_lines = context_lines
+        self.max_snippets_per_file = max_snippets_per_file
+        self.boilerplate_min_files = boilerplate_min_files
+        self.root = os.path.dirname(root) if root and os.path.isfile(root) else root
+        self.read = read
+
+    def rank(self, contexts: List[FileContext]) -> List[FileContext]:
+        return sorted(contexts, key=lambda ctx: (-ctx.risk, -ctx.churn, ctx.path))
+
+    def _display_path(self, path: str) -> str:
+        return os.path.relpath(path, self.root) if self.root else path
+
+    def _windows(self, ctx: FileContext, line_count: int) -> List[Tuple[int, int]]:
+        """Merged (first, last) line ranges around the file's findings."""
+        lines = sorted({finding.line for finding in ctx.findings if 1 <= finding.line <= line_count})
+        windows: List[Tuple[int, int]] = []
+        for line in lines:
+            first = max(1, line - self.context_lines)
+            last = min(line_count, line + self.context_lines)
+            if windows and first <= windows[-1][1] + 1:
+                windows[-1] = (windows[-1][0], max(windows[-1][1], last))
+            else:
+                windows.append((first, last))
+        return windows[:self.max_snippets_per_file]
+
+    def _snippets(self, ranked: List[FileContext]) -> Dict[str, List[List[Tuple[int, str]]]]:
+        snippets = {}
+        for ctx in ranked:
+            if not ctx.findings:
+                continue
+            try:
+                index = LineIndex(self.read(ctx.path))
+            except Exception:
+                continue  # Unreadable now; the file still gets its findings listed
+            snippets[ctx.path] = [
+                [(lineno, index.line(lineno)) for lineno in range(first, last + 1)]
+                for first, last in self._windows(ctx, len(index))
+            ]
+        return snippets
+
+    def _boilerplate(self, snippets: Dict[str, List[List[Tuple[int, str]]]]) -> set:
+        """Normalized lines that appear in the snippets of several files."""
+        files_per_line: Counter = Counter()
+        for windows in snippets.values():
+            files_per_line.update({
+                text.strip() for window in windows for _, text in window if len(text.strip()) > 3
+            })
+        return {text for text, count in files_per_line.items() if count >= self.boilerplate_min_files}
+
+    def _render_window(self, window: List[Tuple[int, str]], finding_lines: set, boilerplate: set) -> str:
+        out = []
+        collapsed = 0
+        for lineno, text in window:
+            if lineno not in finding_lines and text.strip() in boilerplate:
+                collapsed += 1
+                continue
+            if collapsed:
+                out.append(f"      ⋯ {collapsed} common line(s)")
+                collapsed = 0
+            marker = '>' if lineno in finding_lines else ' '
+            out.append(f"{marker}{lineno:>5} | {text}")
+        if collapsed:
+            out.append(f"      ⋯ {collapsed} common line(s)")
+        return '\n'.join(out)
+
+    def _render_findings(self, ctx: FileContext) -> str:
+        severity_rank = {severity: rank for rank, severity in enumerate(SEVERITY_ORDER)}
+        findings = sorted(ctx.findings, key=lambda f: (severity_rank.get(f.severity, len(SEVERITY_ORDER)), f.line))
+        # One line per distinct issue, listing every line it occurs on
+        grouped: Dict[Tuple[str, str, str], List[int]] = {}
+        for finding in findings:
+            grouped.setdefault((finding.severity, finding.type, finding.message), []).append(finding.line)
+        return '\n'.join(
+            f"- L{', L'.join(map(str, lines))} [{severity}] {issue_type}: {message}"
+            for (severity, issue_type, message), lines in grouped.items()
+        )
+
+    def pack(self, files_info: List[Dict], contexts: List[FileContext]) -> str:
+        """Render the packed context for the given file summaries."""
+        ranked = self.rank(contexts)
+        snippets = self._snippets(ranked)
+        boilerplate = self._boilerplate(snippets)
+
+        languages = Counter(ctx.language for ctx in contexts)
+        skipped = sum(1 for info in files_info if 'skipped' in info)
+        errors = sum(1 for info in files_info if 'error' in info)
+        header = [
+            "# Code Context\n",
+            f"**Total files found:** {len(files_info)} "
+            f"({', '.join(f'{lang} {count}' for lang, count in languages.most_common())})",
+        ]
+        if skipped or errors:
+            header.append(f"**Skipped (binary or over size cap):** {skipped} · **Unreadable:** {errors}")
+        header.append(f"**Files with findings:** {sum(1 for ctx in contexts if ctx.findings)}, most risky first\n")
+        parts = ['\n'.join(header)]
+        used = estimate_tokens(parts[0])
+
+        seen_snippets: Dict[str, str] = {}
+        mentioned: List[FileContext] = []
+        for ctx in ranked:
+            if not ctx.findings:
+                mentioned.append(ctx)
+                continue
+
+            title = (
+                f"## {self._display_path(ctx.path)} "
+                f"({ctx.language}, {ctx.lines_of_code} lines, {len(ctx.findings)} findings"
+                + (f", {ctx.churn} recent commits" if ctx.churn else '') + ")"
+            )
+            finding_lines = {finding.line for finding in ctx.findings}
+            blocks = []
+            new_snippets: Dict[str, str] = {}
+            for window in snippets.get(ctx.path, []):
+                body = self._render_window(window, finding_lines, boilerplate)
+                key = '\n'.join(text for _, text in window)
+                # A repeat within this file only shows up alongside its original
+                original = seen_snippets.get(key) or new_snippets.get(key)
+                if original:
+                    blocks.append(f"(lines {window[0][0]}-{window[-1][0]} same as {original})")
+                    continue
+                new_snippets[key] = f"{self._display_path(ctx.path)}:{window[0][0]}"
+                blocks.append(f"```{ctx.language}\n{body}\n```")
+
+            full = '\n'.join([title, self._render_findings(ctx), *blocks]) + '\n'
+            compact = '\n'.join([title, self._render_findings(ctx)]) + '\n'
+            for candidate in (full, compact):
+                cost = estimate_tokens(candidate)
+                if used + cost <= self.token_budget:
+                    parts.append(candidate)
+                    used += cost
+                    # Later files may only point at snippets that were printed
+                    if candidate is full:
+                        seen_snippets.update(new_snippets)
+                    break
+            else:
+                mentioned.append(ctx)
+
+        if mentioned:
+            listed = []
+            # Leave room for the section title and the "more files" line
+            used += estimate_tokens("## Other files\n- ... 0000 more files not shown (token budget)")
+            for ctx in mentioned:
+                entry = f"- {self._display_path(ctx.path)} ({ctx.language}, {ctx.lines_of_code} lines)"
+                cost = estimate_tokens(entry) + 1
+                if used + cost > self.token_budget:
+                    break
+                listed.append(entry)
+                used += cost
+            section = ["## Other files"] + listed
+            if len(listed) < len(mentioned):
+                section.append(f"- ... {len(mentioned) - len(listed)} more files not shown (token budget)")
+            parts.append('\n'.join(section))
+
+        return '\n'.join(parts)
@@ -0,0 +1,93 @@
+import codecs
+import os
+from typing import Dict
+
+DEFAULT_MAX_FILE_BYTES = 10 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Bytes inspected for NUL bytes when deciding whether a file is binary
+BINARY_SNIFF_BYTES = 8192
+
+
+class SkippedFile(Exception):
+    """Raised for files that are deliberately not read (binary or too large)."""
+
+
+def is_binary(sample: bytes) -> bool:
+    return b'\0' in sample[:BINARY_SNIFF_BYTES]
+
+
+def check_readable(file_path: str, max_bytes: int = DEFAULT_MAX_FILE_BYTES) -> int:
+    """Return the file size, raising SkippedFile for oversize or binary files."""
+    size = os.stat(file_path).st_size
+    if max_bytes and size > max_bytes:
+        raise SkippedFile(f"File exceeds size cap ({size} > {max_bytes} bytes)")
+    with open(file_path, 'rb') as f:
+        if is_binary(f.read(BINARY_SNIFF_BYTES)):
+            raise SkippedFile("Binary file")
+    return size
+
+
+def summarize_file(
+    file_path: str,
+    max_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    head_chars: int = 4000,
+    tail_chars: int = 1000,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict:
+    """Count a file's size and non-blank lines and sample its content.
+
+    The file is streamed in fixed-size chunks, so memory use does not grow
+    with file size. The content sample is the whole file when it is short,
+    otherwise a bounded head and tail. Raises SkippedFile for binaries and
+    files over max_bytes, and UnicodeDecodeError for non UTF-8 files.
+    """
+    size = check_readable(file_path, max_bytes)
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    lines_of_code = 0
+    # Whether the line still open at the end of the previous chunk has any
+    # non-whitespace; only this flag is carried, so a single huge line (a
+    # minified bundle) doesn't accumulate in memory
+    pending_nonblank = False
+    # Keep just enough leading text to tell whether the file fits the sample
+    keep = head_chars + tail_chars + 1
+    head = []
+    head_len = 0
+
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            final = not chunk
+
+            # Decoding validates the encoding and yields the head sample
+            text = decoder.decode(chunk, final=final)
+            if head_len < keep:
+                head.append(text[:keep - head_len])
+                head_len += len(head[-1])
+            if final:
+                break
+
+            parts = chunk.split(b'\n')
+            pending_nonblank = pending_nonblank or bool(parts[0].strip())
+            if len(parts) > 1:
+                lines_of_code += pending_nonblank
+                lines_of_code += sum(1 for line in parts[1:-1] if line.strip())
+                pending_nonblank = bool(parts[-1].strip())
+
+        lines_of_code += pending_nonblank
+
+        head_text = ''.join(head)
+        if len(head_text) < keep:
+            content = head_text
+        else:
+            # Re-read just the end of the file for the tail sample; up to 4
+            # bytes per character covers any UTF-8 text
+            f.seek(max(0, size - tail_chars * 4))
+            tail_text = f.read().decode('utf-8', errors='ignore')[-tail_chars:] if tail_chars else ''
+            content = head_text[:head_chars] + "\n...\n" + tail_text
+
+    return {
+        'size_bytes': size,
+        'lines_of_code': lines_of_code,
+        'content': content,
+    }
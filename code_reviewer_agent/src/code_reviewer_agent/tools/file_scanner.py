@@ -0,0 +1,216 @@
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Directories that never contain reviewable first-party code
+DEFAULT_IGNORE_DIRS = frozenset({
+    '.git', '.hg', '.svn', 'node_modules', 'venv', '.venv', 'env',
+    '__pycache__', '.tox', '.nox', '.mypy_cache', '.pytest_cache',
+    '.ruff_cache', '.idea', '.eggs', 'site-packages'
+})
+
+
+class IgnoreRule:
+    """A single compiled .gitignore pattern."""
+    __slots__ = ('regex', 'negate', 'dir_only', 'anchored')
+
+    def __init__(self, regex, negate: bool, dir_only: bool, anchored: bool):
+        self.regex = regex
+        self.negate = negate
+        self.dir_only = dir_only
+        self.anchored = anchored
+
+    def matches(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        return self.regex.match(rel_path if self.anchored else name) is not None
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob into a regex fragment."""
+    i, n = 0, len(pattern)
+    out = []
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern[i:i + 3] == '**/':
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern[i:i + 2] == '**':
+                out.append('.*')
+                i += 2
+                continue
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            j = pattern.find(']', i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append(f'[{body}]')
+                i = j
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+def parse_ignore_patterns(lines: Iterable[str]) -> List[IgnoreRule]:
+    """Compile gitignore-style lines into ignore rules."""
+    rules = []
+    for raw in lines:
+        line = raw.rstrip('\n').rstrip('\r')
+        # Trailing spaces are ignored unless escaped
+        while line.endswith(' ') and not line.endswith('\\ '):
+            line = line[:-1]
+        if not line or line.startswith('#'):
+            continue
+
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith('\\!') or line.startswith('\\#'):
+            line = line[1:]
+
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+
+        # A slash anywhere but the end anchors the pattern to its .gitignore
+        anchored = '/' in line
+        line = line.lstrip('/')
+
+        regex = re.compile(f'^{_translate_glob(line)}$')
+        rules.append(IgnoreRule(regex, negate, dir_only, anchored))
+    return rules
+
+
+def load_gitignore(directory: str) -> List[IgnoreRule]:
+    """Load the .gitignore rules of a directory, if present."""
+    try:
+        with open(os.path.join(directory, '.gitignore'), 'r', encoding='utf-8', errors='replace') as f:
+            return parse_ignore_patterns(f)
+    except OSError:
+        return []
+
+
+# A rule set is the rules of one .gitignore together with its directory,
+# relative to the scan root ('' for the root itself)
+RuleSet = Tuple[str, List[IgnoreRule]]
+
+
+def is_ignored(rule_sets: List[RuleSet], rel_path: str, name: str, is_dir: bool) -> bool:
+    """Apply rule sets outermost-first; the last matching rule wins."""
+    ignored = False
+    for base, rules in rule_sets:
+        local = rel_path[len(base) + 1:] if base else rel_path
+        for rule in rules:
+            if rule.negate == ignored and rule.matches(local, name, is_dir):
+                ignored = not rule.negate
+    return ignored
+
+
+class FileScanner:
+    """Walk a directory tree once, pruning ignored directories and
+    bucketing matching files by suffix."""
+
+    def __init__(
+        self,
+        extensions: Iterable[str],
+        ignore_patterns: Optional[Iterable[str]] = None,
+        ignore_dirs: Iterable[str] = DEFAULT_IGNORE_DIRS,
+        use_gitignore: bool = True,
+        follow_symlinks: bool = False
+    ):
+        self.extensions = frozenset(ext.lower() for ext in extensions)
+        self.ignore_rules = parse_ignore_patterns(ignore_patterns or [])
+        self.ignore_dirs = frozenset(ignore_dirs)
+        self.use_gitignore = use_gitignore
+        self.follow_symlinks = follow_symlinks
+
+    def scan(self, root) -> Dict[str, List[str]]:
+        """Return {suffix: [paths]} for every matching file under root."""
+        root = os.fspath(root)
+        buckets: Dict[str, List[str]] = {ext: [] for ext in self.extensions}
+        base_rules: List[RuleSet] = [('', self.ignore_rules)] if self.ignore_rules else []
+
+        stack = [(root, '', base_rules)]
+        while stack:
+            directory, rel_dir, rule_sets = stack.pop()
+            if self.use_gitignore:
+                local_rules = load_gitignore(directory)
+                if local_rules:
+                    rule_sets = rule_sets + [(rel_dir, local_rules)]
+
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue  # Unreadable directory, skip it like rglob would
+
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                    try:
+                        if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                            if name in self.ignore_dirs:
+                                continue
+                            if rule_sets and is_ignored(rule_sets, rel_path, name, True):
+                                continue
+                            stack.append((entry.path, rel_path, rule_sets))
+                            continue
+                        if not entry.is_file(follow_symlinks=self.follow_symlinks):
+                            continue
+                    except OSError:
+                        continue
+
+                    suffix = os.path.splitext(name)[1].lower()
+                    if suffix not in self.extensions:
+                        continue
+                    if rule_sets and is_ignored(rule_sets, rel_path, name, False):
+                        continue
+                    buckets[suffix].append(entry.path)
+
+        for paths in buckets.values():
+            paths.sort()
+        return buckets
+
+    def includes(self, root, path) -> bool:
+        """Whether scan(root) would return path, without walking the tree.
+
+        Checks only the directories between root and path, so single
+        files (e.g. the ones a git diff names) are filtered by the same
+        rules as a full scan.
+        """
+        root = os.fspath(root)
+        rel_path = os.path.relpath(os.fspath(path), root).replace(os.sep, '/')
+        if rel_path in ('.', '..') or rel_path.startswith('../'):
+            return False
+        if os.path.splitext(rel_path)[1].lower() not in self.extensions:
+            return False
+
+        rule_sets: List[RuleSet] = [('', self.ignore_rules)] if self.ignore_rules else []
+        parts = rel_path.split('/')
+        directory, rel_dir = root, ''
+        for index, name in enumerate(parts):
+            if self.use_gitignore:
+                local_rules = load_gitignore(directory)
+                if local_rules:
+                    rule_sets = rule_sets + [(rel_dir, local_rules)]
+            rel_dir = f"{rel_dir}/{name}" if rel_dir else name
+            is_dir = index < len(parts) - 1
+            if is_dir and name in self.ignore_dirs:
+                return False
+            if rule_sets and is_ignored(rule_sets, rel_dir, name, is_dir):
+                return False
+            directory = os.path.join(directory, name)
+        return True
@@ -0,0 +1,200 @@
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List
+
+SEVERITY_ORDER = ['Critical', 'High', 'Medium', 'Low']
+
+
+@dataclass(slots=True)
+class Finding:
+    """One issue reported by an analyzer."""
+    line: int
+    type: str
+    severity: str
+    message: str
+    suggestion: str = ''
+    code: str = ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """Structured output of one analyzer run over one file.
+
+    ``kind`` is the analyzer family ('static', 'security', 'performance' or
+    'complexity'). Complexity results carry their numbers in ``metrics``.
+    Markdown is only rendered on demand.
+    """
+    kind: str
+    file_path: str
+    findings: List[Finding] = field(default_factory=list)
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'kind': self.kind,
+            'file_path': self.file_path,
+            'findings': [finding.to_dict() for finding in self.findings],
+            'metrics': self.metrics,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AnalysisResult':
+        return cls(
+            kind=data['kind'],
+            file_path=data['file_path'],
+            findings=[Finding(**finding) for finding in data.get('findings', [])],
+            metrics=data.get('metrics', {}),
+        )
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def render_markdown(self) -> str:
+        return RENDERERS[self.kind](self)
+
+
+def complexity_findings(metrics: Dict[str, Any], threshold: int = 10) -> List[Finding]:
+    """Turn complexity metrics into findings for functions (or files) above threshold."""
+    if metrics.get('source') == 'radon':
+        return [
+            Finding(
+                line=func['lineno'],
+                type='High Complexity',
+                severity='High' if func['rank'] in ('E', 'F') else 'Medium',
+                message=f"Cyclomatic complexity above {threshold}",
+                suggestion='Split into smaller functions',
+                code=func['name'],
+            )
+            for func in metrics.get('functions', [])
+            if func['complexity'] > threshold
+        ]
+    if metrics.get('score', 0) > threshold:
+        return [Finding(
+            line=1,
+            type='High Complexity',
+            severity='Medium',
+            message=f"Estimated file complexity above {threshold}",
+            suggestion='Consider refactoring into smaller functions',
+        )]
+    return []
+
+
+def _group_by(findings: List[Finding], attr: str) -> Dict[str, List[Finding]]:
+    groups: Dict[str, List[Finding]] = {}
+    for finding in findings:
+        groups.setdefault(getattr(finding, attr), []).append(finding)
+    return groups
+
+
+def render_static(result: AnalysisResult) -> str:
+    """Render static analysis findings grouped by severity."""
+    if not result.findings:
+        return f"## Static Analysis: {result.file_path}\n\nNo issues found! ✅"
+
+    parts = [
+        f"## Static Analysis: {result.file_path}\n\n",
+        f"**Total issues found:** {len(result.findings)}\n\n",
+    ]
+    by_severity = _group_by(result.findings, 'severity')
+    for severity in SEVERITY_ORDER:
+        if severity in by_severity:
+            parts.append(f"### {severity} Issues ({len(by_severity[severity])})\n\n")
+            for issue in by_severity[severity]:
+                parts.append(
+                    f"**Line {issue.line}** - {issue.type}\n"
+                    f"- **Issue:** {issue.message}\n"
+                    f"- **Suggestion:** {issue.suggestion}\n\n"
+                )
+    return ''.join(parts)
+
+
+def render_security(result: AnalysisResult) -> str:
+    """Render security findings grouped by severity."""
+    if not result.findings:
+        return f"## Security Analysis: {result.file_path}\n\nNo security issues detected! ✅"
+
+    parts = [
+        f"## Security Analysis: {result.file_path}\n\n",
+        f"**Total vulnerabilities found:** {len(result.findings)}\n\n",
+    ]
+    by_severity = _group_by(result.findings, 'severity')
+    for severity in SEVERITY_ORDER:
+        if severity in by_severity:
+            parts.append(f"### {severity} Vulnerabilities ({len(by_severity[severity])})\n\n")
+            for vuln in by_severity[severity]:
+                parts.append(
+                    f"**{vuln.type}** (Line {vuln.line})\n"
+                    f"- **Description:** {vuln.message}\n"
+                    f"- **Code:** `{vuln.code}`\n"
+                    f"- **Recommendation:** {vuln.suggestion}\n\n"
+                )
+    return ''.join(parts)
+
+
+def render_performance(result: AnalysisResult) -> str:
+    """Render performance findings grouped by issue type."""
+    if not result.findings:
+        return f"## Performance Analysis: {result.file_path}\n\nNo performance issues detected! ✅"
+
+    parts = [
+        f"## Performance Analysis: {result.file_path}\n\n",
+        f"**Total performance issues found:** {len(result.findings)}\n\n",
+    ]
+    for issue_type, type_issues in _group_by(result.findings, 'type').items():
+        parts.append(f"### {issue_type} ({len(type_issues)} issues)\n\n")
+        for issue in type_issues:
+            parts.append(
+                f"**Line {issue.line}** - {issue.severity} Priority\n"
+                f"- **Issue:** {issue.message}\n"
+                f"- **Code:** `{issue.code}`\n"
+                f"- **Suggestion:** {issue.suggestion}\n\n"
+            )
+    return ''.join(parts)
+
+
+def render_complexity(result: AnalysisResult) -> str:
+    """Render radon function complexity, or the estimated file score."""
+    parts = [f"## Complexity Analysis: {result.file_path}\n\n"]
+
+    if result.metrics.get('source') == 'radon':
+        functions = result.metrics.get('functions', [])
+        if functions:
+            parts.append("### Function Complexity\n\n")
+            for func in functions:
+                parts.append(
+                    f"**{func['name']}** (Line {func['lineno']})\n"
+                    f"- Complexity: {func['complexity']}\n"
+                    f"- Grade: {func['rank']}\n\n"
+                )
+        return ''.join(parts)
+
+    complexity_score = result.metrics['score']
+    parts.append(f"**Estimated Cyclomatic Complexity:** {complexity_score}\n\n")
+    if complexity_score > 10:
+        parts.append("⚠️ **High Complexity Warning**\n")
+        parts.append("This file has high complexity. Consider refactoring into smaller functions.\n\n")
+    elif complexity_score > 5:
+        parts.append("⚡ **Moderate Complexity**\n")
+        parts.append("This file has moderate complexity. Monitor for further growth.\n\n")
+    else:
+        parts.append("✅ **Low Complexity**\n")
+        parts.append("This file has acceptable complexity.\n\n")
+    return ''.join(parts)
+
+
+RENDERERS: Dict[str, Callable[[AnalysisResult], str]] = {
+    'static': render_static,
+    'security': render_security,
+    'performance': render_performance,
+    'complexity': render_complexity,
+}
+
+
+def render_result(result: AnalysisResult, output_format: str = 'markdown') -> str:
+    """Render a result as markdown (the default) or as a JSON document."""
+    if output_format == 'json':
+        return result.to_json(indent=2)
+    return result.render_markdown()
@@ -0,0 +1,64 @@
+import re
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Iterator, Pattern, Tuple
+
+_NEWLINE = re.compile('\n')
+
+
+class LineIndex:
+    """Line-start offsets of a text buffer, computed once.
+
+    Rules run over the whole buffer with finditer and map match offsets back
+    to 1-based line numbers by bisection, instead of every analyzer splitting
+    the content into its own list of lines. Lines are delimited by '\\n' only,
+    matching content.split('\\n').
+    """
+    __slots__ = ('content', 'starts')
+
+    def __init__(self, content: str):
+        self.content = content
+        self.starts = array('q', [0])
+        self.starts.extend(m.end() for m in _NEWLINE.finditer(content))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def line_of(self, offset: int) -> int:
+        """Return the 1-based line number containing offset."""
+        return bisect_right(self.starts, offset)
+
+    def span(self, lineno: int) -> Tuple[int, int]:
+        """Return the (start, end) offsets of a line, excluding its newline."""
+        start = self.starts[lineno - 1]
+        if lineno < len(self.starts):
+            return start, self.starts[lineno] - 1
+        return start, len(self.content)
+
+    def line(self, lineno: int) -> str:
+        start, end = self.span(lineno)
+        return self.content[start:end]
+
+    def matching_lines(self, pattern: Pattern) -> Iterator[int]:
+        """Yield each line number with at least one match, in order.
+
+        Patterns should not match across newlines, otherwise a match is
+        attributed to the line it starts on.
+        """
+        last = 0
+        for match in pattern.finditer(self.content):
+            lineno = self.line_of(match.start())
+            if lineno != last:
+                last = lineno
+                yield lineno
+
+
+@lru_cache(maxsize=8)
+def get_line_index(content: str) -> LineIndex:
+    """Return the shared LineIndex for content.
+
+    Every analyzer run on the same file gets the same index, so the offsets
+    are computed once per file rather than once per tool.
+    """
+    return LineIndex(content)
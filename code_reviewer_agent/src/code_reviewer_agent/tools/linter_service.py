@@ -0,0 +1,154 @@
+import ast
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Linted file states remembered; the least recently used are dropped
+MAX_PYLINT_RESULTS = 4096
+
+
+class LinterService:
+    """Long-lived, in-process pylint and radon runner.
+
+    Spawning ``pylint`` per file pays interpreter start-up and pylint's
+    import cost every time. This service imports both tools once, lints
+    files in batches through a single pylint run (so astroid's module cache
+    for stdlib and third-party imports is reused across files and batches)
+    and calls radon's API directly on the already-parsed AST.
+    """
+
+    def __init__(self, max_results: int = MAX_PYLINT_RESULTS):
+        self._lock = threading.Lock()
+        self.max_results = max_results
+        # (path, mtime_ns, size) -> pylint messages, least recently used first
+        self._pylint_results: 'OrderedDict[Tuple[str, int, int], List[Dict]]' = OrderedDict()
+        self._pylint = None
+        self._radon = None
+
+    def _load_pylint(self):
+        if self._pylint is None:
+            try:
+                from pylint.lint import Run
+                from pylint.reporters import CollectingReporter
+                import astroid
+                self._pylint = (Run, CollectingReporter, astroid.MANAGER)
+            except ImportError:
+                self._pylint = False
+        return self._pylint
+
+    def _load_radon(self):
+        if self._radon is None:
+            try:
+                from radon.complexity import cc_visit_ast, cc_rank, sorted_results
+                self._radon = (cc_visit_ast, cc_rank, sorted_results)
+            except ImportError:
+                self._radon = False
+        return self._radon
+
+    @property
+    def pylint_available(self) -> bool:
+        return bool(self._load_pylint())
+
+    @property
+    def radon_available(self) -> bool:
+        return bool(self._load_radon())
+
+    @staticmethod
+    def _file_key(file_path: str) -> Optional[Tuple[str, int, int]]:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+    def lint(self, file_paths: Iterable[str]) -> Optional[Dict[str, List[Dict]]]:
+        """Run pylint once over every file not linted yet in its current state.
+
+        Returns pylint messages keyed by the given paths, or None if pylint
+        cannot be imported in this interpreter.
+        """
+        loaded = self._load_pylint()
+        if not loaded:
+            return None
+        Run, CollectingReporter, manager = loaded
+
+        keys = {file_path: self._file_key(file_path) for file_path in file_paths}
+        with self._lock:
+            pending = {key[0]: key for key in keys.values() if key and key not in self._pylint_results}
+            if pending:
+                # Drop stale ASTs of the files being linted; everything they
+                # import stays cached for the next batch
+                for modname, module in list(manager.astroid_cache.items()):
+                    module_file = getattr(module, 'file', None)
+                    if module_file and os.path.abspath(module_file) in pending:
+                        del manager.astroid_cache[modname]
+
+                reporter = CollectingReporter()
+                try:
+                    Run(['--jobs=1', *pending.keys()], reporter=reporter, exit=False)
+                except Exception:
+                    return None  # Treat a crashing pylint like a missing one
+
+                messages: Dict[str, List[Dict]] = {path: [] for path in pending}
+                for msg in reporter.messages:
+                    path = os.path.abspath(msg.abspath)
+                    if path in messages:
+                        messages[path].append({
+                            'line': msg.line,
+                            'type': msg.category,
+                            'symbol': msg.symbol,
+                            'message': msg.msg,
+                        })
+                for path, key in pending.items():
+                    self._pylint_results[key] = messages[path]
+
+            results = {}
+            for file_path, key in keys.items():
+                if key:
+                    results[file_path] = self._pylint_results.get(key, [])
+                    if key in self._pylint_results:
+                        self._pylint_results.move_to_end(key)
+            # Trimmed after the lookups, so a batch larger than the bound still gets its results
+            while len(self._pylint_results) > self.max_results:
+                self._pylint_results.popitem(last=False)
+            return results
+
+    def complexity(self, tree: ast.Module) -> Optional[List[Dict]]:
+        """Return radon's cyclomatic complexity blocks for a parsed module.
+
+        Takes the shared AST rather than source so the file isn't parsed
+        again. Returns None if radon cannot be imported.
+        """
+        loaded = self._load_radon()
+        if not loaded:
+            return None
+        cc_visit_ast, cc_rank, sorted_results = loaded
+
+        blocks = sorted_results(cc_visit_ast(tree))
+        return [
+            {
+                'name': block.name,
+                'lineno': block.lineno,
+                'complexity': block.complexity,
+                'rank': cc_rank(block.complexity)
+            }
+            for block in blocks
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pylint_results.clear()
+
+
+_service: Optional[LinterService] = None
+_service_lock = threading.Lock()
+
+
+def get_linter_service() -> LinterService:
+    """Return the process-wide linter service."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = LinterService()
+        return _service
@@ -0,0 +1,81 @@
+import pytest
+
+from code_reviewer_agent.tools import analysis_cache
+from code_reviewer_agent.tools.analysis_cache import MISS, AnalysisCache, Uncached, cached_analysis, is_cached
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('CODE_REVIEWER_CACHE', '1')
+    monkeypatch.setenv('CODE_REVIEWER_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(analysis_cache, '_cache', None)
+    yield tmp_path
+    if analysis_cache._cache is not None:
+        analysis_cache._cache.close()
+    monkeypatch.setattr(analysis_cache, '_cache', None)
+
+
+def test_hit_and_miss_follow_key_and_content(tmp_path):
+    cache = AnalysisCache(tmp_path / 'a.sqlite')
+    key = cache.make_key('tool', '1', content='x = 1')
+    assert cache.get(key) is MISS
+
+    cache.put(key, [{'line': 1}])
+    assert cache.get(key) == [{'line': 1}]
+    assert cache.get(cache.make_key('tool', '2', content='x = 1')) is MISS
+    assert cache.get(cache.make_key('tool', '1', content='x = 2')) is MISS
+
+
+def test_falsy_values_are_hits(tmp_path):
+    cache = AnalysisCache(tmp_path / 'a.sqlite')
+    cache.put('k', [])
+    assert cache.get('k') == []
+
+
+def test_ttl_expires_entries(tmp_path, monkeypatch):
+    cache = AnalysisCache(tmp_path / 'a.sqlite', ttl=60)
+    cache.put('k', 'v')
+    assert cache.contains('k')
+
+    now = analysis_cache.time.time()
+    monkeypatch.setattr(analysis_cache.time, 'time', lambda: now + 61)
+    assert cache.get('k') is MISS
+    assert not cache.contains('k')
+
+
+def test_size_limit_evicts_least_recently_used(tmp_path):
+    cache = AnalysisCache(tmp_path / 'a.sqlite', max_bytes=100)
+    cache.put('old', 'x' * 40)
+    cache.put('new', 'y' * 40)
+    cache.get('old')  # Now the most recently used
+    cache.put('newest', 'z' * 40)
+    cache.evict()
+
+    assert cache.get('new') is MISS
+    assert cache.get('old') == 'x' * 40
+
+
+def test_cached_analysis_computes_once(cache_dir):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'findings': []}
+
+    assert cached_analysis(('tool',), 'src', compute) == {'findings': []}
+    assert cached_analysis(('tool',), 'src', compute) == {'findings': []}
+    assert len(calls) == 1
+    assert is_cached(('tool',), 'src')
+
+
+def test_uncached_results_are_not_stored(cache_dir):
+    assert cached_analysis(('tool',), 'src', lambda: Uncached(['degraded'])) == ['degraded']
+    assert not is_cached(('tool',), 'src')
+    assert cached_analysis(('tool',), 'src', lambda: ['complete']) == ['complete']
+    assert is_cached(('tool',), 'src')
+
+
+def test_disabled_cache_always_computes(cache_dir, monkeypatch):
+    monkeypatch.setenv('CODE_REVIEWER_CACHE', '0')
+    assert cached_analysis(('tool',), 'src', lambda: Uncached(1)) == 1
+    assert not is_cached(('tool',), 'src')
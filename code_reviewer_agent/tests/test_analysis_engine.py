@@ -0,0 +1,67 @@
+import signal
+import time
+
+import pytest
+
+pytest.importorskip('crewai')
+
+from code_reviewer_agent.tools import analysis_engine
+from code_reviewer_agent.tools.analysis_engine import AnalysisTimeout, BatchAnalysisEngine
+
+
+analyzed = []
+
+
+def fake_analyze(file_path, content=None):
+    name = file_path.rsplit('/', 1)[-1]
+    analyzed.append(name)
+    if name == 'slow.py':
+        time.sleep(5)
+    return {'language': 'python', 'name': name}
+
+
+def failing_chunk(file_paths, file_timeout):
+    if any(path.endswith('bad.py') for path in file_paths):
+        raise AnalysisTimeout()
+    return [{'language': 'python', 'name': path.rsplit('/', 1)[-1]} for path in file_paths]
+
+
+@pytest.fixture(autouse=True)
+def no_linting(monkeypatch):
+    analyzed.clear()
+    monkeypatch.setattr(analysis_engine, '_prefetch_pylint', lambda file_paths: None)
+    monkeypatch.setattr(analysis_engine, 'analyze_file', fake_analyze)
+
+
+def test_each_file_keeps_its_own_result_after_a_timeout(monkeypatch):
+    setitimer, late = signal.setitimer, []
+
+    def alarm_while_disarming(which, seconds, *args):
+        setitimer(which, seconds, *args)
+        if seconds == 0 and analyzed[-1:] == ['late.py'] and not late:
+            # The alarm fires just as late.py's timer is disarmed
+            late.append(True)
+            raise AnalysisTimeout()
+
+    monkeypatch.setattr(signal, 'setitimer', alarm_while_disarming)
+    paths = ['/src/a.py', '/src/late.py', '/src/slow.py', '/src/z.py']
+
+    findings = BatchAnalysisEngine(max_workers=1, file_timeout=0.2).analyze(paths)
+
+    assert findings['/src/a.py']['name'] == 'a.py'
+    assert findings['/src/late.py']['error'] == 'Analysis timed out after 0.2s'
+    assert findings['/src/slow.py']['error'] == 'Analysis timed out after 0.2s'
+    assert findings['/src/z.py']['name'] == 'z.py'
+
+
+def test_a_failed_chunk_only_fails_its_own_files(monkeypatch):
+    monkeypatch.setattr(analysis_engine, '_analyze_chunk', failing_chunk)
+    paths = [f'/src/{name}.py' for name in ('a', 'b', 'bad', 'c', 'd', 'e', 'f', 'g')]
+
+    findings = BatchAnalysisEngine(max_workers=2, chunk_size=2).analyze(paths)
+
+    assert findings['/src/bad.py']['error'] == 'Analysis failed: AnalysisTimeout'
+    assert 'error' in findings['/src/c.py']  # Same chunk as bad.py
+    assert [findings[path]['name'] for path in paths if not path.endswith(('/bad.py', '/c.py'))] == [
+        'a.py', 'b.py', 'd.py', 'e.py', 'f.py', 'g.py'
+    ]
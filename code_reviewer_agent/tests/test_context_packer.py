@@ -0,0 +1,49 @@
+from code_reviewer_agent.tools.context_packer import ContextPacker, FileContext
+from code_reviewer_agent.tools.findings import Finding
+
+SNIPPET = '\n'.join(f'line_{n} = compute({n})' for n in range(1, 8))
+
+
+def context(path, severity, lines=(4,)):
+    findings = [Finding(line=line, type='Security', severity=severity, message='Use of eval') for line in lines]
+    return FileContext(path=path, language='python', lines_of_code=7, findings=findings)
+
+
+def pack(contexts, budget):
+    packer = ContextPacker(token_budget=budget, root='/repo', read=lambda path: SNIPPET)
+    files_info = [{'path': ctx.path, 'language': ctx.language, 'lines_of_code': 7} for ctx in contexts]
+    return packer.pack(files_info, contexts)
+
+
+def test_repeated_snippet_points_at_the_first_copy():
+    packed = pack([context('/repo/a.py', 'Critical'), context('/repo/b.py', 'High')], budget=2000)
+
+    assert packed.count('```python') == 1
+    assert '(lines 2-6 same as a.py:2)' in packed
+
+
+def test_snippets_of_compacted_files_are_not_referenced():
+    # a.py outranks b.py and shares its first snippet, but has more code
+    source = '\n'.join(f'value_{n} = transform({n}, "{"x" * 150}")' for n in range(1, 31))
+    a = context('/repo/a.py', 'Critical', lines=(4, 14, 24))
+    b = context('/repo/b.py', 'High')
+    packer = ContextPacker(token_budget=2000, root='/repo', read=lambda path: source)
+    files_info = [{'path': ctx.path, 'language': 'python', 'lines_of_code': 30} for ctx in (a, b)]
+    assert '(lines 2-6 same as a.py:2)' in packer.pack(files_info, [a, b])
+
+    # Room for b.py's code but not a.py's: a.py is listed without code, so
+    # b.py has to print the snippet itself
+    packer.token_budget = 600
+    packed = packer.pack(files_info, [a, b])
+    a_section, b_section = packed.split('\n## ')[1:3]
+    assert a_section.startswith('a.py') and '```' not in a_section
+    assert b_section.startswith('b.py') and '```python' in b_section
+    assert 'same as' not in packed
+
+
+def test_files_that_do_not_fit_are_listed():
+    contexts = [context(f'/repo/m{n}.py', 'Low') for n in range(30)]
+    packed = pack(contexts, budget=400)
+
+    assert '## Other files' in packed
+    assert 'more files not shown' in packed
@@ -0,0 +1,64 @@
+from code_reviewer_agent.tools.file_scanner import FileScanner
+
+
+def write(path, text=''):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def scanned(root, **kwargs):
+    buckets = FileScanner(['.py', '.js'], **kwargs).scan(root)
+    return sorted(str(p.relative_to(root)) for paths in buckets.values() for p in map(type(root), paths))
+
+
+def test_gitignore_patterns_negation_and_nested_files(tmp_path):
+    write(tmp_path / '.gitignore', 'build/\n*.gen.py\n!keep.gen.py\n/top.py\n')
+    write(tmp_path / 'app.py')
+    write(tmp_path / 'top.py')
+    write(tmp_path / 'pkg' / 'top.py')
+    write(tmp_path / 'build' / 'out.py')
+    write(tmp_path / 'models.gen.py')
+    write(tmp_path / 'keep.gen.py')
+    write(tmp_path / 'web' / '.gitignore', 'vendor.js\n')
+    write(tmp_path / 'web' / 'vendor.js')
+    write(tmp_path / 'web' / 'main.js')
+    write(tmp_path / 'vendor.js')
+
+    assert scanned(tmp_path) == [
+        'app.py', 'keep.gen.py', 'pkg/top.py', 'vendor.js', 'web/main.js',
+    ]
+
+
+def test_default_ignore_dirs_and_extra_patterns(tmp_path):
+    write(tmp_path / 'node_modules' / 'lib.js')
+    write(tmp_path / '.venv' / 'site.py')
+    write(tmp_path / 'tests' / 'test_app.py')
+    write(tmp_path / 'app.py')
+
+    assert scanned(tmp_path) == ['app.py', 'tests/test_app.py']
+    assert scanned(tmp_path, ignore_patterns=['tests/']) == ['app.py']
+
+
+def test_gitignore_can_be_disabled(tmp_path):
+    write(tmp_path / '.gitignore', '*.py\n')
+    write(tmp_path / 'app.py')
+
+    assert scanned(tmp_path) == []
+    assert scanned(tmp_path, use_gitignore=False) == ['app.py']
+
+
+def test_includes_agrees_with_scan(tmp_path):
+    write(tmp_path / '.gitignore', 'build/\n*.gen.py\n!keep.gen.py\n')
+    write(tmp_path / 'web' / '.gitignore', 'vendor.js\n')
+    paths = [
+        'app.py', 'keep.gen.py', 'models.gen.py', 'build/out.py', 'web/vendor.js', 'web/main.js',
+        'env/lib/site.py', 'pkg/site-packages/mod.py', 'README.md',
+    ]
+    for path in paths:
+        write(tmp_path / path)
+    scanner = FileScanner(['.py', '.js'])
+
+    included = sorted(path for path in paths if scanner.includes(tmp_path, tmp_path / path))
+
+    assert included == scanned(tmp_path) == ['app.py', 'keep.gen.py', 'web/main.js']
+    assert not scanner.includes(tmp_path / 'web', tmp_path / 'app.py')
@@ -0,0 +1,78 @@
+import os
+import subprocess
+
+import pytest
+
+pytest.importorskip('crewai')
+
+from code_reviewer_agent import incremental
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('CODE_REVIEWER_CACHE', '0')
+    (tmp_path / 'proj').mkdir()
+    (tmp_path / 'proj' / 'a.py').write_text('x = 1\n')
+    (tmp_path / 'proj' / 'b.py').write_text('y = eval("2")\n')
+    return tmp_path / 'proj'
+
+
+def test_relative_target_uses_absolute_keys(project):
+    scope = incremental.refresh_findings('proj', full=True)
+
+    assert scope['target'] == str(project.resolve())
+    assert sorted(scope['findings']) == [str(project.resolve() / 'a.py'), str(project.resolve() / 'b.py')]
+    assert scope['changed'] is None
+
+
+def test_incremental_merge_replaces_full_mode_entries(project, monkeypatch):
+    incremental.record_review(incremental.refresh_findings('proj', full=True))
+    changed = str(project.resolve() / 'a.py')
+    monkeypatch.setattr(incremental, 'resolve_commit', lambda *args: 'abc')
+    monkeypatch.setattr(incremental, 'changed_files', lambda *args: ([changed], []))
+    (project / 'a.py').write_text('x = eval("1")\n')
+
+    scope = incremental.refresh_findings('./proj', base_ref='HEAD~1')
+
+    assert scope['changed'] == [changed]
+    assert len(scope['findings']) == 2
+    assert scope['findings'][changed]['security']['findings']
+
+
+def test_diff_without_stored_findings_reviews_everything(project, monkeypatch):
+    monkeypatch.setattr(incremental, 'changed_files', lambda *args: ([str(project.resolve() / 'a.py')], []))
+
+    scope = incremental.refresh_findings('proj', base_ref='HEAD~1')
+
+    assert scope['changed'] is None
+    assert len(scope['findings']) == 2
+
+
+def test_changed_files_skips_what_a_full_scan_ignores(project):
+    pytest.importorskip('git')
+    run = lambda *args: subprocess.run(['git', *args], cwd=project, check=True, capture_output=True)
+    run('init', '-q')
+    run('-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '--allow-empty', '-m', 'base')
+    (project / '.gitignore').write_text('generated/\n')
+    for path in ('c.py', 'env/lib/d.py', 'generated/e.py', 'pkg/site-packages/f.py'):
+        (project / path).parent.mkdir(parents=True, exist_ok=True)
+        (project / path).write_text('z = 3\n')
+
+    changed, deleted = incremental.changed_files(str(project), 'HEAD')
+
+    assert [os.path.basename(path) for path in changed] == ['a.py', 'b.py', 'c.py']
+    assert deleted == []
+
+
+def test_findings_are_only_stored_with_a_recorded_review(project, tmp_path):
+    other = tmp_path / 'other'
+    other.mkdir()
+    (other / 'c.py').write_text('z = 3\n')
+    incremental.record_review(incremental.refresh_findings('proj', full=True))
+
+    # A review of another target that fails before record_review
+    incremental.refresh_findings(str(other), full=True)
+
+    assert incremental.load_state()['target'] == str(project.resolve())
+    assert sorted(map(os.path.basename, incremental.load_findings())) == ['a.py', 'b.py']
@@ -0,0 +1,39 @@
+import threading
+
+import pytest
+
+# Builds the real crew; only the kickoff is stubbed, so no LLM is called
+pytest.importorskip('crewai.project')
+
+from crewai import Crew
+
+from code_reviewer_agent import main
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('CODE_REVIEWER_CACHE', '0')
+    monkeypatch.setenv('CODE_REVIEWER_TELEMETRY', '0')
+    monkeypatch.setenv('GEMINI_API_KEY', 'test')
+    (tmp_path / 'proj').mkdir()
+    (tmp_path / 'proj' / 'a.py').write_text('x = eval("1")\n')
+    return tmp_path / 'proj'
+
+
+def test_concurrent_review_runs_every_task_and_records_it(project, tmp_path, monkeypatch):
+    kickoffs = []
+    lock = threading.Lock()
+
+    def kickoff(crew, inputs=None):
+        with lock:
+            kickoffs.append((crew.tasks[0].agent.role, inputs))
+
+    monkeypatch.setattr(Crew, 'kickoff', kickoff)
+
+    main.review(str(project), full=True, concurrent=True)
+
+    assert len(kickoffs) == 3
+    assert len({role for role, _ in kickoffs}) == 3
+    assert all(inputs['path'] == str(project) and inputs['scope'] for _, inputs in kickoffs)
+    assert (tmp_path / 'output' / 'findings.json').exists()
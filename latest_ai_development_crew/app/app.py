@@ -1,8 +1,11 @@
 import streamlit as st
 import os
 import tempfile
-import traceback
-from runner import run_agent_wrapper
+import time
+from runner import submit_agent_job, get_agent_job, cancel_agent_job, QueueFull
+
+# How often the page re-checks a running job
+POLL_INTERVAL_SECONDS = 1.0
 
 
 os.environ["CREWAI_DISABLE_TELEMETRY"] = "true"
@@ -27,9 +30,10 @@ st.sidebar.title("⚙️ Settings")
 st.sidebar.markdown("---")
 
 # Model Selection
+DEFAULT_MODEL_LABEL = "Crew default (agents.yaml)"
 model_choice = st.sidebar.selectbox(
     "🧠 Choose AI Model", 
-    ["gpt-4", "gpt-3.5-turbo", "gpt-4-turbo"],
+    [DEFAULT_MODEL_LABEL, "gpt-4", "gpt-3.5-turbo", "gpt-4-turbo"],
     index=0,
     help="Select the AI model for your crew"
 )
@@ -69,11 +73,27 @@ st.sidebar.info(f"Model: {model_choice}\nTemperature: {temperature}\nMax Tokens:
 st.title("🚀 Latest AI Development Crew")
 st.markdown("Ask questions about AI development, trends, and technologies!")
 
+# Example Questions: (button label, question)
+EXAMPLE_QUESTIONS = [
+    ("🤖 Agentic AI Trends", "Latest trends in Agentic AI"),
+    ("🧠 LLM Developments", "Recent developments in Large Language Models"),
+    ("🔬 AI Research", "Cutting-edge AI research breakthroughs"),
+]
+
+
+def choose_example(question: str) -> None:
+    # Runs before the rerun, so the question box can still be filled in; the
+    # choice lives in the session and survives the page's polling reruns
+    st.session_state.question = question
+    st.session_state.submit_requested = True
+
+
 # Input Section
 col1, col2 = st.columns([3, 1])
 with col1:
     user_input = st.text_input(
         "💬 Ask something about AI:", 
+        key="question",
         placeholder="e.g., Latest trends in Agentic AI, Machine Learning advancements...",
         help="Enter your question about AI development"
     )
@@ -81,91 +101,169 @@ with col2:
     st.markdown("<br>", unsafe_allow_html=True)  # Add spacing
     run_button = st.button("🚀 Run Agent", type="primary", use_container_width=True)
 
-# Example Questions
 st.markdown("### 💡 Example Questions")
-example_cols = st.columns(3)
-with example_cols[0]:
-    if st.button("🤖 Agentic AI Trends", use_container_width=True):
-        user_input = "Latest trends in Agentic AI"
-with example_cols[1]:
-    if st.button("🧠 LLM Developments", use_container_width=True):
-        user_input = "Recent developments in Large Language Models"
-with example_cols[2]:
-    if st.button("🔬 AI Research", use_container_width=True):
-        user_input = "Cutting-edge AI research breakthroughs"
+example_cols = st.columns(len(EXAMPLE_QUESTIONS))
+for example_col, (label, question) in zip(example_cols, EXAMPLE_QUESTIONS):
+    with example_col:
+        st.button(label, use_container_width=True, on_click=choose_example, args=(question,))
 
-# Process Input
-if run_button or user_input:
+# Start a background job only when asked to (Run Agent or an example); the
+# job keeps running across reruns, so the page stays responsive while the
+# crew works and polling never resubmits
+if run_button or st.session_state.pop("submit_requested", False):
     if user_input.strip():
-        # Show settings being used
-        with st.expander("🔍 Current Settings", expanded=False):
-            st.json({
-                "model": model_choice,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-                "memory_enabled": enable_memory
-            })
-        
-        # Progress and execution
-        with st.spinner(f"🤖 Running AI crew with {model_choice}..."):
-            try:
-                # Pass settings to your crew (you'll need to modify runner.py to accept these)
-                result = run_agent_wrapper(user_input)
-                
-                if isinstance(result, dict) and "error" in result:
-                    st.warning(f"⚠️ {result['message']}")
-                    st.info("App running in fallback mode - knowledge features disabled but core functionality works.")
-                    
-                    # Show error details in expander
-                    with st.expander("🔍 Error Details"):
-                        st.code(result['error'])
-                else:
-                    st.success("✅ Agent completed successfully!")
-                    
-                    # Enhanced Output Display with Tabs
-                    tab1, tab2, tab3 = st.tabs(["📄 Formatted Result", "🔤 Raw Output", "📊 Analysis"])
-                    
-                    with tab1:
-                        st.markdown("### 🎯 AI Development Insights")
-                        if isinstance(result, str):
-                            # Format the result nicely
-                            st.markdown(result)
-                        else:
-                            st.write(result)
-                    
-                    with tab2:
-                        st.markdown("### 📝 Raw Output")
-                        st.code(str(result), language="text")
-                    
-                    with tab3:
-                        st.markdown("### 📊 Response Analysis")
-                        if isinstance(result, str):
-                            word_count = len(result.split())
-                            char_count = len(result)
-                            
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                st.metric("Word Count", word_count)
-                            with col2:
-                                st.metric("Character Count", char_count)
-                            with col3:
-                                st.metric("Model Used", model_choice)
-                        
-                        # Add download button
-                        st.download_button(
-                            label="📥 Download Result",
-                            data=str(result),
-                            file_name=f"ai_crew_result_{user_input[:20]}.txt",
-                            mime="text/plain"
-                        )
-                        
-            except Exception as e:
-                st.error("❌ An error occurred!")
-                with st.expander("🔍 Full Error Details"):
-                    st.code(traceback.format_exc())
+        previous_job_id = st.session_state.get("job_id")
+        try:
+            st.session_state.job_id = submit_agent_job(
+                user_input,
+                model=None if model_choice == DEFAULT_MODEL_LABEL else model_choice,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                memory=enable_memory,
+            )
+            # The session follows one job at a time: let go of the one it
+            # replaces (or of the extra subscription, if the same job was joined again)
+            if previous_job_id is not None:
+                cancel_agent_job(previous_job_id)
+        except QueueFull:
+            st.warning("⏳ The crew is busy with other requests right now. Please try again in a moment.")
     else:
         st.warning("⚠️ Please enter a question about AI.")
 
+job = get_agent_job(st.session_state["job_id"]) if "job_id" in st.session_state else None
+
+# Process Input
+if job is not None:
+    user_input = job.topic
+
+    # Show the settings this job actually runs with
+    job_model = job.settings.get("model") or DEFAULT_MODEL_LABEL
+    with st.expander("🔍 Current Settings", expanded=False):
+        st.json({
+            "model": job_model,
+            "temperature": job.settings.get("temperature"),
+            "max_tokens": job.settings.get("max_tokens"),
+            "memory_enabled": job.settings.get("memory", False)
+        })
+
+    if job.active:
+        elapsed = int(time.time() - (job.started or job.created))
+        if job.status == "queued":
+            st.info(f"⏳ Waiting for a free worker... (job `{job.id}`, {elapsed}s)")
+        elif job.cancel_requested:
+            st.info(f"🛑 Cancelling job `{job.id}`...")
+        else:
+            st.info(f"🤖 Running AI crew with {job_model}... (job `{job.id}`, {elapsed}s)")
+        if not job.cancel_requested and st.button("🛑 Cancel", key=f"cancel_{job.id}"):
+            cancel_agent_job(job.id)
+
+        # Live progress: task boundaries, tool use and finished tasks
+        live_text = []
+        with st.expander("📡 Live Progress", expanded=False):
+            for event in list(job.events):
+                if event["kind"] == "task_started":
+                    st.markdown(f"▶️ **{event['agent']}** started")
+                    live_text = []
+                elif event["kind"] == "token":
+                    live_text.append(event["text"])
+                elif event["kind"] == "task":
+                    st.markdown(f"✅ **Task finished** ({event['agent']})")
+                elif event["kind"] == "report_reused":
+                    st.markdown(f"📚 Reusing the recent report on *{event['topic']}*")
+                elif event["kind"] == "step":
+                    if event.get("tool"):
+                        st.markdown(f"🔧 Using tool `{event['tool']}`")
+                    elif event.get("thought"):
+                        st.markdown(f"💭 {event['thought'][:300]}")
+
+        # What the current agent is writing right now, as it streams in
+        if live_text:
+            st.markdown("### ✍️ Live Output")
+            st.markdown("".join(live_text) + " ▌")
+        if job.partial_output:
+            with st.expander("📝 Previous Task Output", expanded=False):
+                st.markdown(job.partial_output)
+
+        time.sleep(POLL_INTERVAL_SECONDS)
+        st.rerun()
+
+    if job.status == "cancelled":
+        st.warning(f"🛑 Job `{job.id}` was cancelled.")
+    else:
+        try:
+            if job.status == "failed" and not isinstance(job.result, dict):
+                raise RuntimeError(job.error)
+            result = job.result
+        
+            if isinstance(result, dict) and "error" in result:
+                st.warning(f"⚠️ {result['message']}")
+                st.info("App running in fallback mode - knowledge features disabled but core functionality works.")
+            
+                # Show error details in expander
+                with st.expander("🔍 Error Details"):
+                    st.code(result['error'])
+            else:
+                st.success(f"✅ Agent completed successfully in {job.finished - job.started:.1f}s!")
+            
+                # Enhanced Output Display with Tabs
+                tab1, tab2, tab3 = st.tabs(["📄 Formatted Result", "🔤 Raw Output", "📊 Analysis"])
+            
+                with tab1:
+                    st.markdown("### 🎯 AI Development Insights")
+                    if isinstance(result, str):
+                        # Format the result nicely
+                        st.markdown(result)
+                    else:
+                        st.write(result)
+            
+                with tab2:
+                    st.markdown("### 📝 Raw Output")
+                    st.code(str(result), language="text")
+            
+                with tab3:
+                    st.markdown("### 📊 Response Analysis")
+                    if isinstance(result, str):
+                        word_count = len(result.split())
+                        char_count = len(result)
+                    
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            st.metric("Word Count", word_count)
+                        with col2:
+                            st.metric("Character Count", char_count)
+                        with col3:
+                            st.metric("Model Used", job_model)
+
+                    # Timing, token and cost breakdown recorded by the crew's tracer
+                    telemetry = [event for event in job.events if event["kind"] == "telemetry"]
+                    if telemetry:
+                        rows = telemetry[-1]["spans"]
+                        run = rows[0]
+                        st.markdown("#### ⏱️ Performance")
+                        col1, col2, col3, col4 = st.columns(4)
+                        with col1:
+                            st.metric("Crew Time", f"{run['seconds']:.1f}s")
+                        with col2:
+                            st.metric("Total Tokens", run["total_tokens"])
+                        with col3:
+                            st.metric("LLM Calls", run["llm_calls"], help=f"{run['cache_hits']} served from cache")
+                        with col4:
+                            st.metric("Est. Cost", f"${run['cost_usd']:.4f}" if run["cost_usd"] else "n/a")
+                        st.dataframe(rows[1:], use_container_width=True)
+                
+                    # Add download button
+                    st.download_button(
+                        label="📥 Download Result",
+                        data=str(result),
+                        file_name=f"ai_crew_result_{user_input[:20]}.txt",
+                        mime="text/plain"
+                    )
+                
+        except Exception as e:
+            st.error("❌ An error occurred!")
+            with st.expander("🔍 Full Error Details"):
+                st.code(str(e))
+
 # Footer
 st.markdown("---")
 st.markdown(
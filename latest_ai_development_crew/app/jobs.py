@@ -0,0 +1,477 @@
+# app/jobs.py
+"""Job queue for crew runs.
+
+SQLite is the broker: the Streamlit server submits jobs and polls their
+status, progress events and results, while a bounded pool of worker
+processes claims queued jobs and runs the crew. Everything is persisted,
+so results survive a server restart and workers can be scaled (or run
+separately with ``python jobs.py worker``) without touching the app.
+"""
+import json
+import multiprocessing
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_DB_PATH = Path.home() / '.cache' / 'latest_ai_development_crew' / 'jobs.sqlite'
+DEFAULT_WORKERS = 2
+# Queued jobs accepted before submit() pushes back
+DEFAULT_MAX_QUEUED = 20
+# Seconds a running job gets to stop cooperatively before its worker is killed
+CANCEL_GRACE_SECONDS = 10.0
+POLL_INTERVAL_SECONDS = 0.5
+# How often streamed LLM output is written out for the UI
+TOKEN_FLUSH_SECONDS = 0.25
+# Running jobs refresh their lease this often; one that misses it for
+# HEARTBEAT_TIMEOUT_SECONDS has lost its worker
+HEARTBEAT_SECONDS = 5.0
+HEARTBEAT_TIMEOUT_SECONDS = 30.0
+# Longest a job may run before it is failed and its worker killed
+DEFAULT_MAX_RUNTIME_SECONDS = 1800.0
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class QueueFull(Exception):
+    """Raised by submit() when too many jobs are already waiting."""
+
+
+class JobCancelled(BaseException):
+    """Raised inside a worker to abort a crew whose job was cancelled.
+
+    A BaseException so that neither crewAI's retry logic nor run_agent's
+    error handling swallows it.
+    """
+
+
+@dataclass
+class Job:
+    """Snapshot of one crew run as stored by the queue."""
+    id: str
+    topic: str
+    status: str = 'queued'  # queued -> running -> done | failed | cancelled
+    settings: Dict[str, Any] = field(default_factory=dict)  # LLMConfig fields
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    partial_output: str = ''
+    result: Any = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    cancel_requested: Optional[float] = None
+    worker: Optional[int] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+
+class JobQueue:
+    """SQLite-backed job broker shared by the app and the workers."""
+
+    def __init__(self, path=None, max_queued: int = DEFAULT_MAX_QUEUED):
+        self.path = Path(path or os.getenv('CREW_JOBS_DB', DEFAULT_DB_PATH))
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            ' id TEXT PRIMARY KEY,'
+            ' topic TEXT NOT NULL,'
+            ' status TEXT NOT NULL,'
+            ' partial_output TEXT NOT NULL DEFAULT \'\','
+            ' result TEXT,'
+            ' error TEXT,'
+            ' created REAL NOT NULL,'
+            ' started REAL,'
+            ' finished REAL,'
+            ' cancel_requested REAL,'
+            ' worker INTEGER);'
+            'CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created);'
+            'CREATE TABLE IF NOT EXISTS events ('
+            ' job_id TEXT NOT NULL,'
+            ' seq INTEGER PRIMARY KEY AUTOINCREMENT,'
+            ' payload TEXT NOT NULL);'
+            'CREATE INDEX IF NOT EXISTS events_job ON events (job_id, seq);'
+        )
+        # Columns added after the first release of the schema
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(jobs)')}
+        for column, declaration in (
+            ('dedupe_key', 'TEXT'),
+            ('subscribers', 'INTEGER NOT NULL DEFAULT 1'),
+            ('settings', 'TEXT'),
+            ('heartbeat', 'REAL'),
+        ):
+            if column not in columns:
+                self._conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} {declaration}')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, status)')
+        # Jobs left running by a server restart or a killed worker
+        self.reap()
+
+    def _execute(self, sql: str, params=()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def submit(self, topic: str, dedupe_key: Optional[str] = None,
+               settings: Optional[Dict[str, Any]] = None) -> str:
+        """Queue a crew run and return its job ID, or raise QueueFull.
+
+        settings are the run's LLMConfig fields (model, temperature,
+        max_tokens, memory); a dedupe_key must cover them.
+
+        With a dedupe_key, a request identical to a job that is still
+        queued or running attaches to that job (single-flight) instead of
+        starting another crew; both callers then poll the same job ID.
+        """
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                if dedupe_key is not None:
+                    # Only attach to a running job whose worker is still alive
+                    row = self._conn.execute(
+                        "SELECT id FROM jobs WHERE dedupe_key = ? AND cancel_requested IS NULL"
+                        " AND (status = 'queued' OR (status = 'running' AND COALESCE(heartbeat, started) > ?))"
+                        " ORDER BY created LIMIT 1", (dedupe_key, time.time() - HEARTBEAT_TIMEOUT_SECONDS)
+                    ).fetchone()
+                    if row is not None:
+                        self._conn.execute('UPDATE jobs SET subscribers = subscribers + 1 WHERE id = ?', (row[0],))
+                        self._conn.execute('COMMIT')
+                        return row[0]
+                queued = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+                if queued >= self.max_queued:
+                    raise QueueFull(f"{queued} jobs are already waiting")
+                self._conn.execute(
+                    "INSERT INTO jobs (id, topic, status, created, dedupe_key, settings)"
+                    " VALUES (?, ?, 'queued', ?, ?, ?)",
+                    (job_id, topic, time.time(), dedupe_key, json.dumps(settings or {}))
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return job_id
+
+    def get(self, job_id: str, with_events: bool = True) -> Optional[Job]:
+        rows = self._execute(
+            'SELECT id, topic, status, partial_output, result, error, created, started, finished,'
+            ' cancel_requested, worker, settings FROM jobs WHERE id = ?', (job_id,)
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        job = Job(
+            id=row[0], topic=row[1], status=row[2], partial_output=row[3],
+            result=json.loads(row[4]) if row[4] is not None else None, error=row[5],
+            created=row[6], started=row[7], finished=row[8], cancel_requested=row[9], worker=row[10],
+            settings=json.loads(row[11]) if row[11] else {},
+        )
+        if with_events:
+            job.events = [
+                json.loads(payload)
+                for (payload,) in self._execute('SELECT payload FROM events WHERE job_id = ? ORDER BY seq', (job_id,))
+            ]
+        return job
+
+    def cancel(self, job_id: str) -> None:
+        """Cancel a queued job at once; ask a running one to stop.
+
+        A coalesced job is only cancelled once every caller attached to it
+        has cancelled; until then this just detaches one subscriber.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute(
+                    'UPDATE jobs SET subscribers = subscribers - 1 WHERE id = ? AND subscribers > 0', (job_id,)
+                )
+                row = self._conn.execute('SELECT subscribers FROM jobs WHERE id = ?', (job_id,)).fetchone()
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        if row is None or row[0] > 0:
+            return
+        self._execute(
+            "UPDATE jobs SET status = 'cancelled', finished = ? WHERE id = ? AND status = 'queued'", (now, job_id)
+        )
+        self._execute(
+            "UPDATE jobs SET cancel_requested = ? WHERE id = ? AND status = 'running' AND cancel_requested IS NULL",
+            (now, job_id)
+        )
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        rows = self._execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,))
+        return bool(rows and rows[0][0])
+
+    def claim(self, worker: int) -> Optional[Job]:
+        """Atomically take the oldest queued job for worker."""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    now = time.time()
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', started = ?, heartbeat = ?, worker = ? WHERE id = ?",
+                        (now, now, worker, row[0])
+                    )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return self.get(row[0], with_events=False) if row else None
+
+    def heartbeat(self, job_id: str) -> None:
+        """Renew a running job's lease."""
+        self._execute("UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = 'running'", (time.time(), job_id))
+
+    def add_event(self, job_id: str, kind: str, payload: Dict[str, Any]) -> None:
+        event = {'kind': kind, 'time': time.time(), **payload}
+        self._execute('INSERT INTO events (job_id, payload) VALUES (?, ?)', (job_id, json.dumps(event, default=str)))
+        if kind == 'task':
+            self._execute('UPDATE jobs SET partial_output = ? WHERE id = ?', (str(payload.get('output', '')), job_id))
+
+    def finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        self._execute(
+            'UPDATE jobs SET status = ?, result = ?, error = ?, finished = ? WHERE id = ? AND status = \'running\'',
+            (status, json.dumps(result, default=str) if result is not None else None, error, time.time(), job_id)
+        )
+
+    def overdue_cancellations(self, grace: float = CANCEL_GRACE_SECONDS) -> List[Job]:
+        """Running jobs that ignored a cancel request for longer than grace."""
+        rows = self._execute(
+            "SELECT id FROM jobs WHERE status = 'running' AND cancel_requested IS NOT NULL AND cancel_requested < ?",
+            (time.time() - grace,)
+        )
+        return [self.get(job_id, with_events=False) for (job_id,) in rows]
+
+    def reap(self, lease: float = HEARTBEAT_TIMEOUT_SECONDS, max_runtime: Optional[float] = None) -> List[Job]:
+        """Fail running jobs that nobody is working on any more, and return them.
+
+        That is jobs whose worker process no longer exists on this host,
+        whose lease expired (the worker hung or died elsewhere) or that ran
+        past max_runtime (CREW_JOB_MAX_SECONDS). Callers owning a returned
+        job's worker should kill it, since it may still be stuck on the job.
+        """
+        if max_runtime is None:
+            max_runtime = float(os.getenv('CREW_JOB_MAX_SECONDS', DEFAULT_MAX_RUNTIME_SECONDS))
+        now = time.time()
+        reaped = []
+        for job_id, worker, started, heartbeat in self._execute(
+            "SELECT id, worker, started, COALESCE(heartbeat, started) FROM jobs WHERE status = 'running'"
+        ):
+            if worker is not None and not _pid_alive(worker):
+                error = 'Worker exited before the job finished'
+            elif heartbeat is None or heartbeat < now - lease:
+                error = 'Worker stopped responding'
+            elif started is not None and started < now - max_runtime:
+                error = f'Timed out after {max_runtime:.0f} seconds'
+            else:
+                continue
+            self.finish(job_id, 'failed', error=error)
+            reaped.append(self.get(job_id, with_events=False))
+        return reaped
+
+    def fail_worker_jobs(self, worker: int) -> None:
+        """Mark the running jobs of a worker that has exited as failed."""
+        for (job_id,) in self._execute(
+            "SELECT id FROM jobs WHERE status = 'running' AND worker = ?", (worker,)
+        ):
+            self.finish(job_id, 'failed', error='Worker exited before the job finished')
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # Exists but belongs to someone else
+    return True
+
+
+def run_job(queue: JobQueue, job: Job) -> None:
+    """Run one claimed job in this worker process."""
+    from latest_ai_development_crew.llm_config import LLMConfig
+    from latest_ai_development_crew.main import run_agent
+    from latest_ai_development_crew.progress import progress_sink, register_stream_listeners
+
+    register_stream_listeners()
+    tokens: List[str] = []
+    last_flush = time.time()
+
+    def flush() -> None:
+        nonlocal last_flush
+        if tokens:
+            queue.add_event(job.id, 'token', {'text': ''.join(tokens)})
+            tokens.clear()
+        last_flush = time.time()
+        # Progress events are the crew's only yield points, so that's
+        # where a cooperative cancel takes effect
+        if queue.is_cancel_requested(job.id):
+            raise JobCancelled(job.id)
+
+    def record(kind: str, payload: Dict[str, Any]) -> None:
+        # Stream chunks are batched so each token isn't its own write
+        if kind == 'token':
+            tokens.append(payload.get('text', ''))
+            if time.time() - last_flush >= TOKEN_FLUSH_SECONDS:
+                flush()
+            return
+        flush()
+        queue.add_event(job.id, kind, payload)
+
+    # Keeps the job's lease alive while the crew runs, however long an LLM call takes
+    done = threading.Event()
+
+    def beat() -> None:
+        while not done.wait(HEARTBEAT_SECONDS):
+            queue.heartbeat(job.id)
+
+    threading.Thread(target=beat, daemon=True, name='job-heartbeat').start()
+    try:
+        with progress_sink(record):
+            result = run_agent(job.topic, LLMConfig.from_dict(job.settings))
+        flush()
+    except JobCancelled:
+        queue.finish(job.id, 'cancelled', error='Cancelled')
+        return
+    except Exception as e:
+        queue.finish(job.id, 'failed', error=str(e))
+        return
+    finally:
+        done.set()
+
+    if queue.is_cancel_requested(job.id):
+        queue.finish(job.id, 'cancelled', error='Cancelled')
+    elif isinstance(result, dict) and 'error' in result:
+        queue.finish(job.id, 'failed', result=result, error=result['error'])
+    else:
+        queue.finish(job.id, 'done', result=result)
+
+
+def worker_main(db_path: Optional[str] = None) -> None:
+    """Claim and run jobs until the process is stopped."""
+    # Must happen before anything imports crewai
+    import patch_chromadb  # noqa: F401
+    from latest_ai_development_crew.crew_pool import get_crew_pool
+    from latest_ai_development_crew.llm_config import LLMConfig
+
+    default_config = LLMConfig()
+    get_crew_pool().warm(default_config, llm_config=default_config)
+    queue = JobQueue(db_path)
+    while True:
+        job = queue.claim(os.getpid())
+        if job is None:
+            time.sleep(POLL_INTERVAL_SECONDS)
+            continue
+        run_job(queue, job)
+
+
+class WorkerPool:
+    """A fixed number of worker processes plus a supervising thread.
+
+    The supervisor restarts workers that die, fails their orphaned jobs,
+    kills workers stuck on a job whose cancellation is overdue, and fails
+    jobs whose lease expired or that exceeded the maximum runtime.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, db_path: Optional[str] = None):
+        self.workers = workers
+        self.db_path = db_path
+        # Spawn rather than fork: the Streamlit server is multi-threaded
+        self._context = multiprocessing.get_context('spawn')
+        self._processes: List[multiprocessing.Process] = []
+        self._stopped = threading.Event()
+
+    def _spawn(self) -> multiprocessing.Process:
+        process = self._context.Process(target=worker_main, args=(self.db_path,), daemon=True, name='crew-worker')
+        process.start()
+        return process
+
+    def start(self) -> None:
+        self._processes = [self._spawn() for _ in range(self.workers)]
+        threading.Thread(target=self._supervise, daemon=True, name='crew-worker-supervisor').start()
+
+    def _supervise(self) -> None:
+        queue = JobQueue(self.db_path)
+        while not self._stopped.wait(POLL_INTERVAL_SECONDS * 4):
+            pids = {process.pid for process in self._processes}
+            for job in queue.overdue_cancellations():
+                if job.worker in pids:
+                    os.kill(job.worker, signal.SIGTERM)
+                    queue.finish(job.id, 'cancelled', error='Cancelled')
+            # Hung, timed-out or orphaned jobs, from this pool or any other
+            for job in queue.reap():
+                if job.worker in pids:
+                    os.kill(job.worker, signal.SIGTERM)
+            for index, process in enumerate(self._processes):
+                if not process.is_alive():
+                    queue.fail_worker_jobs(process.pid)
+                    self._processes[index] = self._spawn()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        for process in self._processes:
+            process.terminate()
+
+
+_queue: Optional[JobQueue] = None
+_queue_pid: Optional[int] = None
+_pool: Optional[WorkerPool] = None
+_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return this process's connection to the job broker.
+
+    CREW_MAX_QUEUED sets how many jobs may wait before submit() refuses.
+    """
+    global _queue, _queue_pid
+    with _lock:
+        # SQLite connections must not be shared across forked processes
+        if _queue is None or _queue_pid != os.getpid():
+            _queue = JobQueue(max_queued=int(os.getenv('CREW_MAX_QUEUED', DEFAULT_MAX_QUEUED)))
+            _queue_pid = os.getpid()
+        return _queue
+
+
+def ensure_workers() -> None:
+    """Start the embedded worker pool once per server process.
+
+    CREW_WORKERS sets its size; 0 leaves job execution to workers started
+    separately with ``python jobs.py worker``.
+    """
+    global _pool
+    with _lock:
+        workers = int(os.getenv('CREW_WORKERS', DEFAULT_WORKERS))
+        if _pool is None and workers > 0:
+            _pool = WorkerPool(workers)
+            _pool.start()
+
+
+if __name__ == '__main__':
+    # python jobs.py worker [count]
+    if len(sys.argv) < 2 or sys.argv[1] != 'worker':
+        sys.exit('usage: python jobs.py worker [count]')
+    pool = WorkerPool(int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_WORKERS)
+    pool.start()
+    try:
+        signal.pause()
+    except KeyboardInterrupt:
+        pool.stop()
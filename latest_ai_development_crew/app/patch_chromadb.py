@@ -1,19 +1,255 @@
 # app/patch_chromadb.py
+"""Embedded stand-in for chromadb, installed before crewai is imported.
+
+crewAI stores crew memory and knowledge through chromadb, whose import and
+client start-up are heavy. This registers a ``chromadb`` module exposing
+the parts of its API crewAI uses, backed by the memory-mapped NumPy store
+in ``latest_ai_development_crew.vector_store``, so memory and knowledge
+work without chromadb.
+
+Text is embedded locally by feature hashing unless
+``VECTOR_STORE_EMBEDDER=openai`` is set, in which case the OpenAI
+embedding model crewAI asks for is used. Other embedder providers need
+chromadb itself and raise an ImportError naming the provider.
+"""
+import atexit
+import os
+import shutil
 import sys
+import tempfile
+import threading
 import types
+from typing import Any, Dict, List, TypeVar, Union
+
+from latest_ai_development_crew.vector_store import HashingEmbedder, InvalidDimensionException, VectorStore
+
+T = TypeVar("T")
+Documents = List[str]
+Embeddings = List[Any]
+Metadata = Dict[str, Any]
+OneOrMany = Union[T, List[T]]
+
+
+class Settings:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class EmbeddingFunction:
+    """Base for callables mapping a list of texts to their embeddings."""
+
+    def __call__(self, input: Documents) -> Embeddings:
+        raise NotImplementedError
+
+
+def validate_embedding_function(embedding_function: Any) -> None:
+    if not callable(embedding_function):
+        raise ValueError("Embedding function must be callable")
+
+
+class OpenAIEmbeddingFunction(EmbeddingFunction):
+    """crewAI's default embedder; local hashing unless OpenAI is opted into."""
+
+    def __init__(self, api_key: str = None, model_name: str = "text-embedding-3-small",
+                 api_base: str = None, dimensions: int = None, **kwargs):
+        self.model_name = model_name
+        self.dimensions = dimensions
+        self._client = None
+        if os.getenv("VECTOR_STORE_EMBEDDER", "hashing").lower() == "openai":
+            import openai
+            self._client = openai.OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"), base_url=api_base)
+        self._local = HashingEmbedder()
+
+    def __call__(self, input: Documents) -> Embeddings:
+        if self._client is None:
+            return self._local(input)
+        extra = {"dimensions": self.dimensions} if self.dimensions else {}
+        response = self._client.embeddings.create(model=self.model_name, input=list(input), **extra)
+        return [item.embedding for item in response.data]
+
+
+def _unsupported_embedder(name: str, provider: str) -> type:
+    """An EmbeddingFunction class that refuses to be built without chromadb."""
+
+    def __init__(self, *args, **kwargs):
+        raise ImportError(
+            f"The {provider} embedder needs chromadb, which app/patch_chromadb.py replaces; "
+            f"use the openai (or default) embedder, or don't import the patch"
+        )
+
+    return type(name, (EmbeddingFunction,), {"__init__": __init__})
+
+
+def _listify(value: Any) -> Any:
+    return [value] if isinstance(value, (str, dict)) else value
+
+
+class Collection:
+    """chromadb Collection API over a VectorCollection.
+
+    query() reports cosine *similarity* under "distances": crewAI reads
+    that field as a relevance score and keeps results at or above its
+    score_threshold, so similarity is what makes its filtering work.
+    """
+
+    def __init__(self, store: VectorStore, name: str, embedding_function: Any = None, metadata: Dict = None):
+        self.name = name
+        self.metadata = metadata or {}
+        self._collection = store.collection(name, embedding_function)
+
+    def count(self) -> int:
+        return self._collection.count()
+
+    def upsert(self, ids, documents=None, metadatas=None, embeddings=None, **kwargs) -> None:
+        ids = _listify(ids)
+        metadatas = _listify(metadatas)
+        if metadatas is not None and len(metadatas) == 1 and len(ids) > 1:
+            metadatas = metadatas * len(ids)
+        try:
+            self._collection.upsert(ids, _listify(documents), metadatas, embeddings)
+        except InvalidDimensionException as e:
+            raise errors.InvalidDimensionException(str(e)) from e
+
+    add = upsert
+
+    def query(self, query_texts=None, query_embeddings=None, n_results: int = 10, where=None, **kwargs) -> Dict:
+        queries = _listify(query_texts) if query_texts is not None else list(query_embeddings)
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for query in queries:
+            hits = self._collection.search(query, limit=n_results, where=where)
+            result["ids"].append([hit.id for hit in hits])
+            result["documents"].append([hit.document for hit in hits])
+            result["metadatas"].append([hit.metadata for hit in hits])
+            result["distances"].append([hit.score for hit in hits])
+        return result
+
+    def get(self, ids=None, where=None, limit=None, **kwargs) -> Dict:
+        records = self._collection.get(ids=_listify(ids), where=where, limit=limit)
+        return {
+            "ids": [record.id for record in records],
+            "documents": [record.document for record in records],
+            "metadatas": [record.metadata for record in records],
+        }
+
+    def delete(self, ids=None, where=None, **kwargs) -> None:
+        self._collection.delete(ids=_listify(ids), where=where)
+
+
+class PersistentClient:
+    def __init__(self, path: str = "./chroma", settings: Settings = None, **kwargs):
+        self.path = path
+        self.settings = settings or Settings()
+        self._store = VectorStore(path)
+
+    def heartbeat(self) -> int:
+        return 1
+
+    def get_or_create_collection(self, name: str, embedding_function: Any = None, metadata: Dict = None,
+                                 **kwargs) -> Collection:
+        return Collection(self._store, name, embedding_function, metadata)
+
+    create_collection = get_or_create_collection
+
+    def get_collection(self, name: str, embedding_function: Any = None, **kwargs) -> Collection:
+        if name not in self._store.collection_names():
+            raise ValueError(f"Collection {name} does not exist.")
+        return Collection(self._store, name, embedding_function)
+
+    def list_collections(self) -> List[str]:
+        return self._store.collection_names()
+
+    def delete_collection(self, name: str) -> None:
+        self._store.delete_collection(name)
+
+    def reset(self) -> bool:
+        self._store.reset()
+        return True
+
+
+_temp_root = None
+_temp_root_pid = None
+_temp_root_lock = threading.Lock()
+
+
+def _remove_temp_root(path: str, pid: int) -> None:
+    # Forked children inherit the handler but not the directory
+    if os.getpid() == pid:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _temp_dir() -> str:
+    """The process's temporary store directory, removed when it exits."""
+    global _temp_root, _temp_root_pid
+    with _temp_root_lock:
+        if _temp_root is None or _temp_root_pid != os.getpid():
+            _temp_root = tempfile.mkdtemp(prefix="vector_store_")
+            _temp_root_pid = os.getpid()
+            atexit.register(_remove_temp_root, _temp_root, _temp_root_pid)
+        return _temp_root
+
+
+def Client(settings: Settings = None, **kwargs) -> PersistentClient:
+    """In-process client whose collections live in the process's temporary directory.
+
+    Like chromadb's in-memory clients, every client in a process sees the
+    same collections.
+    """
+    return PersistentClient(_temp_dir(), settings)
+
+
+EphemeralClient = Client
+
+
+def _module(name: str, **attributes) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
 
-# Create a fake chromadb module
-fake_chromadb = types.ModuleType("chromadb")
-fake_chromadb.Client = lambda *args, **kwargs: None
-fake_chromadb.__version__ = "0.0.0"
-
-# Also fake submodules that crewai tries to import
-fake_chromadb.errors = types.SimpleNamespace()
-fake_chromadb.api = types.SimpleNamespace()
-fake_chromadb.api.ClientAPI = object
-fake_chromadb.api.types = types.SimpleNamespace(OneOrMany=object)
-
-sys.modules["chromadb"] = fake_chromadb
-sys.modules["chromadb.errors"] = fake_chromadb.errors
-sys.modules["chromadb.api"] = fake_chromadb.api
-sys.modules["chromadb.api.types"] = fake_chromadb.api.types
+errors = _module(
+    "chromadb.errors",
+    InvalidDimensionException=type("InvalidDimensionException", (InvalidDimensionException,), {}),
+)
+api_types = _module(
+    "chromadb.api.types",
+    Documents=Documents, Embeddings=Embeddings, Metadata=Metadata, OneOrMany=OneOrMany,
+    EmbeddingFunction=EmbeddingFunction, validate_embedding_function=validate_embedding_function,
+)
+api = _module("chromadb.api", ClientAPI=PersistentClient, types=api_types)
+config = _module("chromadb.config", Settings=Settings)
+openai_embedding_function = _module(
+    "chromadb.utils.embedding_functions.openai_embedding_function",
+    OpenAIEmbeddingFunction=OpenAIEmbeddingFunction,
+)
+# The other providers crewAI's EmbeddingConfigurator imports: module -> (classes, provider)
+UNSUPPORTED_EMBEDDERS = {
+    "ollama_embedding_function": (("OllamaEmbeddingFunction",), "ollama"),
+    "google_embedding_function": (
+        ("GoogleVertexEmbeddingFunction", "GoogleGenerativeAiEmbeddingFunction"), "google/vertexai"
+    ),
+    "cohere_embedding_function": (("CohereEmbeddingFunction",), "cohere"),
+    "voyageai_embedding_function": (("VoyageAIEmbeddingFunction",), "voyageai"),
+    "amazon_bedrock_embedding_function": (("AmazonBedrockEmbeddingFunction",), "bedrock"),
+    "huggingface_embedding_function": (("HuggingFaceEmbeddingServer",), "huggingface"),
+}
+embedder_modules = {
+    module: _module(
+        f"chromadb.utils.embedding_functions.{module}",
+        **{name: _unsupported_embedder(name, provider) for name in names},
+    )
+    for module, (names, provider) in UNSUPPORTED_EMBEDDERS.items()
+}
+embedding_functions = _module(
+    "chromadb.utils.embedding_functions",
+    OpenAIEmbeddingFunction=OpenAIEmbeddingFunction, openai_embedding_function=openai_embedding_function,
+    **embedder_modules,
+)
+utils = _module("chromadb.utils", embedding_functions=embedding_functions)
+chromadb = _module(
+    "chromadb",
+    __version__="0.0.0+vector_store",
+    Client=Client, EphemeralClient=EphemeralClient, PersistentClient=PersistentClient, Collection=Collection,
+    Settings=Settings, Documents=Documents, Embeddings=Embeddings, Metadata=Metadata,
+    EmbeddingFunction=EmbeddingFunction, api=api, config=config, errors=errors, utils=utils,
+)
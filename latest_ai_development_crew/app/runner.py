@@ -15,19 +15,89 @@
 # Patch chromadb before crewai ever loads
 import patch_chromadb  
 
-from latest_ai_development_crew.main import run_agent
+import hashlib
+import json
+import time
 
+from jobs import QueueFull, ensure_workers, get_job_queue
 
-def run_agent_wrapper(user_input: str):
+# Streamlit imports this module once per server process; crews run in the
+# worker processes, never in the server itself
+ensure_workers()
+
+# How often run_agent_wrapper checks on its job
+POLL_INTERVAL_SECONDS = 0.5
+
+
+def run_agent_wrapper(user_input: str, timeout: float = None):
+    """Submit user_input as a job and wait for its result."""
     try:
-        result = run_agent(user_input)
+        job_id = submit_agent_job(user_input)
+        deadline = time.time() + timeout if timeout else None
+        job = get_agent_job(job_id)
+        while job.active:
+            if deadline and time.time() > deadline:
+                cancel_agent_job(job_id)
+                return f"🤖 Timed out waiting for a response for: {user_input}"
+            time.sleep(POLL_INTERVAL_SECONDS)
+            job = get_agent_job(job_id)
 
-        if isinstance(result, dict) and "error" in result:
-            return f"🤖 {result.get('message', 'Knowledge DB disabled')} \n\nResponse for: {user_input}"
+        result = job.result
+        if job.status != "done" or (isinstance(result, dict) and "error" in result):
+            message = result.get('message', 'Knowledge DB disabled') if isinstance(result, dict) else job.error
+            return f"🤖 {message} \n\nResponse for: {user_input}"
 
         return result
 
+    except QueueFull:
+        return f"🤖 The crew is busy right now, please try again shortly. Request: {user_input}"
     except Exception as e:
         return f"🤖 (Safe Mode) Unable to use Knowledge DB. Response for: {user_input}"
 
 
+def llm_settings(model: str = None, temperature: float = None, max_tokens: int = None,
+                 memory: bool = None) -> dict:
+    """The crew's LLMConfig fields for a request; unset ones keep the crew defaults."""
+    settings = {
+        "model": model.strip() if model else None,
+        "temperature": None if temperature is None else round(float(temperature), 2),
+        "max_tokens": None if max_tokens is None else int(max_tokens),
+        "memory": None if memory is None else bool(memory),
+    }
+    return {name: value for name, value in settings.items() if value is not None}
+
+
+def request_key(topic: str, settings: dict = None) -> str:
+    """Identity of a request for coalescing: normalized topic plus LLM settings."""
+    # The report archive's normalize_topic, so a job and the report it
+    # reuses agree on which topics are the same
+    from latest_ai_development_crew.llm_config import LLMConfig
+    from latest_ai_development_crew.report_archive import normalize_topic
+
+    # Through LLMConfig, so settings that run the same crew (memory=None and
+    # memory=False, say) share a key
+    settings = LLMConfig.from_dict(settings).to_dict()
+    parts = [normalize_topic(topic), json.dumps(settings, sort_keys=True)]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def submit_agent_job(user_input: str, model: str = None, temperature: float = None,
+                     max_tokens: int = None, memory: bool = None) -> str:
+    """Queue a crew run and return its job ID; raises QueueFull under load.
+
+    The crew runs with the given model, temperature, max_tokens and memory
+    setting. Identical requests already in flight are coalesced: the caller
+    gets the existing job's ID and shares its result instead of starting a
+    new crew.
+    """
+    settings = llm_settings(model, temperature, max_tokens, memory)
+    return get_job_queue().submit(user_input, dedupe_key=request_key(user_input, settings), settings=settings)
+
+
+def get_agent_job(job_id: str):
+    """Return the job (status, progress events, result) for job_id."""
+    return get_job_queue().get(job_id)
+
+
+def cancel_agent_job(job_id: str) -> None:
+    get_job_queue().cancel(job_id)
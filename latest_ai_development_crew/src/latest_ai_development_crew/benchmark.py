@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""Offline end-to-end benchmark of run_agent on the mock LLM.
+
+Runs the real crew (pool, progress events, telemetry, report writing)
+against a mock/ model, so no network or API key is needed, and reports:
+
+- kickoff latency: the cold first run, which builds the crew, then the
+  p50/p95/mean of warm runs that borrow it from the pool
+- orchestration overhead: each run's wall time minus the time the mock
+  model spent "generating", i.e. what crewAI and this package add
+- concurrency scaling: throughput with 1, 2, 4, ... concurrent run_agent
+  calls on threads, and its efficiency against perfect linear scaling
+
+    benchmark --model mock/realistic --runs 5 --concurrency 1,2,4,8
+
+Pacing comes from the mock profile (see mock_llm.PROFILES) and can be
+tuned with MOCK_LLM_LATENCY, MOCK_LLM_TOKENS_PER_SECOND and
+MOCK_LLM_RESPONSE_TOKENS. Reports are written to a temporary directory
+and report reuse is switched off, so every run kicks off the crew.
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Sequence
+
+from latest_ai_development_crew.llm_config import LLMConfig
+from latest_ai_development_crew.mock_llm import is_mock_model, thread_llm_stats
+
+DEFAULT_MODEL = 'mock/realistic'
+DEFAULT_RUNS = 5
+DEFAULT_CONCURRENCY = (1, 2, 4, 8)
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def timed_run(index: int, model: str) -> Dict[str, Any]:
+    """One run_agent call, with its wall time and the mock model's share of it."""
+    from latest_ai_development_crew.main import run_agent
+
+    calls, llm_seconds = thread_llm_stats()
+    started = time.perf_counter()
+    result = run_agent(f'Benchmark topic {index}', LLMConfig(model=model))
+    seconds = time.perf_counter() - started
+    calls_after, llm_seconds_after = thread_llm_stats()
+    return {
+        'seconds': seconds,
+        'llm_seconds': llm_seconds_after - llm_seconds,
+        'overhead_seconds': seconds - (llm_seconds_after - llm_seconds),
+        'llm_calls': calls_after - calls,
+        'error': result.get('error') if isinstance(result, dict) else None,
+    }
+
+
+def measure_latency(model: str, runs: int) -> Dict[str, Any]:
+    """A cold first run, then `runs` warm runs one after another."""
+    cold = timed_run(0, model)
+    warm = [timed_run(index, model) for index in range(1, runs + 1)]
+    seconds = [run['seconds'] for run in warm]
+    overhead = [run['overhead_seconds'] for run in warm]
+    return {
+        'cold_seconds': cold['seconds'],
+        'p50_seconds': _percentile(seconds, 0.5),
+        'p95_seconds': _percentile(seconds, 0.95),
+        'mean_seconds': statistics.mean(seconds),
+        'mean_overhead_seconds': statistics.mean(overhead),
+        'overhead_share': sum(overhead) / sum(seconds),
+        'llm_calls_per_run': statistics.mean(run['llm_calls'] for run in warm),
+        'errors': [run['error'] for run in [cold] + warm if run['error']],
+    }
+
+
+def measure_scaling(model: str, levels: Sequence[int], runs: int) -> List[Dict[str, Any]]:
+    """Throughput at each concurrency level, over runs rounds of that many parallel runs."""
+    rows, baseline, index = [], None, 1000
+    for concurrency in levels:
+        total = runs * concurrency
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            # Untimed round so the pool holds enough crews for this level
+            list(pool.map(timed_run, range(index, index + concurrency), [model] * concurrency))
+            index += concurrency
+            started = time.perf_counter()
+            results = list(pool.map(timed_run, range(index, index + total), [model] * total))
+            elapsed = time.perf_counter() - started
+            index += total
+        throughput = total / elapsed
+        baseline = baseline or throughput / concurrency
+        rows.append({
+            'concurrency': concurrency,
+            'runs': total,
+            'runs_per_s': throughput,
+            'p50_seconds': _percentile([run['seconds'] for run in results], 0.5),
+            'mean_overhead_seconds': statistics.mean(run['overhead_seconds'] for run in results),
+            'efficiency': throughput / (baseline * concurrency),
+            'errors': [run['error'] for run in results if run['error']],
+        })
+    return rows
+
+
+def format_report(latency: Dict[str, Any], scaling: List[Dict[str, Any]]) -> str:
+    lines = [
+        f"Cold kickoff (builds the crew): {latency['cold_seconds']:.3f}s",
+        f"Warm kickoff: p50 {latency['p50_seconds']:.3f}s, p95 {latency['p95_seconds']:.3f}s, "
+        f"mean {latency['mean_seconds']:.3f}s ({latency['llm_calls_per_run']:.1f} LLM calls per run)",
+        f"Orchestration overhead: {latency['mean_overhead_seconds'] * 1000:.1f} ms per run "
+        f"({latency['overhead_share']:.1%} of wall time)",
+    ]
+    if scaling:
+        lines += ['', f"{'concurrency':>11} {'runs':>6} {'runs/s':>8} {'p50 s':>8} {'overhead ms':>12} {'efficiency':>11}"]
+        for row in scaling:
+            lines.append(
+                f"{row['concurrency']:>11} {row['runs']:>6} {row['runs_per_s']:>8.2f} {row['p50_seconds']:>8.3f} "
+                f"{row['mean_overhead_seconds'] * 1000:>12.1f} {row['efficiency']:>11.1%}"
+            )
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark run_agent end to end against the mock LLM.")
+    parser.add_argument('--model', default=DEFAULT_MODEL,
+                        help="mock model, e.g. mock/instant, mock/fast, mock/realistic, mock/slow (default: %(default)s)")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS,
+                        help="warm runs for latency, and batches per concurrency level")
+    parser.add_argument('--concurrency', default=','.join(map(str, DEFAULT_CONCURRENCY)),
+                        help="comma-separated concurrency levels; empty skips scaling (default: %(default)s)")
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    parser.add_argument('--verbose', action='store_true', help="show the crew's own output")
+    args = parser.parse_args(argv)
+
+    if not is_mock_model(args.model):
+        parser.error("the benchmark only runs offline models; use a mock/ model")
+    try:
+        levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    except ValueError:
+        parser.error(f"invalid --concurrency: {args.concurrency}")
+    runs = max(1, args.runs)
+    output_path = os.path.abspath(args.output) if args.output else None
+
+    # Every run must reach the crew, and nothing may land in the real output/ or span log
+    os.environ['REPORT_REUSE'] = '0'
+    workdir = tempfile.mkdtemp(prefix='crew_bench_')
+    os.environ.setdefault('LATEST_AI_TELEMETRY_FILE', os.path.join(workdir, 'spans.jsonl'))
+    os.chdir(workdir)
+
+    print(f"⏱️ Benchmarking run_agent on {args.model} ({runs} runs, concurrency {levels or '-'})", flush=True)
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, 'w'))
+    with output:
+        latency = measure_latency(args.model, runs)
+        scaling = measure_scaling(args.model, levels, runs) if levels else []
+
+    print(format_report(latency, scaling))
+    errors = latency['errors'] + [error for row in scaling for error in row['errors']]
+    if errors:
+        print(f"\n❌ {len(errors)} runs failed, first error: {errors[0]}")
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({'model': args.model, 'runs': runs, 'latency': latency, 'scaling': scaling}, f, indent=2)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
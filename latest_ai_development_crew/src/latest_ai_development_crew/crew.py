@@ -1,9 +1,22 @@
 # src/latest_ai_development/crew.py
-from crewai import Agent, Crew, Process, Task
+from datetime import datetime
+from pathlib import Path
+
+from crewai import Agent, BaseLLM, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task,before_kickoff, after_kickoff
 #from crewai_tools import SerperDevTool
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
+from crewai.knowledge.source.text_file_knowledge_source import TextFileKnowledgeSource
+from typing import Dict, List, Optional
+
+from latest_ai_development_crew.llm_cache import CachedLLM
+from latest_ai_development_crew.llm_config import LLMConfig
+from latest_ai_development_crew.mock_llm import MockLLM, is_mock_model
+from latest_ai_development_crew.progress import on_step, on_task
+from latest_ai_development_crew.telemetry import get_tracer
+
+# Project-level knowledge files, shared with the crew when memory is on
+KNOWLEDGE_DIR = Path(__file__).resolve().parents[2] / 'knowledge'
 
 
 
@@ -15,6 +28,26 @@ class LatestAiDevelopmentCrew():
   agents: List[BaseAgent]
   tasks: List[Task]
 
+  def __init__(self, llm_config: Optional[LLMConfig] = None):
+    # Runtime model, sampling and memory settings; unset fields keep the
+    # agents.yaml defaults
+    self.llm_config = llm_config or LLMConfig()
+
+  def _llm(self, agent_name: str) -> BaseLLM:
+    default_model = self.agents_config[agent_name]['llm'] # type: ignore[index]
+    kwargs = self.llm_config.llm_kwargs(default_model)
+    if is_mock_model(kwargs['model']):
+      # e.g. `llm: mock/realistic` runs the crew offline for benchmarks
+      return MockLLM(**kwargs, stream=True)
+    return CachedLLM(**kwargs, stream=True)
+
+  def models(self) -> Dict[str, str]:
+    """The model each agent runs with under this crew's llm_config."""
+    return {
+      name: self.llm_config.llm_kwargs(config['llm'])['model']
+      for name, config in self.agents_config.items() # type: ignore[union-attr]
+    }
+
 
 
 
@@ -27,6 +60,12 @@ class LatestAiDevelopmentCrew():
   @before_kickoff
   def before_kickoff_function(self, inputs):
     print(f"Before kickoff function with inputs: {inputs}")
+    # Stamped per kickoff (not per crew build) so pooled crews still write
+    # a fresh report file every run
+    inputs.setdefault('timestamp', datetime.now().strftime("%Y%m%d_%H%M%S"))
+    # Only set when run_agent refreshes an archived report
+    inputs.setdefault('refresh_note', '')
+    inputs.setdefault('previous_report', '')
     return inputs # You can return the inputs or modify them as needed
 
   @after_kickoff
@@ -43,6 +82,7 @@ class LatestAiDevelopmentCrew():
   def researcher(self) -> Agent:
     return Agent(
       config=self.agents_config['researcher'], # type: ignore[index]
+      llm=self._llm('researcher'),
       verbose=True,
       #tools=[SerperDevTool()]
     )
@@ -51,6 +91,7 @@ class LatestAiDevelopmentCrew():
   def reporting_analyst(self) -> Agent:
     return Agent(
       config=self.agents_config['reporting_analyst'], # type: ignore[index]
+      llm=self._llm('reporting_analyst'),
       verbose=True
     )
 
@@ -62,13 +103,9 @@ class LatestAiDevelopmentCrew():
 
   @task
   def reporting_task(self) -> Task:
-      import datetime
-      
-      timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-      
       return Task(
           config=self.tasks_config['reporting_task'], # type: ignore[index]
-          output_file=f'output/{{topic}}_{timestamp}.md'  # Use double braces for topic variable
+          output_file='output/{topic}_{timestamp}.md'  # Interpolated from the kickoff inputs
       )
 
 
@@ -77,9 +114,25 @@ class LatestAiDevelopmentCrew():
   @crew
   def crew(self) -> Crew:
     """Creates the LatestAiDevelopment crew"""
-    return Crew(
+    get_tracer()  # Spans for every kickoff, task, agent, LLM and tool call
+    settings = dict(
       agents=self.agents, # Automatically created by the @agent decorator
       tasks=self.tasks, # Automatically created by the @task decorator
       process=Process.sequential,
       verbose=True,
-    )
\ No newline at end of file
+      # Fixed forwarders; each kickoff installs its own progress sink
+      step_callback=on_step,
+      task_callback=on_task,
+    )
+    if not self.llm_config.memory:
+      return Crew(**settings)
+    knowledge_files = sorted(KNOWLEDGE_DIR.glob('*.txt')) if KNOWLEDGE_DIR.is_dir() else []
+    if knowledge_files:
+      settings['knowledge_sources'] = [TextFileKnowledgeSource(file_paths=knowledge_files)]
+    try:
+      return Crew(memory=True, **settings)
+    except ImportError as e:
+      # Memory needs a vector store backend; run without it rather than fail
+      print(f"Crew memory unavailable, running without it: {e}")
+      settings.pop('knowledge_sources', None)
+      return Crew(**settings)
\ No newline at end of file
@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Hashable, Iterator, List, Optional
+
+from crewai import Crew
+
+from latest_ai_development_crew.crew import LatestAiDevelopmentCrew
+from latest_ai_development_crew.llm_config import LLMConfig
+
+DEFAULT_MAX_IDLE = 4
+# Distinct settings keys kept pooled; the least recently used is dropped
+DEFAULT_MAX_KEYS = 8
+
+
+class CrewPool:
+    """Reuse built crews across kickoffs.
+
+    Building a crew reads the YAML configs and instantiates every agent and
+    LLM client, which is pure overhead when the settings haven't changed.
+    Crews are pooled per settings key; each kickoff takes one out for its
+    exclusive use and hands it back afterwards, so concurrent requests never
+    share a crew. A new crew is only built when every pooled one is busy.
+    Only the max_keys most recently used settings keep idle crews.
+    """
+
+    def __init__(self, factory: Callable[..., Crew], max_idle: int = DEFAULT_MAX_IDLE,
+                 max_keys: int = DEFAULT_MAX_KEYS):
+        self.factory = factory
+        self.max_idle = max_idle
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._idle: 'OrderedDict[Hashable, List[Crew]]' = OrderedDict()
+
+    def _take(self, key: Hashable) -> Optional[Crew]:
+        with self._lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
+
+    def _give_back(self, key: Hashable, crew: Crew) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            self._idle.move_to_end(key)
+            if len(idle) < self.max_idle:
+                idle.append(crew)
+            while len(self._idle) > self.max_keys:
+                self._idle.popitem(last=False)
+
+    @contextmanager
+    def crew(self, key: Hashable = (), **settings) -> Iterator[Crew]:
+        """Lend out a crew built for key, building one if none is idle.
+
+        ``settings`` are passed to the factory when a new crew is built and
+        must be fully described by ``key``. A crew whose kickoff raised is
+        discarded rather than returned to the pool.
+        """
+        crew = self._take(key) or self.factory(**settings)
+        yield crew
+        self._give_back(key, crew)
+
+    def warm(self, key: Hashable = (), **settings) -> None:
+        """Build a crew ahead of the first request, if none is pooled yet."""
+        with self._lock:
+            if self._idle.get(key):
+                return
+        self._give_back(key, self.factory(**settings))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._idle.clear()
+
+
+def _build_crew(llm_config: Optional[LLMConfig] = None) -> Crew:
+    return LatestAiDevelopmentCrew(llm_config).crew()
+
+
+_pool: Optional[CrewPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_crew_pool() -> CrewPool:
+    """Return the process-wide pool of LatestAiDevelopmentCrew crews."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CrewPool(_build_crew)
+        return _pool
+
+
+def pooled_crew(llm_config: Optional[LLMConfig] = None):
+    """Borrow a crew for llm_config (the agents.yaml defaults if None)."""
+    llm_config = llm_config or LLMConfig()
+    return get_crew_pool().crew(llm_config, llm_config=llm_config)
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from crewai import LLM
+
+from latest_ai_development_crew.progress import emit
+from latest_ai_development_crew.telemetry import get_tracer
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'latest_ai_development_crew'
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ResponseCache:
+    """SQLite store of LLM completions with a TTL and an LRU size limit.
+
+    Kept in step with code_reviewer_agent's AnalysisCache: with a ``ttl``
+    (seconds), older entries read as misses and are purged on the next
+    eviction pass; when the stored text grows past ``max_bytes`` the least
+    recently used entries are dropped.
+    """
+
+    # How many writes to batch between eviction passes
+    EVICT_CHECK_INTERVAL = 32
+
+    def __init__(self, path, ttl: Optional[float] = DEFAULT_TTL_SECONDS, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' response TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' created REAL NOT NULL,'
+            ' accessed REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Digest of everything that determines a completion."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _expiry(self) -> float:
+        """Creation time before which entries count as expired."""
+        return time.time() - self.ttl if self.ttl else float('-inf')
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response FROM responses WHERE key = ? AND created > ?', (key, self._expiry())
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+        return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, response, size, created, accessed) VALUES (?, ?, ?, ?, ?)',
+                (key, response, len(response.encode('utf-8')), now, now)
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % self.EVICT_CHECK_INTERVAL == 0:
+                self._evict_locked()
+
+    def evict(self) -> None:
+        """Drop expired entries, then least recently used ones until under the size limit."""
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        if self.ttl:
+            self._conn.execute('DELETE FROM responses WHERE created <= ?', (self._expiry(),))
+            self._conn.commit()
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Trim to 90% so we don't evict again on the very next write
+        target = int(self.max_bytes * 0.9)
+        freed = 0
+        stale = []
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY accessed'):
+            if total - freed <= target:
+                break
+            stale.append((key,))
+            freed += size
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', stale)
+        self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[ResponseCache] = None
+_cache_pid: Optional[int] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide response cache, or None when disabled.
+
+    Configured through LATEST_AI_LLM_CACHE (set to 0 to disable),
+    LATEST_AI_LLM_CACHE_DIR, LATEST_AI_LLM_CACHE_TTL (seconds, 0 for no
+    expiry) and LATEST_AI_LLM_CACHE_MAX_MB.
+    """
+    global _cache, _cache_pid
+
+    if os.getenv('LATEST_AI_LLM_CACHE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+
+    with _cache_lock:
+        # SQLite connections must not be shared across forked processes
+        if _cache is None or _cache_pid != os.getpid():
+            cache_dir = Path(os.getenv('LATEST_AI_LLM_CACHE_DIR', DEFAULT_CACHE_DIR))
+            ttl = float(os.getenv('LATEST_AI_LLM_CACHE_TTL', DEFAULT_TTL_SECONDS))
+            max_mb = os.getenv('LATEST_AI_LLM_CACHE_MAX_MB')
+            max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+            try:
+                _cache = ResponseCache(cache_dir / 'responses.sqlite', ttl=ttl, max_bytes=max_bytes)
+            except (OSError, sqlite3.Error):
+                return None  # Read-only home or similar, run uncached
+            _cache_pid = os.getpid()
+        return _cache
+
+
+class CachedLLM(LLM):
+    """LLM whose text completions are served from the local response cache.
+
+    The key covers the model, the sampling settings, the full message list
+    (the rendered task prompt plus every tool observation appended during
+    the agent loop) and the tool schemas offered to the model, so a hit is
+    only possible when the model would see exactly the same request.
+    """
+
+    def _cache_key(self, cache: ResponseCache, messages: Any, tools: Any) -> str:
+        return cache.make_key(
+            model=self.model,
+            temperature=self.temperature,
+            top_p=getattr(self, 'top_p', None),
+            max_tokens=getattr(self, 'max_tokens', None),
+            stop=getattr(self, 'stop', None),
+            messages=messages,
+            tools=tools,
+        )
+
+    def call(self, messages, tools=None, *args, **kwargs):
+        cache = get_response_cache()
+        if cache is None:
+            return super().call(messages, tools, *args, **kwargs)
+
+        key = self._cache_key(cache, messages, tools)
+        try:
+            cached = cache.get(key)
+        except sqlite3.Error:
+            cached = None
+        if cached is not None:
+            tracer = get_tracer()
+            if tracer is not None:
+                tracer.mark('cache_hits')
+            # Streaming consumers still see the answer, as a single chunk
+            if getattr(self, 'stream', False):
+                emit('token', text=cached)
+            return cached
+
+        response = super().call(messages, tools, *args, **kwargs)
+        # Only plain text is cacheable; tool-call objects are left alone
+        if isinstance(response, str) and response:
+            try:
+                cache.put(key, response)
+            except sqlite3.Error:
+                pass  # A full or locked cache must never fail the call
+        return response
+
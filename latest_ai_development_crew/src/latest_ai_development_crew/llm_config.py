@@ -0,0 +1,44 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class LLMConfig:
+    """Runtime LLM settings for one crew run.
+
+    Anything left as None falls back to what agents.yaml and crewAI would
+    use. Configs are hashable, so the crew pool keeps one set of crews per
+    distinct config and requests with the same settings reuse them.
+    """
+    model: Optional[str] = None
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+    memory: bool = False
+
+    def __post_init__(self):
+        # Normalize so equal settings always map to the same pooled crews
+        if self.model is not None:
+            object.__setattr__(self, 'model', self.model.strip() or None)
+        if self.temperature is not None:
+            object.__setattr__(self, 'temperature', round(float(self.temperature), 2))
+        if self.max_tokens is not None:
+            object.__setattr__(self, 'max_tokens', int(self.max_tokens))
+        object.__setattr__(self, 'memory', bool(self.memory))
+
+    def llm_kwargs(self, default_model: str) -> Dict[str, Any]:
+        """Keyword arguments for an agent's LLM whose YAML model is default_model."""
+        kwargs: Dict[str, Any] = {'model': self.model or default_model}
+        if self.temperature is not None:
+            kwargs['temperature'] = self.temperature
+        if self.max_tokens is not None:
+            kwargs['max_tokens'] = self.max_tokens
+        return kwargs
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'LLMConfig':
+        """Build a config from settings such as a job's, ignoring unknown keys."""
+        data = data or {}
+        return cls(**{name: data[name] for name in cls.__dataclass_fields__ if data.get(name) is not None})
@@ -5,6 +5,12 @@ import warnings
 from datetime import datetime
 
 from latest_ai_development_crew.crew import LatestAiDevelopmentCrew
+from latest_ai_development_crew.crew_pool import pooled_crew
+from latest_ai_development_crew.llm_config import LLMConfig
+from latest_ai_development_crew.progress import emit, stream_events
+from latest_ai_development_crew.report_archive import (
+    TIMESTAMP_FORMAT, fresh_seconds, get_report_archive, refresh_seconds
+)
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -22,28 +28,96 @@ def run():
         'current_year': str(datetime.now().year)
     }
     
-    try:
-        LatestAiDevelopmentCrew().crew().kickoff(inputs=inputs)
-    except Exception as e:
-        raise Exception(f"An error occurred while running the crew: {e}")
+    crew = LatestAiDevelopmentCrew().crew()
+    # Print the agents' output live as the LLM produces it
+    for event in stream_events(lambda: crew.kickoff(inputs=inputs)):
+        if event['kind'] == 'task_started':
+            print(f"\n\n=== {event['agent']} ===\n", flush=True)
+        elif event['kind'] == 'token':
+            print(event['text'], end='', flush=True)
+        elif event['kind'] == 'error':
+            raise Exception(f"An error occurred while running the crew: {event['error']}")
+    print()
 
 
 
-def run_agent(topic):
+def run_agent(topic, llm_config: LLMConfig = None):
     """
     Run the crew with a specific topic from user input.
+
+    llm_config overrides the model, temperature, max_tokens and memory of
+    the crew; crews are pooled per config, so repeat settings reuse them.
+
+    A report already written on the same topic is served as-is while it is
+    fresh, provided it was written with the same LLM settings (each agent's
+    effective model included); an older one, or one from other settings,
+    is handed to the crew to update instead of being rewritten from scratch.
     """
+    llm_config = llm_config or LLMConfig()
     inputs = {
         'topic': topic,
-        'current_year': str(datetime.now().year)
+        'current_year': str(datetime.now().year),
+        # Set here rather than by the crew, so the report's path is known
+        'timestamp': datetime.now().strftime(TIMESTAMP_FORMAT),
     }
-    
+
+    archive = get_report_archive()
+    settings = previous = report = None
+    try:
+        if archive is not None:
+            settings = report_settings(llm_config)
+            previous = archive.find(topic, max_age=refresh_seconds())
+        if previous is not None and previous.age <= fresh_seconds() and previous.settings == settings:
+            report = previous.read()
+        elif previous is not None:
+            written = datetime.fromtimestamp(previous.created).strftime('%Y-%m-%d')
+            inputs['refresh_note'] = (
+                f"A report on this topic was written on {written}. "
+                f"Focus on developments since then."
+            )
+            inputs['previous_report'] = (
+                f"Update this report from {written} with the new findings, keeping what is still accurate:\n\n"
+                f"{previous.read()}"
+            )
+    except Exception:
+        # A broken index or an unreadable report must never stop the crew
+        report = None
+        inputs.pop('refresh_note', None)
+        inputs.pop('previous_report', None)
+    if report is not None:
+        emit('report_reused', path=str(previous.path), topic=previous.topic, created=previous.created)
+        emit('token', text=report)
+        return report
+
     try:
-        result = LatestAiDevelopmentCrew().crew().kickoff(inputs=inputs)
-        return result.raw  # Return the actual result
+        # Reuse an already built crew instead of rebuilding agents per request
+        with pooled_crew(llm_config) as crew:
+            result = crew.kickoff(inputs=inputs)
     except Exception as e:
         return {"error": str(e), "message": "An error occurred while running the crew"}
-    
+
+    if settings is not None:
+        try:
+            archive.record(archive.output_dir / f"{topic}_{inputs['timestamp']}.md", settings)
+        except Exception:
+            pass  # Indexed without its settings on the next lookup instead
+    return result.raw  # Return the actual result
+
+
+def report_settings(llm_config: LLMConfig) -> dict:
+    """The LLM settings that shape a report, as recorded in the report archive."""
+    return {**llm_config.to_dict(), 'model': LatestAiDevelopmentCrew(llm_config).models()}
+
+
+def stream_agent(topic, llm_config: LLMConfig = None):
+    """
+    Run the crew for a topic and yield its output as it is produced.
+
+    Yields the event dicts of progress.stream_events: 'task_started' and
+    'task' mark task boundaries, 'token' carries LLM output chunks, and the
+    last event is 'result' (run_agent's return value) or 'error'.
+    """
+    yield from stream_events(lambda: run_agent(topic, llm_config))
 
 
 def train():
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, replace
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from crewai import BaseLLM
+
+# agents.yaml `llm:` values (or LLMConfig models) with this prefix run offline
+MOCK_PREFIX = 'mock/'
+
+
+@dataclass(frozen=True)
+class MockProfile:
+    """How a mock model paces its answers."""
+    latency: float = 0.0  # Seconds before the first token
+    tokens_per_second: float = 0.0  # 0 emits the whole answer at once
+    response_tokens: int = 300  # Length of generated answers, in words
+
+
+# mock/<name>; unknown names behave like mock/instant
+PROFILES = {
+    'instant': MockProfile(),
+    'fast': MockProfile(latency=0.1, tokens_per_second=400),
+    'realistic': MockProfile(latency=0.6, tokens_per_second=80),
+    'slow': MockProfile(latency=2.0, tokens_per_second=30),
+}
+
+_WORDS = (
+    'agents', 'benchmark', 'context', 'deployment', 'evaluation', 'framework', 'inference', 'latency',
+    'memory', 'models', 'open-source', 'orchestration', 'planning', 'reasoning', 'retrieval', 'safety',
+    'tooling', 'training', 'workflows', 'adoption', 'research', 'teams', 'costs', 'quality',
+)
+_TASK_LINE = re.compile(r'Current Task:\s*(.+)')
+
+
+def is_mock_model(model: Optional[str]) -> bool:
+    return bool(model) and model.startswith(MOCK_PREFIX)
+
+
+def mock_profile(model: str) -> MockProfile:
+    """The profile named by model, with MOCK_LLM_* environment overrides applied."""
+    profile = PROFILES.get(model[len(MOCK_PREFIX):], PROFILES['instant'])
+    overrides = {
+        'latency': os.getenv('MOCK_LLM_LATENCY'),
+        'tokens_per_second': os.getenv('MOCK_LLM_TOKENS_PER_SECOND'),
+        'response_tokens': os.getenv('MOCK_LLM_RESPONSE_TOKENS'),
+    }
+    return replace(profile, **{
+        name: type(getattr(profile, name))(float(value)) for name, value in overrides.items() if value
+    })
+
+
+def load_canned_responses(path: Optional[str] = None) -> List[Tuple[str, str]]:
+    """(substring, response) pairs from a JSON object file, e.g. MOCK_LLM_RESPONSES.
+
+    A response is used when its key occurs in the prompt; the key "*"
+    matches every prompt.
+    """
+    path = path or os.getenv('MOCK_LLM_RESPONSES')
+    if not path:
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return list(json.load(f).items())
+
+
+_stats = threading.local()
+
+
+def thread_llm_stats() -> Tuple[int, float]:
+    """Mock calls made on this thread and the seconds they spent simulating the model."""
+    return getattr(_stats, 'calls', 0), getattr(_stats, 'seconds', 0.0)
+
+
+class MockLLM(BaseLLM):
+    """Offline stand-in for a chat model, for benchmarks and tests.
+
+    Answers are canned (matched against the prompt) or generated
+    deterministically from the prompt, and are paced by a MockProfile:
+    a fixed first-token latency and then a token rate, streamed through
+    crewAI's event bus like a real model's. Call events and token usage
+    are reported the way crewAI's LLM reports them, so progress,
+    streaming and telemetry behave as in a real run.
+    """
+
+    def __init__(self, model: str = MOCK_PREFIX + 'instant', temperature: Optional[float] = None,
+                 max_tokens: Optional[int] = None, stream: bool = False,
+                 profile: Optional[MockProfile] = None, responses: Optional[List[Tuple[str, str]]] = None,
+                 **kwargs: Any):
+        super().__init__(model=model, temperature=temperature)
+        self.max_tokens = max_tokens
+        self.stream = stream
+        self.profile = profile or mock_profile(model)
+        self.responses = load_canned_responses() if responses is None else responses
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 128000
+
+    def respond(self, prompt: str) -> str:
+        """The full answer for prompt, before pacing."""
+        for key, response in self.responses:
+            if key == '*' or key in prompt:
+                text = response
+                break
+        else:
+            text = self._generate(prompt)
+        # crewAI's agent loop finishes on a final answer
+        if 'Final Answer:' not in text:
+            text = f"Thought: I now can give a great answer\nFinal Answer: {text}"
+        return text
+
+    def _generate(self, prompt: str) -> str:
+        # Seeded by the prompt, so the same request always gets the same answer
+        rng = random.Random(hashlib.blake2b(prompt.encode('utf-8'), digest_size=8).digest())
+        match = _TASK_LINE.search(prompt)
+        title = ' '.join(match.group(1).split()[:12]) if match else 'Findings'
+        words = self.profile.response_tokens
+        if self.max_tokens:
+            words = min(words, self.max_tokens)
+        lines, n = [f"# {title}", ''], 0
+        while n < words:
+            length = min(12, words - n)
+            sentence = ' '.join(rng.choice(_WORDS) for _ in range(length))
+            lines.append(f"- {sentence.capitalize()}.")
+            n += length
+        return '\n'.join(lines)
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> str:
+        try:
+            from crewai.utilities import events
+        except ImportError:
+            from crewai import events
+        bus = events.crewai_event_bus
+        bus.emit(self, event=events.LLMCallStartedEvent(
+            messages=messages, tools=tools, callbacks=callbacks, available_functions=available_functions,
+            from_task=from_task, from_agent=from_agent, model=self.model,
+        ))
+
+        if isinstance(messages, str):
+            messages = [{'role': 'user', 'content': messages}]
+        prompt = '\n'.join(str(message.get('content', '')) for message in messages)
+        text = self.respond(prompt)
+
+        # Only the simulated generation counts as model time; handling the
+        # stream events in between is the caller's overhead
+        model_seconds = 0.0
+
+        def generate(seconds: float) -> None:
+            nonlocal model_seconds
+            started = time.perf_counter()
+            time.sleep(seconds)
+            model_seconds += time.perf_counter() - started
+
+        generate(self.profile.latency)
+        # Words stand in for tokens
+        delay = 1 / self.profile.tokens_per_second if self.profile.tokens_per_second else 0.0
+        if self.stream:
+            for chunk in re.findall(r'\S+\s*', text):
+                generate(delay)
+                bus.emit(self, event=events.LLMStreamChunkEvent(
+                    chunk=chunk, from_task=from_task, from_agent=from_agent,
+                ))
+        else:
+            generate(delay * len(text.split()))
+        _stats.calls = getattr(_stats, 'calls', 0) + 1
+        _stats.seconds = getattr(_stats, 'seconds', 0.0) + model_seconds
+
+        # Same shape crewAI hands its token counter after a litellm call
+        usage = SimpleNamespace(
+            prompt_tokens=len(prompt) // 4, completion_tokens=len(text.split()),
+            total_tokens=len(prompt) // 4 + len(text.split()), prompt_tokens_details=None,
+        )
+        for callback in callbacks or []:
+            if hasattr(callback, 'log_success_event'):
+                callback.log_success_event(kwargs={}, response_obj={'usage': usage}, start_time=0, end_time=0)
+
+        bus.emit(self, event=events.LLMCallCompletedEvent(
+            messages=messages, response=text, call_type=events.LLMCallType.LLM_CALL,
+            from_task=from_task, from_agent=from_agent, model=self.model,
+        ))
+        return text
@@ -0,0 +1,125 @@
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Receives (kind, payload) for every progress event on the current thread
+ProgressSink = Callable[[str, Dict[str, Any]], None]
+
+_local = threading.local()
+
+
+@contextmanager
+def progress_sink(sink: ProgressSink) -> Iterator[None]:
+    """Route progress events raised on this thread to sink.
+
+    Crews are pooled and crewAI copies a crew's step callback onto its
+    agents on the first kickoff, so per-request callbacks can't be set on
+    the crew itself. Instead the crew's callbacks are fixed and forward to
+    whichever sink the kicking-off thread has installed.
+    """
+    previous = getattr(_local, 'sink', None)
+    _local.sink = sink
+    try:
+        yield
+    finally:
+        _local.sink = previous
+
+
+def current_sink() -> Optional[ProgressSink]:
+    return getattr(_local, 'sink', None)
+
+
+def emit(kind: str, **payload: Any) -> None:
+    sink = current_sink()
+    if sink is not None:
+        sink(kind, payload)
+
+
+def on_step(step: Any) -> None:
+    """Crew step_callback: one agent reasoning step or tool result."""
+    tool = getattr(step, 'tool', None)
+    emit(
+        'step',
+        thought=(getattr(step, 'thought', '') or '').strip(),
+        tool=tool,
+        tool_input=getattr(step, 'tool_input', None) if tool else None,
+        text=str(getattr(step, 'output', None) or getattr(step, 'result', None) or getattr(step, 'text', '') or ''),
+    )
+
+
+def on_task(output: Any) -> None:
+    """Crew task_callback: a task finished, with its output."""
+    emit(
+        'task',
+        agent=str(getattr(output, 'agent', '') or '').strip(),
+        description=str(getattr(output, 'description', '') or '').strip(),
+        output=getattr(output, 'raw', None) or str(output),
+    )
+
+
+def _on_stream_chunk(source: Any, event: Any) -> None:
+    if event.chunk:
+        emit('token', text=event.chunk)
+
+
+def _on_task_started(source: Any, event: Any) -> None:
+    task = getattr(event, 'task', None)
+    agent = getattr(task, 'agent', None)
+    emit(
+        'task_started',
+        agent=str(getattr(agent, 'role', '') or '').strip(),
+        description=str(getattr(task, 'description', '') or '').strip(),
+    )
+
+
+_listeners_registered = False
+_listeners_lock = threading.Lock()
+
+
+def register_stream_listeners() -> None:
+    """Forward LLM stream chunks and task starts from crewAI's event bus.
+
+    The bus calls handlers on the thread that emitted the event, which is
+    the thread running the kickoff, so events reach that thread's sink.
+    """
+    global _listeners_registered
+    with _listeners_lock:
+        if _listeners_registered:
+            return
+        try:
+            from crewai.utilities.events import LLMStreamChunkEvent, TaskStartedEvent, crewai_event_bus
+        except ImportError:
+            from crewai.events import LLMStreamChunkEvent, TaskStartedEvent, crewai_event_bus
+        crewai_event_bus.register_handler(LLMStreamChunkEvent, _on_stream_chunk)
+        crewai_event_bus.register_handler(TaskStartedEvent, _on_task_started)
+        _listeners_registered = True
+
+
+def stream_events(run: Callable[[], Any]) -> Iterator[Dict[str, Any]]:
+    """Run run() on a background thread and yield its progress as it happens.
+
+    Yields dicts with a 'kind' of 'task_started', 'token' (an LLM output
+    chunk), 'step', 'task' (a finished task and its output) and finally
+    'result' with run()'s return value, or 'error' if it raised.
+    """
+    register_stream_listeners()
+    events: queue.Queue = queue.Queue()
+    done = object()
+
+    def worker() -> None:
+        try:
+            with progress_sink(lambda kind, payload: events.put({'kind': kind, **payload})):
+                result = run()
+            events.put({'kind': 'result', 'result': result})
+        except Exception as e:
+            events.put({'kind': 'error', 'error': str(e)})
+        finally:
+            events.put(done)
+
+    threading.Thread(target=worker, daemon=True, name='crew-stream').start()
+    while True:
+        event = events.get()
+        if event is done:
+            return
+        yield event
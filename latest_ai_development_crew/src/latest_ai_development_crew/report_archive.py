@@ -0,0 +1,176 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from latest_ai_development_crew.vector_store import VectorStore
+
+# Where reporting_task writes, relative to the working directory
+DEFAULT_OUTPUT_DIR = Path('output')
+DEFAULT_INDEX_DIR = Path.home() / '.cache' / 'latest_ai_development_crew' / 'report_index'
+# Reports younger than this are served as they are
+DEFAULT_FRESH_HOURS = 24.0
+# Older reports, up to this age, are updated by the crew rather than rewritten
+DEFAULT_REFRESH_DAYS = 30.0
+# Cosine similarity a report's topic needs to count as the same question
+DEFAULT_MIN_SCORE = 0.8
+
+# reporting_task writes output/{topic}_{timestamp}.md
+_REPORT_NAME = re.compile(r'^(?P<topic>.*)_(?P<timestamp>\d{8}_\d{6})$', re.DOTALL)
+TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+
+
+def normalize_topic(topic: str) -> str:
+    """Fold case, whitespace and trailing punctuation so equivalent topics match."""
+    return re.sub(r'\s+', ' ', topic).strip().rstrip('?!. ').casefold()
+
+
+@dataclass
+class ArchivedReport:
+    path: Path
+    topic: str
+    created: float  # From the filename's timestamp, else the file's mtime
+    score: float = 1.0
+    settings: Optional[Dict[str, Any]] = None  # LLM settings it was written with, if recorded
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created
+
+    def read(self) -> str:
+        return self.path.read_text(encoding='utf-8')
+
+
+class ReportArchive:
+    """Searchable index of the reports the crew has written.
+
+    Each report's normalized topic is embedded into a vector store
+    collection alongside its path and creation time. The index is synced
+    with the output directory on every lookup: only new or modified files
+    are embedded and deleted files are dropped, so a lookup costs a
+    directory listing plus one vector search. Reports indexed through
+    record() also carry the LLM settings they were written with.
+    """
+
+    def __init__(self, output_dir=DEFAULT_OUTPUT_DIR, index_dir=DEFAULT_INDEX_DIR,
+                 min_score: float = DEFAULT_MIN_SCORE):
+        self.output_dir = Path(output_dir)
+        self.min_score = min_score
+        self._lock = threading.Lock()
+        # One collection per output directory, so several checkouts can share an index dir
+        name = hashlib.sha1(str(self.output_dir.resolve()).encode('utf-8')).hexdigest()[:16]
+        self._collection = VectorStore(index_dir).collection(f'reports_{name}')
+
+    def sync(self) -> None:
+        """Bring the index in line with the report files on disk."""
+        files = {path.name: path for path in self.output_dir.glob('*.md')} if self.output_dir.is_dir() else {}
+        with self._lock:
+            indexed = {record.id: record.metadata for record in self._collection.get()}
+            stale = [name for name in indexed if name not in files]
+            if stale:
+                self._collection.delete(ids=stale)
+
+            ids, documents, metadatas = [], [], []
+            for name, path in files.items():
+                try:
+                    mtime = path.stat().st_mtime
+                except OSError:
+                    continue  # Deleted while listing
+                if indexed.get(name, {}).get('mtime') == mtime:
+                    continue
+                document, metadata = self._describe(path, mtime)
+                ids.append(name)
+                documents.append(document)
+                metadatas.append(metadata)
+            if ids:
+                self._collection.upsert(ids, documents, metadatas)
+
+    def record(self, path, settings: Dict[str, Any]) -> None:
+        """Index a report the crew just wrote, with the LLM settings it was written with.
+
+        The settings are kept until the file changes, after which sync()
+        indexes it again without them.
+        """
+        path = Path(path)
+        document, metadata = self._describe(path, path.stat().st_mtime)
+        with self._lock:
+            self._collection.upsert([path.name], [document], [{**metadata, 'settings': settings}])
+
+    @staticmethod
+    def _describe(path: Path, mtime: float) -> Tuple[str, Dict[str, Any]]:
+        """The document (normalized topic) and metadata to index a report file under."""
+        match = _REPORT_NAME.match(path.stem)
+        topic = match.group('topic') if match else path.stem
+        try:
+            created = datetime.strptime(match.group('timestamp'), TIMESTAMP_FORMAT).timestamp()
+        except (AttributeError, ValueError):
+            created = mtime
+        return normalize_topic(topic), {'topic': topic, 'created': created, 'mtime': mtime}
+
+    def find(self, topic: str, max_age: Optional[float] = None) -> Optional[ArchivedReport]:
+        """The newest report on topic, optionally no older than max_age seconds.
+
+        Candidates are the reports whose topic embedding scores at least
+        min_score against topic; among those the most recent one wins.
+        """
+        self.sync()
+        hits = [
+            hit for hit in self._collection.search(normalize_topic(topic), limit=10)
+            if hit.score >= self.min_score
+        ]
+        reports = [
+            ArchivedReport(
+                self.output_dir / hit.id, hit.metadata['topic'], hit.metadata['created'], hit.score,
+                hit.metadata.get('settings'),
+            )
+            for hit in hits
+        ]
+        reports = [
+            report for report in reports
+            if report.path.exists() and (max_age is None or report.age <= max_age)
+        ]
+        return max(reports, key=lambda report: report.created, default=None)
+
+
+_archive: Optional[ReportArchive] = None
+_archive_pid: Optional[int] = None
+_archive_lock = threading.Lock()
+
+
+def get_report_archive() -> Optional[ReportArchive]:
+    """Return the process-wide report archive, or None when reuse is disabled.
+
+    Configured through REPORT_REUSE (set to 0 to disable), REPORT_INDEX_DIR
+    and REPORT_MIN_SCORE.
+    """
+    global _archive, _archive_pid
+    if os.getenv('REPORT_REUSE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+
+    with _archive_lock:
+        # SQLite connections must not be shared across forked processes
+        if _archive is None or _archive_pid != os.getpid():
+            try:
+                _archive = ReportArchive(
+                    DEFAULT_OUTPUT_DIR,
+                    os.getenv('REPORT_INDEX_DIR', DEFAULT_INDEX_DIR),
+                    float(os.getenv('REPORT_MIN_SCORE', DEFAULT_MIN_SCORE)),
+                )
+            except (OSError, sqlite3.Error):
+                return None  # Read-only home or similar, always run the crew
+            _archive_pid = os.getpid()
+        return _archive
+
+
+def fresh_seconds() -> float:
+    return float(os.getenv('REPORT_FRESH_HOURS', DEFAULT_FRESH_HOURS)) * 3600
+
+
+def refresh_seconds() -> float:
+    return float(os.getenv('REPORT_REFRESH_DAYS', DEFAULT_REFRESH_DAYS)) * 86400
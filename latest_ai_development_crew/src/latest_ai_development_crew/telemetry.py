@@ -0,0 +1,290 @@
+# Span tracing for crewAI runs; finished traces are also emitted as progress
+# events for the Streamlit app's Analysis tab.
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from latest_ai_development_crew.progress import emit
+
+DEFAULT_SPANS_PATH = Path.home() / '.cache' / 'latest_ai_development_crew' / 'spans.jsonl'
+
+# Token counters summed up the span tree
+TOKEN_FIELDS = ('prompt_tokens', 'completion_tokens', 'total_tokens', 'cached_prompt_tokens')
+
+
+@dataclass
+class Span:
+    """One timed unit of a crew run: kickoff, task, agent, llm or tool."""
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    parent_id: Optional[str] = None
+    start: float = field(default_factory=time.time)
+    end: Optional[float] = None
+    status: str = 'ok'
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    children: List['Span'] = field(default_factory=list, repr=False)
+    # The agent whose token counter an agent/llm span reads
+    agent: Any = field(default=None, repr=False)
+    tokens_at_start: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.time()) - self.start
+
+    def to_otel(self) -> Dict[str, Any]:
+        """The span in OpenTelemetry's JSON field naming."""
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_span_id': self.parent_id,
+            'name': self.name,
+            'kind': self.kind,
+            'start_time_unix_nano': int(self.start * 1e9),
+            'end_time_unix_nano': int((self.end or self.start) * 1e9),
+            'status': {'code': 'ERROR' if self.status == 'error' else 'OK'},
+            'attributes': self.attributes,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Flat row for display: timing, tokens, cost and call counts."""
+        row = {'name': self.name, 'kind': self.kind, 'seconds': round(self.duration, 3), 'status': self.status}
+        row.update({key: self.attributes.get(key, 0) for key in TOKEN_FIELDS + ('cost_usd',)})
+        for key in ('llm_calls', 'tool_calls', 'cache_hits'):
+            row[key] = self.attributes.get(key, 0)
+        return row
+
+
+class JsonlSpanExporter:
+    """Appends finished spans, one JSON object per line, to a local file."""
+
+    def __init__(self, path=DEFAULT_SPANS_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, spans: List[Span]) -> None:
+        lines = ''.join(json.dumps(span.to_otel(), default=str) + '\n' for span in spans)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+
+def _token_snapshot(agent: Any) -> Dict[str, int]:
+    process = getattr(agent, '_token_process', None)
+    if process is None:
+        return {}
+    try:
+        usage = process.get_summary()
+    except Exception:
+        return {}
+    return {key: int(getattr(usage, key, 0) or 0) for key in TOKEN_FIELDS}
+
+
+def _token_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    if not model or not (prompt_tokens or completion_tokens):
+        return None
+    try:
+        import litellm
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+    except Exception:
+        return None  # Unknown model pricing
+    return prompt_cost + completion_cost
+
+
+class Tracer:
+    """Builds span trees from crewAI's event bus.
+
+    The bus calls handlers on the thread that emitted the event, so each
+    thread keeps its own stack of open spans and concurrent kickoffs never
+    get mixed up. When a kickoff span closes, its whole tree is exported
+    and the per-task/agent summary is emitted to the current progress sink
+    as a 'telemetry' event.
+    """
+
+    def __init__(self, exporter: Optional[JsonlSpanExporter] = None):
+        self.exporter = exporter
+        self._local = threading.local()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def start(self, name: str, kind: str, agent: Any = None, **attributes: Any) -> Span:
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        span = Span(
+            name=name, kind=kind,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            parent_id=parent.span_id if parent else None,
+            attributes={key: value for key, value in attributes.items() if value is not None},
+        )
+        if agent is None and parent is not None:
+            agent = parent.agent
+        span.agent = agent
+        span.tokens_at_start = _token_snapshot(agent)
+        if parent is not None:
+            parent.children.append(span)
+        stack.append(span)
+        return span
+
+    def end(self, kind: str, status: str = 'ok', **attributes: Any) -> Optional[Span]:
+        """Close the innermost open span of kind, and anything left open inside it."""
+        stack = self._stack()
+        for index in range(len(stack) - 1, -1, -1):
+            if stack[index].kind == kind:
+                break
+        else:
+            return None
+        for span in reversed(stack[index + 1:]):
+            self._finish(span, 'error')
+        span = stack[index]
+        del stack[index:]
+        span.attributes.update({key: value for key, value in attributes.items() if value is not None})
+        self._finish(span, status)
+        if span.parent_id is None:
+            self._export(span)
+        return span
+
+    def _finish(self, span: Span, status: str) -> None:
+        span.end = time.time()
+        span.status = status
+        attributes = span.attributes
+
+        def children_total(key: str):
+            return sum(child.attributes.get(key, 0) for child in span.children)
+
+        if span.kind in ('agent', 'llm') and span.agent is not None:
+            # Read straight off the agent's own counter, which crewAI's
+            # token callback updates before the completion event fires
+            now = _token_snapshot(span.agent)
+            for key in TOKEN_FIELDS:
+                attributes[key] = now.get(key, 0) - span.tokens_at_start.get(key, 0)
+        else:
+            for key in TOKEN_FIELDS:
+                if children_total(key):
+                    attributes[key] = children_total(key)
+
+        if span.kind == 'llm':
+            attributes['llm_calls'] = 1
+            cost = _token_cost(
+                attributes.get('model'), attributes.get('prompt_tokens', 0), attributes.get('completion_tokens', 0)
+            )
+            if cost is not None:
+                attributes['cost_usd'] = cost
+        elif span.kind == 'tool':
+            attributes['tool_calls'] = 1
+        else:
+            for key in ('llm_calls', 'tool_calls', 'cost_usd'):
+                if children_total(key):
+                    attributes[key] = children_total(key)
+        if children_total('cache_hits'):
+            attributes['cache_hits'] = attributes.get('cache_hits', 0) + children_total('cache_hits')
+
+    def start_kickoff(self, name: str) -> Span:
+        stack = self._stack()
+        # A crew kicked off from inside a tool nests under it; any other
+        # open spans were abandoned by a run that was aborted mid-flight
+        if stack and stack[-1].kind != 'tool':
+            stack.clear()
+        return self.start(name, 'kickoff')
+
+    def mark(self, key: str, amount: int = 1) -> None:
+        """Add to a counter on the innermost open span, e.g. cache hits."""
+        stack = self._stack()
+        if stack:
+            stack[-1].attributes[key] = stack[-1].attributes.get(key, 0) + amount
+
+    def _export(self, root: Span) -> None:
+        spans, pending = [], [root]
+        while pending:
+            span = pending.pop()
+            spans.append(span)
+            pending.extend(span.children)
+        if self.exporter is not None:
+            try:
+                self.exporter.export(spans)
+            except OSError:
+                pass  # Telemetry must never fail a run
+        rows = [root.summary()] + [
+            span.summary() for span in spans if span.kind in ('task', 'agent')
+        ]
+        emit('telemetry', trace_id=root.trace_id, spans=rows)
+
+    # -- crewAI event handlers -------------------------------------------
+
+    def register(self) -> None:
+        try:
+            from crewai.utilities import events
+        except ImportError:
+            from crewai import events
+        bus = events.crewai_event_bus
+        on = bus.register_handler
+
+        on(events.CrewKickoffStartedEvent, lambda source, event: self.start_kickoff(event.crew_name or 'crew'))
+        on(events.CrewKickoffCompletedEvent, lambda source, event: self.end('kickoff'))
+        on(events.CrewKickoffFailedEvent, lambda source, event: self.end('kickoff', 'error', error=event.error))
+
+        on(events.TaskStartedEvent, lambda source, event: self.start(
+            _task_name(event.task), 'task', agent_role=_role(getattr(event.task, 'agent', None))))
+        on(events.TaskCompletedEvent, lambda source, event: self.end('task'))
+        on(events.TaskFailedEvent, lambda source, event: self.end('task', 'error', error=event.error))
+
+        on(events.AgentExecutionStartedEvent, lambda source, event: self.start(
+            _role(event.agent), 'agent', agent=event.agent))
+        on(events.AgentExecutionCompletedEvent, lambda source, event: self.end('agent'))
+        on(events.AgentExecutionErrorEvent, lambda source, event: self.end('agent', 'error', error=event.error))
+
+        on(events.ToolUsageStartedEvent, lambda source, event: self.start(
+            event.tool_name, 'tool', agent_role=event.agent_role))
+        on(events.ToolUsageFinishedEvent, lambda source, event: self.end(
+            'tool', from_cache=event.from_cache or None))
+        on(events.ToolUsageErrorEvent, lambda source, event: self.end('tool', 'error', error=str(event.error)))
+
+        on(events.LLMCallStartedEvent, lambda source, event: self.start(
+            event.model or 'llm', 'llm', model=event.model))
+        on(events.LLMCallCompletedEvent, lambda source, event: self.end('llm'))
+        on(events.LLMCallFailedEvent, lambda source, event: self.end('llm', 'error', error=event.error))
+
+
+def _role(agent: Any) -> str:
+    return str(getattr(agent, 'role', '') or '').strip()
+
+
+def _task_name(task: Any) -> str:
+    name = getattr(task, 'name', None) or str(getattr(task, 'description', '') or 'task')
+    return ' '.join(name.split())[:80]
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the process-wide tracer, registering it on first use.
+
+    Spans are appended to LATEST_AI_TELEMETRY_FILE (default
+    ~/.cache/latest_ai_development_crew/spans.jsonl); set
+    LATEST_AI_TELEMETRY=0 to turn instrumentation off.
+    """
+    global _tracer
+    if os.getenv('LATEST_AI_TELEMETRY', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    with _tracer_lock:
+        if _tracer is None:
+            try:
+                exporter = JsonlSpanExporter(os.getenv('LATEST_AI_TELEMETRY_FILE', DEFAULT_SPANS_PATH))
+            except OSError:
+                exporter = None  # Still summarize runs, just don't write them out
+            _tracer = Tracer(exporter)
+            _tracer.register()
+        return _tracer
@@ -0,0 +1,371 @@
+import hashlib
+import json
+import math
+import re
+import shutil
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+# Width of the local hashing embedding
+DEFAULT_DIM = 384
+# Rows the embedding file is first sized for; it doubles when full
+INITIAL_ROWS = 1024
+# Rows scored per matrix product, bounding memory on large collections
+SEARCH_BLOCK_ROWS = 65536
+
+Embedder = Callable[[List[str]], Any]
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class InvalidDimensionException(ValueError):
+    """Raised when embeddings don't match the width a collection was created with."""
+
+
+class HashingEmbedder:
+    """Local, deterministic text embedding by feature hashing.
+
+    Words and word bigrams are hashed into a fixed number of signed buckets
+    with sublinear term weights, then L2-normalized. No model download or
+    API call is needed, so memory works offline and costs nothing; similar
+    wording gives similar vectors, which is what crew memory recall needs.
+    """
+
+    name = 'hashing'
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+
+    def _features(self, text: str) -> Dict[int, float]:
+        words = _TOKEN.findall(text.lower())
+        counts: Dict[str, int] = {}
+        for term in words + [f'{a} {b}' for a, b in zip(words, words[1:])]:
+            counts[term] = counts.get(term, 0) + 1
+        features: Dict[int, float] = {}
+        for term, count in counts.items():
+            digest = int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+            bucket = digest % self.dim
+            sign = 1.0 if (digest >> 63) else -1.0
+            features[bucket] = features.get(bucket, 0.0) + sign * (1.0 + math.log(count))
+        return features
+
+    def __call__(self, input: Union[str, List[str]]) -> np.ndarray:
+        texts = [input] if isinstance(input, str) else list(input)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for bucket, weight in self._features(text or '').items():
+                vectors[i, bucket] = weight
+        return vectors
+
+
+def _normalize(vectors: Any) -> np.ndarray:
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+@dataclass
+class Record:
+    id: str
+    document: Optional[str]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    score: Optional[float] = None  # Cosine similarity, set by search()
+
+
+class VectorCollection:
+    """One named set of documents with their embeddings.
+
+    Embeddings are stored L2-normalized in a float32 file that is memory
+    mapped for search, so the OS page cache rather than the Python heap
+    holds them and opening a collection costs nothing. Ids, documents and
+    metadata live in SQLite next to it, which also serializes writers from
+    several processes. Search is exact: the query is scored against every
+    live row with blocked matrix products, which at crew-memory sizes is
+    faster than maintaining an approximate index.
+    """
+
+    def __init__(self, path: Path, name: str, embedder: Optional[Embedder] = None):
+        self.path = Path(path)
+        self.name = name
+        self.embedder = embedder or HashingEmbedder()
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.memmap] = None
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.path / 'vectors.f32'
+        self._conn = sqlite3.connect(
+            str(self.path / 'index.sqlite'), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(
+            'CREATE TABLE IF NOT EXISTS records ('
+            ' id TEXT PRIMARY KEY,'
+            ' row INTEGER NOT NULL UNIQUE,'
+            ' document TEXT,'
+            ' metadata TEXT NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS free_rows (row INTEGER PRIMARY KEY);'
+            'CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT NOT NULL);'
+        )
+
+    # -- storage helpers -------------------------------------------------
+
+    def _dim(self) -> Optional[int]:
+        row = self._conn.execute("SELECT value FROM info WHERE key = 'dim'").fetchone()
+        return int(row[0]) if row else None
+
+    def _open_matrix(self, dim: int, writable: bool = False) -> Optional[np.ndarray]:
+        """Map the embedding file, reusing the mapping while its size is unchanged."""
+        if not self._vectors_path.exists():
+            return None
+        capacity = self._vectors_path.stat().st_size // (dim * 4)
+        if capacity == 0:
+            return None
+        if writable:
+            return np.memmap(self._vectors_path, dtype=np.float32, mode='r+', shape=(capacity, dim))
+        if self._matrix is None or self._matrix.shape != (capacity, dim):
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode='r', shape=(capacity, dim))
+        return self._matrix
+
+    def _ensure_capacity(self, rows: int, dim: int) -> None:
+        size = self._vectors_path.stat().st_size if self._vectors_path.exists() else 0
+        needed = rows * dim * 4
+        if size < needed:
+            with open(self._vectors_path, 'ab') as f:
+                f.truncate(max(needed, size * 2, INITIAL_ROWS * dim * 4))
+
+    def _where_sql(self, where: Optional[Dict[str, Any]]):
+        """Translate an equality filter on metadata fields into SQL."""
+        clauses, params = [], []
+        for key, value in (where or {}).items():
+            if key == '$and':
+                for part in value:
+                    sql, part_params = self._where_sql(part)
+                    clauses.append(sql)
+                    params.extend(part_params)
+                continue
+            if isinstance(value, dict):
+                if set(value) != {'$eq'}:
+                    raise ValueError(f"Unsupported filter on {key!r}: {value!r}")
+                value = value['$eq']
+            clauses.append('json_extract(metadata, ?) = ?')
+            params.extend([f'$.{key}', value])
+        return (' AND '.join(clauses) or '1'), params
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        return _normalize(self.embedder(texts))
+
+    # -- public API ------------------------------------------------------
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        documents: Optional[Sequence[Optional[str]]] = None,
+        metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+        embeddings: Any = None,
+    ) -> None:
+        """Insert records, replacing any with the same id."""
+        ids = list(ids)
+        if not ids:
+            return
+        documents = list(documents) if documents is not None else [None] * len(ids)
+        metadatas = list(metadatas) if metadatas is not None else [None] * len(ids)
+        if embeddings is None:
+            vectors = self._embed([doc or '' for doc in documents])
+        else:
+            vectors = _normalize(embeddings)
+        if len(vectors) != len(ids):
+            raise ValueError(f"Got {len(vectors)} embeddings for {len(ids)} ids")
+        # An id repeated within the batch keeps its last value
+        last = list({record_id: i for i, record_id in enumerate(ids)}.values())
+        if len(last) != len(ids):
+            ids = [ids[i] for i in last]
+            documents = [documents[i] for i in last]
+            metadatas = [metadatas[i] for i in last]
+            vectors = vectors[last]
+
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                dim = self._dim()
+                if dim is None:
+                    dim = vectors.shape[1]
+                    self._conn.execute("INSERT INTO info (key, value) VALUES ('dim', ?)", (str(dim),))
+                elif vectors.shape[1] != dim:
+                    raise InvalidDimensionException(
+                        f"Collection {self.name!r} holds {dim}-d embeddings, got {vectors.shape[1]}-d"
+                    )
+
+                # Existing ids keep their row, new ones take freed rows first
+                next_row = self._conn.execute(
+                    'SELECT MAX(COALESCE((SELECT MAX(row) FROM records), -1),'
+                    ' COALESCE((SELECT MAX(row) FROM free_rows), -1)) + 1'
+                ).fetchone()[0]
+                rows = []
+                for record_id in ids:
+                    found = self._conn.execute('SELECT row FROM records WHERE id = ?', (record_id,)).fetchone()
+                    if found is None:
+                        found = self._conn.execute('SELECT row FROM free_rows ORDER BY row LIMIT 1').fetchone()
+                        if found is not None:
+                            self._conn.execute('DELETE FROM free_rows WHERE row = ?', found)
+                    if found is None:
+                        found = (next_row,)
+                        next_row += 1
+                    rows.append(found[0])
+
+                self._ensure_capacity(max(rows) + 1, dim)
+                matrix = self._open_matrix(dim, writable=True)
+                matrix[rows] = vectors
+                matrix.flush()
+                del matrix
+
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO records (id, row, document, metadata) VALUES (?, ?, ?, ?)',
+                    [
+                        (record_id, row, doc, json.dumps(meta or {}, default=str))
+                        for record_id, row, doc, meta in zip(ids, rows, documents, metadatas)
+                    ],
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    add = upsert
+
+    def search(
+        self,
+        query: Union[str, Any],
+        limit: int = 3,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Record]:
+        """The limit most similar records to query (text or a vector), best first."""
+        where_sql, params = self._where_sql(where)
+        with self._lock:
+            dim = self._dim()
+            rows = self._conn.execute(f'SELECT row FROM records WHERE {where_sql} ORDER BY row', params).fetchall()
+            matrix = self._open_matrix(dim) if dim else None
+        if not rows or matrix is None or limit <= 0:
+            return []
+
+        q = self._embed([query])[0] if isinstance(query, str) else _normalize(query)[0]
+        if q.shape[0] != dim:
+            raise InvalidDimensionException(f"Collection {self.name!r} holds {dim}-d embeddings, got {q.shape[0]}-d")
+
+        live = np.fromiter((row for (row,) in rows), dtype=np.int64, count=len(rows))
+        if live[-1] - live[0] + 1 == len(live):
+            # Contiguous rows (the common case): score slices of the map directly
+            scores = np.concatenate([
+                matrix[start:min(start + SEARCH_BLOCK_ROWS, live[-1] + 1)] @ q
+                for start in range(int(live[0]), int(live[-1]) + 1, SEARCH_BLOCK_ROWS)
+            ])
+        else:
+            scores = np.concatenate([
+                matrix[live[start:start + SEARCH_BLOCK_ROWS]] @ q
+                for start in range(0, len(live), SEARCH_BLOCK_ROWS)
+            ])
+
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        by_row = {
+            row: (record_id, document, metadata)
+            for record_id, row, document, metadata in self._query_rows([int(live[i]) for i in top])
+        }
+        hits = []
+        for i in top:
+            record = by_row.get(int(live[i]))
+            if record is not None:  # Deleted since the rows were listed
+                hits.append(Record(record[0], record[1], json.loads(record[2]), float(scores[i])))
+        return hits
+
+    def _query_rows(self, rows: List[int]) -> List[tuple]:
+        marks = ','.join('?' * len(rows))
+        with self._lock:
+            return self._conn.execute(
+                f'SELECT id, row, document, metadata FROM records WHERE row IN ({marks})', rows
+            ).fetchall()
+
+    def get(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Record]:
+        where_sql, params = self._where_sql(where)
+        if ids is not None:
+            ids = list(ids)
+            where_sql += f" AND id IN ({','.join('?' * len(ids))})"
+            params = params + ids
+        sql = f'SELECT id, document, metadata FROM records WHERE {where_sql} ORDER BY row'
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [Record(record_id, document, json.loads(metadata)) for record_id, document, metadata in rows]
+
+    def delete(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None) -> None:
+        """Delete records; their rows are reused by later inserts."""
+        doomed = [record.id for record in self.get(ids=ids, where=where)]
+        if not doomed:
+            return
+        marks = ','.join('?' * len(doomed))
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute(
+                    f'INSERT OR IGNORE INTO free_rows (row) SELECT row FROM records WHERE id IN ({marks})', doomed
+                )
+                self._conn.execute(f'DELETE FROM records WHERE id IN ({marks})', doomed)
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._matrix = None
+            self._conn.close()
+
+
+class VectorStore:
+    """A directory of collections, one subdirectory each."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._collections: Dict[str, VectorCollection] = {}
+
+    def collection(self, name: str, embedder: Optional[Embedder] = None) -> VectorCollection:
+        """Open (creating if needed) the collection called name."""
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self._collections[name] = VectorCollection(self.path / name, name, embedder)
+            elif embedder is not None:
+                collection.embedder = embedder
+            return collection
+
+    def collection_names(self) -> List[str]:
+        return sorted(p.name for p in self.path.iterdir() if (p / 'index.sqlite').exists())
+
+    def delete_collection(self, name: str) -> None:
+        with self._lock:
+            collection = self._collections.pop(name, None)
+            if collection is not None:
+                collection.close()
+            shutil.rmtree(self.path / name, ignore_errors=True)
+
+    def reset(self) -> None:
+        for name in self.collection_names():
+            self.delete_collection(name)
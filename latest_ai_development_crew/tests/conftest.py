@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The package lives under src/ and the Streamlit app's modules under app/
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / 'src'), str(ROOT / 'app')]
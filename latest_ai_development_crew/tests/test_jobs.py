@@ -0,0 +1,90 @@
+import subprocess
+import sys
+
+import pytest
+
+from jobs import JobQueue, QueueFull
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(tmp_path / 'jobs.sqlite', max_queued=3)
+
+
+def test_identical_requests_share_a_job(queue):
+    first = queue.submit('AI agents', dedupe_key='k1')
+
+    assert queue.submit('AI agents', dedupe_key='k1') == first
+    assert queue.submit('AI agents', dedupe_key='k2') != first
+    assert queue.submit('AI agents') != first
+
+
+def test_finished_jobs_are_not_reused(queue):
+    first = queue.submit('AI agents', dedupe_key='k1')
+    queue.claim(worker=None)
+    queue.finish(first, 'done', result='report')
+
+    assert queue.submit('AI agents', dedupe_key='k1') != first
+
+
+def test_stale_running_jobs_are_not_reused(queue):
+    first = queue.submit('AI agents', dedupe_key='k1')
+    queue.claim(worker=None)
+    queue._execute('UPDATE jobs SET heartbeat = heartbeat - 3600 WHERE id = ?', (first,))
+
+    assert queue.submit('AI agents', dedupe_key='k1') != first
+
+
+def test_full_queue_pushes_back(queue):
+    for index in range(3):
+        queue.submit(f'topic {index}')
+
+    with pytest.raises(QueueFull):
+        queue.submit('one too many')
+
+
+def test_cancel_queued_job(queue):
+    job_id = queue.submit('AI agents')
+    queue.cancel(job_id)
+
+    assert queue.get(job_id).status == 'cancelled'
+    assert queue.claim(worker=None) is None
+
+
+def test_shared_job_is_cancelled_by_its_last_subscriber(queue):
+    job_id = queue.submit('AI agents', dedupe_key='k1')
+    queue.submit('AI agents', dedupe_key='k1')
+
+    queue.cancel(job_id)
+    assert queue.get(job_id).status == 'queued'
+    queue.cancel(job_id)
+    assert queue.get(job_id).status == 'cancelled'
+
+
+def test_cancel_running_job_requests_stop(queue):
+    job_id = queue.submit('AI agents', dedupe_key='k1')
+    queue.claim(worker=None)
+    queue.cancel(job_id)
+
+    assert queue.get(job_id).status == 'running'
+    assert queue.is_cancel_requested(job_id)
+    # A job that is stopping takes no new subscribers
+    assert queue.submit('AI agents', dedupe_key='k1') != job_id
+
+
+def test_reap_fails_abandoned_jobs(queue):
+    exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+    exited.wait()
+    dead = queue.submit('dead worker')
+    queue.claim(worker=exited.pid)
+    stale = queue.submit('stale lease')
+    queue.claim(worker=None)
+    queue._execute('UPDATE jobs SET heartbeat = heartbeat - 3600 WHERE id = ?', (stale,))
+    healthy = queue.submit('healthy')
+    queue.claim(worker=None)
+
+    reaped = {job.id: job.error for job in queue.reap()}
+
+    assert reaped == {dead: 'Worker exited before the job finished', stale: 'Worker stopped responding'}
+    assert queue.get(healthy).status == 'running'
+    assert queue.reap(max_runtime=0)[0].error == 'Timed out after 0 seconds'
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip('crewai')
+
+from latest_ai_development_crew import llm_cache
+from latest_ai_development_crew.llm_cache import ResponseCache
+
+
+def test_ttl_expires_responses(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path / 'r.sqlite', ttl=60)
+    cache.put('k', 'answer')
+    assert cache.get('k') == 'answer'
+
+    now = llm_cache.time.time()
+    monkeypatch.setattr(llm_cache.time, 'time', lambda: now + 61)
+    assert cache.get('k') is None
+
+
+def test_zero_ttl_never_expires(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path / 'r.sqlite', ttl=0)
+    cache.put('k', 'answer')
+
+    now = llm_cache.time.time()
+    monkeypatch.setattr(llm_cache.time, 'time', lambda: now + 10 ** 9)
+    cache.evict()
+    assert cache.get('k') == 'answer'
+
+
+def test_size_limit_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path / 'r.sqlite', max_bytes=100)
+    cache.put('old', 'x' * 40)
+    cache.put('new', 'y' * 40)
+    cache.get('old')  # Now the most recently used
+    cache.put('newest', 'z' * 40)
+    cache.evict()
+
+    assert cache.get('new') is None
+    assert cache.get('old') == 'x' * 40
@@ -0,0 +1,47 @@
+import pytest
+
+# run_agent needs the real crewAI to build and run the crew
+pytest.importorskip('crewai.project')
+
+from latest_ai_development_crew import report_archive
+from latest_ai_development_crew.llm_config import LLMConfig
+from latest_ai_development_crew.main import run_agent
+from latest_ai_development_crew.mock_llm import thread_llm_stats
+
+
+@pytest.fixture(autouse=True)
+def offline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('LATEST_AI_LLM_CACHE', '0')
+    monkeypatch.setenv('LATEST_AI_TELEMETRY', '0')
+    monkeypatch.setenv('REPORT_INDEX_DIR', str(tmp_path / 'index'))
+    monkeypatch.setattr(report_archive, '_archive', None)
+
+
+def reports(tmp_path):
+    return list((tmp_path / 'output').glob('AI agents_*.md'))
+
+
+def test_run_agent_on_mock_llm_writes_and_reuses_report(tmp_path):
+    config = LLMConfig(model='mock/instant')
+    calls = thread_llm_stats()[0]
+
+    report = run_agent('AI agents', config)
+
+    assert isinstance(report, str) and report
+    assert thread_llm_stats()[0] > calls
+    [path] = reports(tmp_path)
+
+    calls = thread_llm_stats()[0]
+    assert run_agent('AI agents?', config) == path.read_text(encoding='utf-8')
+    assert thread_llm_stats()[0] == calls
+
+
+def test_other_settings_rerun_the_crew(tmp_path):
+    run_agent('AI agents', LLMConfig(model='mock/instant'))
+    calls = thread_llm_stats()[0]
+
+    report = run_agent('AI agents', LLMConfig(model='mock/instant', temperature=0.2))
+
+    assert isinstance(report, str) and report
+    assert thread_llm_stats()[0] > calls
@@ -0,0 +1,66 @@
+import os
+import time
+
+import pytest
+
+from latest_ai_development_crew.report_archive import ReportArchive
+
+
+@pytest.fixture
+def archive(tmp_path):
+    (tmp_path / 'output').mkdir()
+    return ReportArchive(tmp_path / 'output', tmp_path / 'index')
+
+
+def write_report(archive, name, text='report'):
+    path = archive.output_dir / name
+    path.write_text(text)
+    return path
+
+
+def test_find_matches_equivalent_topics(archive):
+    write_report(archive, 'AI Agents_20250101_120000.md')
+
+    report = archive.find('ai agents?')
+
+    assert report.topic == 'AI Agents'
+    assert report.read() == 'report'
+    assert archive.find('quantum computing hardware') is None
+
+
+def test_find_prefers_the_newest_report(archive):
+    write_report(archive, 'AI Agents_20250101_120000.md', 'old')
+    write_report(archive, 'AI Agents_20250301_120000.md', 'new')
+
+    assert archive.find('AI Agents').read() == 'new'
+
+
+def test_find_respects_max_age(archive):
+    path = write_report(archive, 'AI Agents.md')
+    created = time.time() - 7200
+    os.utime(path, (created, created))
+
+    assert archive.find('AI Agents', max_age=3600) is None
+    assert archive.find('AI Agents', max_age=86400).path == path
+
+
+def test_deleted_reports_are_dropped(archive):
+    path = write_report(archive, 'AI Agents_20250101_120000.md')
+    assert archive.find('AI Agents') is not None
+
+    path.unlink()
+
+    assert archive.find('AI Agents') is None
+
+
+def test_recorded_settings_last_until_the_report_changes(archive):
+    settings = {'model': {'researcher': 'mock/instant'}, 'temperature': None, 'max_tokens': None, 'memory': False}
+    path = write_report(archive, 'AI Agents_20250101_120000.md')
+    archive.record(path, settings)
+
+    assert archive.find('AI Agents').settings == settings
+
+    path.write_text('edited by hand')
+    os.utime(path, (time.time() + 5, time.time() + 5))
+
+    assert archive.find('AI Agents').settings is None
@@ -5,6 +5,8 @@ import warnings
 from datetime import datetime
 
 from my_agent.crew import MyAgent
+from my_agent.streaming import stream_crew
+from my_agent.telemetry import format_summary, get_tracer
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -22,10 +24,20 @@ def run():
         'current_year': str(datetime.now().year)
     }
     
-    try:
-        MyAgent().crew().kickoff(inputs=inputs)
-    except Exception as e:
-        raise Exception(f"An error occurred while running the crew: {e}")
+    # Print each agent's output as it is generated instead of waiting for the
+    # whole crew to finish
+    for event in stream_crew(MyAgent().crew(), inputs):
+        if event['kind'] == 'task_started':
+            print(f"\n\n## {event['agent']}\n", flush=True)
+        elif event['kind'] == 'token':
+            print(event['text'], end='', flush=True)
+        elif event['kind'] == 'error':
+            raise Exception(f"An error occurred while running the crew: {event['error']}")
+    print()
+
+    tracer = get_tracer()
+    if tracer is not None and tracer.recent:
+        print(format_summary([tracer.recent[-1]]))
 
 
 def train():
@@ -0,0 +1,96 @@
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from crewai import LLM
+from crewai.utilities.llm_utils import create_llm
+
+# Receives one event dict for every token or task boundary on this thread
+EventSink = Callable[[Dict[str, Any]], None]
+
+_local = threading.local()
+_listeners_registered = False
+_listeners_lock = threading.Lock()
+
+
+def streaming_llm(model: Optional[str] = None) -> LLM:
+    """Return the crew's LLM (MODEL from the environment by default) with streaming on."""
+    llm = create_llm(model)
+    llm.stream = True
+    return llm
+
+
+def _emit(event: Dict[str, Any]) -> None:
+    sink = getattr(_local, 'sink', None)
+    if sink is not None:
+        sink(event)
+
+
+def _on_stream_chunk(source: Any, event: Any) -> None:
+    if event.chunk:
+        _emit({'kind': 'token', 'text': event.chunk})
+
+
+def _on_task_started(source: Any, event: Any) -> None:
+    task = getattr(event, 'task', None)
+    agent = getattr(task, 'agent', None)
+    _emit({'kind': 'task_started', 'agent': str(getattr(agent, 'role', '') or '').strip()})
+
+
+def _on_task_completed(source: Any, event: Any) -> None:
+    output = getattr(event, 'output', None)
+    _emit({'kind': 'task', 'agent': str(getattr(output, 'agent', '') or '').strip(),
+           'output': getattr(output, 'raw', None) or str(output)})
+
+
+def register_stream_listeners() -> None:
+    """Forward LLM stream chunks and task boundaries from crewAI's event bus.
+
+    The bus calls handlers on the thread that emitted the event, i.e. the
+    thread running the kickoff, so each kickoff only sees its own events.
+    """
+    global _listeners_registered
+    with _listeners_lock:
+        if _listeners_registered:
+            return
+        try:
+            from crewai.utilities.events import (
+                LLMStreamChunkEvent, TaskCompletedEvent, TaskStartedEvent, crewai_event_bus,
+            )
+        except ImportError:
+            from crewai.events import (
+                LLMStreamChunkEvent, TaskCompletedEvent, TaskStartedEvent, crewai_event_bus,
+            )
+        crewai_event_bus.register_handler(LLMStreamChunkEvent, _on_stream_chunk)
+        crewai_event_bus.register_handler(TaskStartedEvent, _on_task_started)
+        crewai_event_bus.register_handler(TaskCompletedEvent, _on_task_completed)
+        _listeners_registered = True
+
+
+def stream_crew(crew: Any, inputs: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Kick off crew on a background thread and yield its output as it happens.
+
+    Yields dicts with a 'kind' of 'task_started', 'token' (an LLM output
+    chunk), 'task' (a finished task and its output) and finally 'result'
+    with the CrewOutput, or 'error' if the kickoff raised.
+    """
+    register_stream_listeners()
+    events: queue.Queue = queue.Queue()
+    done = object()
+
+    def worker() -> None:
+        _local.sink = events.put
+        try:
+            events.put({'kind': 'result', 'result': crew.kickoff(inputs=inputs)})
+        except Exception as e:
+            events.put({'kind': 'error', 'error': str(e)})
+        finally:
+            _local.sink = None
+            events.put(done)
+
+    threading.Thread(target=worker, daemon=True, name='crew-stream').start()
+    while True:
+        event = events.get()
+        if event is done:
+            return
+        yield event